@@ -10,12 +10,10 @@
 
 from __future__ import annotations
 
-import logging
 from pathlib import Path
 
 
 __version__ = "0.3.0a1"
-logging.basicConfig(level=logging.INFO)
 
 
 def assets_path() -> Path:
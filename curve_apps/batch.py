@@ -0,0 +1,310 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+from geoh5py import Workspace
+from geoh5py.ui_json import InputFile
+
+from curve_apps.driver import BaseCurveDriver, run_concurrently
+
+
+logger = logging.getLogger(__name__)
+
+DRIVERS: dict[str, tuple[str, str]] = {
+    "curve_apps.contours.driver": ("curve_apps.contours.driver", "ContoursDriver"),
+    "curve_apps.contour_detection.driver": (
+        "curve_apps.contours.driver",
+        "ContoursDriver",
+    ),
+    "curve_apps.edges.driver": ("curve_apps.edges.driver", "EdgesDriver"),
+    "curve_apps.trend_lines.driver": (
+        "curve_apps.trend_lines.driver",
+        "TrendLinesDriver",
+    ),
+    "curve_apps.trend_line_detection.driver": (
+        "curve_apps.trend_lines.driver",
+        "TrendLinesDriver",
+    ),
+}
+
+
+@dataclass
+class JobStatus:
+    """
+    Status of a batch job.
+
+    :param path: Path to the ui.json file.
+    :param geoh5: Path to the target geoh5 file.
+    :param status: One of 'pending', 'success' or 'failed'.
+    :param duration: Run time of the job in seconds.
+    :param message: Error message for failed jobs.
+    """
+
+    path: Path
+    geoh5: Path | None = None
+    status: str = "pending"
+    duration: float = 0.0
+    message: str = ""
+
+
+def get_driver_class(run_command: str) -> type[BaseCurveDriver]:
+    """
+    Get the driver class registered for a run command.
+
+    :param run_command: Run command found in the ui.json file.
+
+    :returns: Driver class.
+    """
+    if run_command not in DRIVERS:
+        raise ValueError(f"No curve_apps driver registered for '{run_command}'.")
+
+    module, name = DRIVERS[run_command]
+
+    return getattr(import_module(module), name)
+
+
+def collect_ui_json(paths: Iterable[str | Path]) -> list[Path]:
+    """
+    List ui.json files from a list of files and directories.
+
+    :param paths: Paths to ui.json files or directories containing them.
+
+    :returns: Sorted list of ui.json files.
+    """
+    files = []
+    for path in paths:
+        path = Path(path).resolve()
+        if path.is_dir():
+            files += sorted(path.glob("*.ui.json"))
+        else:
+            files.append(path)
+
+    return files
+
+
+class BatchRunner:
+    """
+    Run many ui.json jobs in a single process.
+
+    Jobs are grouped by target geoh5 file, such that each workspace is opened
+    once and shared by all its jobs, along with the entities already loaded.
+    With several workers, the jobs of a workspace are computed in parallel
+    threads while their outputs are written one at a time.
+
+    :param paths: Paths to ui.json files or directories containing them.
+    :param workers: Number of threads computing the jobs of a workspace.
+    """
+
+    def __init__(self, paths: Iterable[str | Path], workers: int = 1):
+        self.jobs = [JobStatus(path=path) for path in collect_ui_json(paths)]
+        self.workers = workers
+
+    def group_jobs(self) -> dict[Path | None, list[JobStatus]]:
+        """
+        Group the jobs by target geoh5 file.
+        """
+        groups: dict[Path | None, list[JobStatus]] = {}
+        for job in self.jobs:
+            try:
+                with open(job.path, encoding="utf-8") as file:
+                    geoh5 = json.load(file).get("geoh5")
+            except (OSError, ValueError) as error:
+                job.status = "failed"
+                job.message = f"Could not read the ui.json file: {error}"
+                continue
+
+            if geoh5:
+                job.geoh5 = (job.path.parent / geoh5).resolve()
+
+            groups.setdefault(job.geoh5, []).append(job)
+
+        return groups
+
+    def run(self) -> list[JobStatus]:
+        """
+        Run all jobs and return their status.
+        """
+        for geoh5, jobs in self.group_jobs().items():
+            if geoh5 is None or not geoh5.is_file():
+                for job in jobs:
+                    job.status = "failed"
+                    job.message = f"Target geoh5 file not found: {geoh5}"
+                continue
+
+            try:
+                with Workspace(geoh5, mode="r+") as workspace:
+                    if self.workers > 1:
+                        self.run_concurrent_jobs(jobs, workspace, self.workers)
+                    else:
+                        for job in jobs:
+                            self.run_job(job, workspace)
+            except OSError as error:
+                logger.exception("Could not open %s.", geoh5)
+                for job in jobs:
+                    if job.status == "pending":
+                        job.status = "failed"
+                        job.message = f"Could not open {geoh5}: {error}"
+
+        logger.info(self.summary())
+
+        return self.jobs
+
+    @staticmethod
+    def build_driver(job: JobStatus, workspace: Workspace) -> BaseCurveDriver:
+        """
+        Create the driver of a job on an open workspace.
+
+        :param job: Job to run.
+        :param workspace: Open target workspace.
+
+        :returns: Driver of the job.
+        """
+        with open(job.path, encoding="utf-8") as file:
+            ui_json = json.load(file)
+
+        driver_class = get_driver_class(ui_json.get("run_command", ""))
+        ui_json["geoh5"] = workspace
+        ifile = InputFile(
+            ui_json=ui_json,
+            validations=driver_class._validations,  # pylint: disable=protected-access
+        )
+        ifile.path = str(job.path.parent)
+        ifile.name = job.path.name
+
+        params = driver_class._params_class.build(ifile)  # pylint: disable=protected-access
+
+        return driver_class(params)
+
+    @classmethod
+    def run_job(cls, job: JobStatus, workspace: Workspace) -> JobStatus:
+        """
+        Run a single job on an open workspace.
+
+        :param job: Job to run.
+        :param workspace: Open target workspace.
+
+        :returns: Updated job status.
+        """
+        start = perf_counter()
+        try:
+            cls.build_driver(job, workspace).run()
+            job.status = "success"
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.exception("Job %s failed.", job.path.name)
+            job.status = "failed"
+            job.message = str(error)
+
+        job.duration = perf_counter() - start
+
+        return job
+
+    @classmethod
+    def run_concurrent_jobs(
+        cls, jobs: list[JobStatus], workspace: Workspace, workers: int
+    ) -> list[JobStatus]:
+        """
+        Compute the jobs of an open workspace in parallel threads.
+
+        The duration of each job is the time spent computing and writing its
+        curve, excluding the wait for a compute thread.
+
+        :param jobs: Jobs to run.
+        :param workspace: Open target workspace.
+        :param workers: Number of compute threads.
+
+        :returns: Updated job status.
+        """
+        drivers = {}
+        for job in jobs:
+            try:
+                drivers[job.path] = cls.build_driver(job, workspace)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.exception("Job %s failed.", job.path.name)
+                job.status = "failed"
+                job.message = str(error)
+
+        results = dict(
+            zip(
+                drivers,
+                run_concurrently(list(drivers.values()), workers=workers),
+                strict=True,
+            )
+        )
+        for job in jobs:
+            if job.path not in results:
+                continue
+
+            stages = drivers[job.path].metrics.stages
+            job.duration = sum(
+                stages[name]["time"] for name in ["compute", "write"] if name in stages
+            )
+            if isinstance(results[job.path], Exception):
+                job.status = "failed"
+                job.message = str(results[job.path])
+            else:
+                job.status = "success"
+
+        return jobs
+
+    def summary(self) -> str:
+        """
+        Summary of the jobs status.
+        """
+        lines = [
+            f"{job.status:<8} {job.duration:8.2f}s  {job.path.name}"
+            + (f"  ({job.message})" if job.message else "")
+            for job in self.jobs
+        ]
+        n_success = sum(job.status == "success" for job in self.jobs)
+        lines.append(f"{n_success}/{len(self.jobs)} jobs completed successfully.")
+
+        return "\n".join(lines)
+
+
+def main(args: list[str] | None = None) -> int:
+    """
+    Command line interface of the batch runner.
+
+    :param args: Command line arguments.
+
+    :returns: Exit code, 1 if any job failed.
+    """
+    parser = argparse.ArgumentParser(description="Run many ui.json jobs.")
+    parser.add_argument(
+        "paths", nargs="+", help="ui.json files or directories containing them."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads computing the jobs of a geoh5 file.",
+    )
+    options = parser.parse_args(args)
+
+    runner = BatchRunner(options.paths, workers=options.workers)
+    runner.run()
+
+    return int(any(job.status != "success" for job in runner.jobs))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
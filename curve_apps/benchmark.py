@@ -0,0 +1,497 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from geoh5py import Workspace
+from geoh5py.data import FloatData, ReferencedData
+from geoh5py.objects import Curve, Grid2D, Points
+
+from curve_apps import __version__
+from curve_apps.contours.driver import ContoursDriver
+from curve_apps.contours.options import ContourParameters
+from curve_apps.driver import BaseCurveDriver
+from curve_apps.edges.driver import EdgesDriver
+from curve_apps.edges.options import EdgeDetectionParameters, EdgeParameters
+from curve_apps.trend_lines.driver import TrendLinesDriver
+from curve_apps.trend_lines.options import (
+    TrendLineDetectionParameters,
+    TrendLineParameters,
+)
+from curve_apps.utils import find_curves, interp_to_grid
+
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_field(x: np.ndarray, y: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Smooth synthetic field made of Gaussian anomalies and linear ridges.
+
+    :param x: Easting of the locations, normalized to [0, 1].
+    :param y: Northing of the locations, normalized to [0, 1].
+    :param seed: Seed of the random anomalies.
+
+    :returns: Values of the field at the locations.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.zeros_like(x, dtype=float)
+
+    for center, width, amplitude in zip(
+        rng.random((8, 2)),
+        rng.uniform(0.02, 0.1, 8),
+        rng.uniform(-1, 1, 8),
+        strict=True,
+    ):
+        values += amplitude * np.exp(
+            -((x - center[0]) ** 2 + (y - center[1]) ** 2) / (2 * width**2)
+        )
+
+    for angle, offset in zip(
+        rng.uniform(0, np.pi, 3), rng.uniform(0.2, 0.8, 3), strict=True
+    ):
+        distance = (x - 0.5) * np.cos(angle) + (y - 0.5) * np.sin(angle) + 0.5
+        values += 0.5 * (distance > offset)
+
+    return values
+
+
+def make_grid(
+    workspace: Workspace, size: int, seed: int = 0
+) -> tuple[Grid2D, FloatData]:
+    """
+    Create a square Grid2D with a synthetic field.
+
+    :param workspace: Target workspace.
+    :param size: Number of cells along each axis.
+    :param seed: Seed of the field.
+
+    :returns: The grid and its data.
+    """
+    grid = Grid2D.create(
+        workspace,
+        origin=[0, 0, 0],
+        u_cell_size=1.0,
+        v_cell_size=1.0,
+        u_count=size,
+        v_count=size,
+        name="benchmark grid",
+    )
+    x, y = np.meshgrid(np.linspace(0, 1, size), np.linspace(0, 1, size))
+    data = grid.add_data({"values": {"values": synthetic_field(x, y, seed).flatten()}})
+
+    return grid, data
+
+
+def make_points(
+    workspace: Workspace, size: int, seed: int = 0
+) -> tuple[Points, FloatData]:
+    """
+    Create a scattered Points survey with a synthetic field.
+
+    :param workspace: Target workspace.
+    :param size: Number of points.
+    :param seed: Seed of the locations and field.
+
+    :returns: The points and their data.
+    """
+    rng = np.random.default_rng(seed)
+    locations = rng.random((size, 2))
+    extent = np.sqrt(size)
+    points = Points.create(
+        workspace,
+        vertices=np.c_[locations * extent, np.zeros(size)],
+        name="benchmark points",
+    )
+    data = points.add_data(
+        {"values": {"values": synthetic_field(locations[:, 0], locations[:, 1], seed)}}
+    )
+
+    return points, data
+
+
+def make_picks(
+    workspace: Workspace, size: int, seed: int = 0, n_lines: int = 20
+) -> tuple[Curve, ReferencedData]:
+    """
+    Create picks along survey lines, labelled by trends crossing the lines.
+
+    :param workspace: Target workspace.
+    :param size: Number of trends.
+    :param seed: Seed of the trends and noise.
+    :param n_lines: Number of survey lines.
+
+    :returns: The curve of picks, with one part per line, and the labels.
+    """
+    rng = np.random.default_rng(seed)
+    y_lines = np.linspace(0, 100.0 * n_lines, n_lines)
+    labels = rng.integers(1, 4, size)
+    origins = rng.uniform(0, 100.0 * size, size)
+    slopes = rng.uniform(-0.5, 0.5, size)
+
+    x_picks = origins[:, None] + slopes[:, None] * y_lines[None, :]
+    x_picks += rng.normal(scale=5.0, size=x_picks.shape)
+
+    vertices = np.c_[
+        x_picks.flatten(),
+        np.tile(y_lines, size),
+        np.zeros(x_picks.size),
+    ]
+    order = np.argsort(np.tile(np.arange(n_lines), size), kind="stable")
+    parts = np.tile(np.arange(n_lines), size)[order]
+    curve = Curve.create(
+        workspace, vertices=vertices[order], parts=parts, name="benchmark picks"
+    )
+    data = curve.add_data(
+        {
+            "labels": {
+                "values": np.repeat(labels, n_lines)[order].astype(np.int32),
+                "value_map": {1: "A", 2: "B", 3: "C"},
+                "type": "referenced",
+            }
+        }
+    )
+
+    return curve, data
+
+
+@dataclass
+class Benchmark:
+    """
+    Benchmark of a function over synthetic data.
+
+    :param name: Name of the benchmark.
+    :param setup: Function of the workspace, size and seed returning the
+        callable to time.
+    :param sizes: Default sizes of the synthetic data.
+    """
+
+    name: str
+    setup: Callable[[Workspace, int, int], Callable[[], object]]
+    sizes: tuple[int, ...]
+
+
+def setup_interp_to_grid(workspace, size, seed):
+    """Interpolation of scattered points."""
+    points, data = make_points(workspace, size, seed)
+
+    return lambda: interp_to_grid(points, data.values, 0.5, 2.0)
+
+
+def setup_get_contours(workspace, size, seed):
+    """Contouring of a grid."""
+    grid, data = make_grid(workspace, size, seed)
+    axes = [np.arange(size, dtype=float), np.arange(size, dtype=float)]
+    values = data.values.reshape(grid.shape[::-1])
+    levels = np.linspace(values.min(), values.max(), 12)[1:-1].tolist()
+
+    return lambda: ContoursDriver.get_contours(axes, values, levels)
+
+
+def setup_get_canny_edges(workspace, size, seed):
+    """Canny filter of a grid."""
+    grid, data = make_grid(workspace, size, seed)
+    values = data.values.reshape(grid.shape, order="F")
+    detection = EdgeDetectionParameters(sigma=2.0)
+
+    return lambda: EdgesDriver.get_canny_edges(values, detection)
+
+
+def setup_get_line_indices(workspace, size, seed):
+    """Hough lines on the Canny edges of a grid."""
+    grid, data = make_grid(workspace, size, seed)
+    values = data.values.reshape(grid.shape, order="F")
+    canny = EdgesDriver.get_canny_edges(values, EdgeDetectionParameters(sigma=2.0))
+
+    return lambda: EdgesDriver.get_line_indices(
+        canny, line_length=8, line_gap=1, threshold=1, window_size=128
+    )
+
+
+def setup_find_curves(workspace, size, seed):
+    """Trend lines over the labels of picks."""
+    curve, data = make_picks(workspace, size, seed)
+    vertices = curve.vertices[:, :2]
+    detection = TrendLineDetectionParameters(max_distance=150.0, min_edges=2)
+    labels = data.values
+
+    def run():
+        for label in np.unique(labels):
+            ind = labels == label
+            find_curves(vertices[ind], curve.parts[ind], detection)
+
+    return run
+
+
+def make_contours_driver(workspace, size, seed) -> ContoursDriver:
+    """Contours driver on scattered points."""
+    points, data = make_points(workspace, size, seed)
+    params = ContourParameters.build(
+        geoh5=workspace,
+        objects=points,
+        data=data,
+        interval_min=-1.0,
+        interval_max=1.0,
+        interval_spacing=0.2,
+        resolution=0.5,
+        max_distance=2.0,
+        export_as="contours",
+    )
+
+    return ContoursDriver(params)
+
+
+def make_edges_driver(workspace, size, seed) -> EdgesDriver:
+    """Edges driver on a grid."""
+    grid, data = make_grid(workspace, size, seed)
+    params = EdgeParameters.build(
+        geoh5=workspace,
+        objects=grid,
+        data=data,
+        sigma=2.0,
+        line_length=8,
+        window_size=128,
+        export_as="edges",
+    )
+
+    return EdgesDriver(params)
+
+
+def make_trend_lines_driver(workspace, size, seed) -> TrendLinesDriver:
+    """Trend lines driver on picks."""
+    curve, data = make_picks(workspace, size, seed)
+    params = TrendLineParameters.build(
+        geoh5=workspace,
+        entity=curve,
+        data=data,
+        max_distance=150.0,
+        min_edges=2,
+        export_as="trend lines",
+    )
+
+    return TrendLinesDriver(params)
+
+
+def setup_compute(
+    make_driver: Callable[[Workspace, int, int], BaseCurveDriver],
+) -> Callable[[Workspace, int, int], Callable[[], object]]:
+    """
+    Setup timing the computation of a driver, without writing.
+
+    :param make_driver: Function of the workspace, size and seed returning
+        the driver.
+    """
+
+    def setup(workspace, size, seed):
+        return make_driver(workspace, size, seed).get_payload
+
+    return setup
+
+
+def setup_write(
+    make_driver: Callable[[Workspace, int, int], BaseCurveDriver],
+) -> Callable[[Workspace, int, int], Callable[[], object]]:
+    """
+    Setup timing the writing of the curve computed once by a driver.
+
+    Each call writes a new curve, with its data, to the workspace.
+
+    :param make_driver: Function of the workspace, size and seed returning
+        the driver.
+    """
+
+    def setup(workspace, size, seed):
+        driver = make_driver(workspace, size, seed)
+        payload = driver.get_payload()
+
+        return lambda: driver.write_payload(payload)
+
+    return setup
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    benchmark.name: benchmark
+    for benchmark in [
+        Benchmark("interp_to_grid", setup_interp_to_grid, (10_000, 40_000, 160_000)),
+        Benchmark("get_contours", setup_get_contours, (256, 512, 1024)),
+        Benchmark("get_canny_edges", setup_get_canny_edges, (256, 512, 1024)),
+        Benchmark("get_line_indices", setup_get_line_indices, (256, 512, 1024)),
+        Benchmark("find_curves", setup_find_curves, (20, 80, 320)),
+        Benchmark(
+            "contours_driver", setup_compute(make_contours_driver), (10_000, 40_000)
+        ),
+        Benchmark("edges_driver", setup_compute(make_edges_driver), (256, 512)),
+        Benchmark(
+            "trend_lines_driver", setup_compute(make_trend_lines_driver), (20, 80)
+        ),
+        Benchmark(
+            "contours_write", setup_write(make_contours_driver), (10_000, 40_000)
+        ),
+        Benchmark("edges_write", setup_write(make_edges_driver), (256, 512)),
+        Benchmark("trend_lines_write", setup_write(make_trend_lines_driver), (20, 80)),
+    ]
+}
+
+
+def time_call(func: Callable[[], object], repeat: int = 3) -> list[float]:
+    """
+    Time repeated calls of a function.
+
+    :param func: Function to call.
+    :param repeat: Number of calls.
+
+    :returns: Run time of each call in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+
+    return times
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    scale: float = 1.0,
+    repeat: int = 3,
+    seed: int = 0,
+) -> dict:
+    """
+    Run the benchmarks over their range of sizes.
+
+    :param names: Names of the benchmarks to run, defaults to all.
+    :param scale: Scaling factor applied to the default sizes.
+    :param repeat: Number of timed calls for each size.
+    :param seed: Seed of the synthetic data.
+
+    :returns: Dictionary of results, with the minimum and median run times.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names or BENCHMARKS:
+            benchmark = BENCHMARKS[name]
+            for size in benchmark.sizes:
+                size = max(int(size * scale), 2)
+                key = f"{name}[{size}]"
+                with Workspace.create(Path(directory) / f"{name}_{size}.geoh5") as ws:
+                    func = benchmark.setup(ws, size, seed)
+                    times = time_call(func, repeat)
+
+                results[key] = {
+                    "name": name,
+                    "size": size,
+                    "min": min(times),
+                    "median": float(np.median(times)),
+                    "repeat": repeat,
+                }
+                logger.info("%-32s%10.4f s", key, min(times))
+
+    return {
+        "meta": {
+            "curve_apps": __version__,
+            "numpy": np.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2) -> list[str]:
+    """
+    Compare benchmark results against a baseline.
+
+    :param current: Current results.
+    :param baseline: Baseline results.
+    :param threshold: Relative slowdown of the minimum run time flagged as
+        a regression.
+
+    :returns: Description of the regressions.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None or reference["min"] <= 0:
+            continue
+
+        ratio = result["min"] / reference["min"]
+        if ratio > 1.0 + threshold:
+            regressions.append(
+                f"{key}: {result['min']:.4f} s vs {reference['min']:.4f} s "
+                f"({100 * (ratio - 1):.0f}% slower)"
+            )
+
+    return regressions
+
+
+def main(args: list[str] | None = None) -> int:
+    """
+    Command line interface of the benchmarks.
+
+    :param args: Command line arguments.
+
+    :returns: Exit code, non-zero if regressions are found.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks of curve-apps.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("output", help="Path to the json file of results.")
+    run_parser.add_argument("--names", nargs="*", choices=list(BENCHMARKS))
+    run_parser.add_argument("--scale", type=float, default=1.0)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare results against a baseline."
+    )
+    compare_parser.add_argument("current", help="Path to the current results.")
+    compare_parser.add_argument("baseline", help="Path to the baseline results.")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    options = parser.parse_args(args)
+
+    if options.command == "run":
+        results = run_benchmarks(
+            options.names, options.scale, options.repeat, options.seed
+        )
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+        return 0
+
+    with open(options.current, encoding="utf-8") as file:
+        current = json.load(file)
+    with open(options.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    regressions = compare(current, baseline, options.threshold)
+    for regression in regressions:
+        logger.warning("Regression %s", regression)
+
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+from geoh5py.data import Data
+from geoh5py.objects import CellObject, Grid2D, ObjectBase
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_directory() -> Path:
+    """
+    Cache directory set by the 'CURVE_APPS_CACHE_DIR' environment variable,
+    or in the user cache folder.
+    """
+    directory = os.environ.get("CURVE_APPS_CACHE_DIR")
+    if directory:
+        return Path(directory)
+
+    return Path.home() / ".cache" / "curve_apps"
+
+
+def fingerprint(*items) -> str:
+    """
+    Hash the content of arrays, geoh5py entities and parameters.
+
+    Objects are hashed from their geometry and data from their values, such
+    that copies of the same entity share the same fingerprint.
+
+    :param items: Items to hash.
+
+    :returns: Hexadecimal sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for item in items:
+        update_digest(digest, item)
+
+    return digest.hexdigest()
+
+
+def update_digest(digest, item):
+    """
+    Update a hash with the content of an item.
+
+    :param digest: Hash object.
+    :param item: Array, geoh5py entity, pydantic model or json serializable value.
+    """
+    if isinstance(item, np.ndarray):
+        array = np.ascontiguousarray(item)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    elif isinstance(item, Data):
+        digest.update(type(item).__name__.encode())
+        update_digest(digest, np.asarray(item.values))
+    elif isinstance(item, Grid2D):
+        digest.update(type(item).__name__.encode())
+        for value in [
+            item.origin.tolist(),
+            item.shape,
+            item.u_cell_size,
+            item.v_cell_size,
+            item.rotation,
+            item.dip,
+        ]:
+            digest.update(repr(value).encode())
+    elif isinstance(item, ObjectBase):
+        digest.update(type(item).__name__.encode())
+        update_digest(digest, np.asarray(item.locations))
+        if isinstance(item, CellObject) and item.cells is not None:
+            update_digest(digest, np.asarray(item.cells))
+    elif isinstance(item, BaseModel):
+        digest.update(item.model_dump_json().encode())
+    else:
+        digest.update(json.dumps(item, sort_keys=True, default=repr).encode())
+
+
+class ResultCache:
+    """
+    Cache of computed arrays stored as npz files in a local directory.
+
+    The least recently used entries are evicted once the total size of the
+    cache goes over the limit.
+
+    :param directory: Cache directory.
+    :param max_size: Maximum size of the cache (MB).
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_size: float = 1000.0):
+        self.directory = Path(directory or default_cache_directory())
+        self.max_size = max_size
+
+    def path(self, key: str) -> Path:
+        """
+        Path of a cache entry.
+
+        :param key: Key of the entry.
+        """
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """
+        Load the arrays of a cache entry.
+
+        :param key: Key of the entry.
+
+        :returns: Dictionary of arrays, or None if the entry is missing.
+        """
+        path = self.path(key)
+        if not path.is_file():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as content:
+                arrays = {name: content[name] for name in content.files}
+            os.utime(path)
+        except (OSError, ValueError) as error:
+            logger.warning("Removing unreadable cache entry %s: %s", path, error)
+            path.unlink(missing_ok=True)
+            return None
+
+        return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> Path | None:
+        """
+        Store arrays under a key, then evict old entries.
+
+        :param key: Key of the entry.
+        :param arrays: Dictionary of arrays.
+
+        :returns: Path to the entry, or None if it could not be written.
+        """
+        path = self.path(key)
+        temp = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as file:
+                np.savez(file, **arrays)
+            os.replace(temp, path)
+        except OSError as error:
+            logger.warning("Could not write cache entry %s: %s", path, error)
+            temp.unlink(missing_ok=True)
+            return None
+
+        self.evict(keep=path)
+
+        return path
+
+    def evict(self, keep: Path | None = None):
+        """
+        Remove the least recently used entries until the cache fits its size.
+
+        :param keep: Entry never removed.
+        """
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry)
+            for entry in self.directory.glob("*.npz")
+        )
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry in entries:
+            if total <= self.max_size * 1e6:
+                break
+            if entry == keep:
+                continue
+
+            entry.unlink(missing_ok=True)
+            total -= size
@@ -12,20 +12,30 @@ from __future__ import annotations
 
 import logging
 import sys
+from collections.abc import Iterator
 
 import numpy as np
 from geoapps_utils.utils.formatters import string_name
 from geoapps_utils.utils.transformations import rotate_xyz
 from geoh5py.objects import Curve, Grid2D
-from geoh5py.ui_json import InputFile, utils
-from skimage import measure
+from geoh5py.ui_json import InputFile
 
 from curve_apps.contours.options import ContourParameters
-from curve_apps.driver import BaseCurveDriver
+from curve_apps.diagnostics import estimate_stage
+from curve_apps.driver import (
+    BaseCurveDriver,
+    CurveBuffer,
+    CurveOutput,
+    CurvePayload,
+)
+from curve_apps.options import ExecutionParameters
+from curve_apps.parallel import parallel_map
 from curve_apps.utils import (
+    estimate_grid,
     image_to_grid_coordinate_transfer,
     interp_to_grid,
     set_vertices_height,
+    smooth_grid,
 )
 
 
@@ -44,109 +54,273 @@ class ContoursDriver(BaseCurveDriver):
     def __init__(self, parameters: ContourParameters | InputFile):
         super().__init__(parameters)
 
-    def make_curve(self):
+    def estimate(self) -> dict:
         """
-        Make curve object from contours detected in source data.
+        Estimate the grid size and number of contour levels.
         """
+        entity = self.params.source.objects
+        detection = self.params.detection
+        levels = len(detection.contours)
+        shape, stages = estimate_grid(entity, detection.resolution)
+        nodes = shape[0] * shape[1]
 
-        with utils.fetch_active_workspace(self.workspace, mode="r+"):
-            logger.info("Generating contours ...")
+        if detection.smoothing is not None:
+            stages["smooth_grid"] = estimate_stage("smooth_grid", nodes)
 
-            entity = self.params.source.objects
-            data = self.params.source.data
+        stages["get_contours"] = estimate_stage("get_contours", nodes, nodes * levels)
 
-            if isinstance(self.params.source.objects, Grid2D):
-                x_grid = entity.origin["x"] + (
-                    entity.u_cell_size * np.arange(entity.shape[0])
-                )
-                y_grid = entity.origin["y"] + (
-                    entity.v_cell_size * np.arange(entity.shape[1])
-                )
-                grid = [x_grid, y_grid]
-                data = data.values.reshape(entity.shape[::-1], order="C")
+        return {
+            "grid_shape": shape,
+            "grid_nodes": nodes,
+            "levels": levels,
+            "source_values": self.params.source.data.n_values,
+            "stages": stages,
+        }
+
+    def compute(self) -> CurvePayload:
+        """
+        Compute the contours detected in source data.
 
-            else:
+        Contours are held as polylines with one value each, expanded to the
+        vertices when writing the curve.
+        """
+        logger.info("Generating contours ...")
+
+        entity = self.params.source.objects
+        data = self.params.source.data
+        detection = self.params.detection
+        dtype = self.params.dtype
+        self.metrics.count("vertices_in", len(data.values))
+
+        if isinstance(self.params.source.objects, Grid2D):
+            origin = np.r_[entity.origin["x"], entity.origin["y"]]
+            x_grid = entity.u_cell_size * np.arange(entity.shape[0])
+            y_grid = entity.v_cell_size * np.arange(entity.shape[1])
+            grid = [x_grid.astype(dtype), y_grid.astype(dtype)]
+            cell_size = (entity.u_cell_size, entity.v_cell_size)
+            data = data.values.reshape(entity.shape[::-1], order="C").astype(
+                dtype, copy=False
+            )
+
+        else:
+            origin = entity.locations[:, :2].min(axis=0)
+            cell_size = (detection.resolution, detection.resolution)
+            with self.metrics.stage("interp_to_grid"):
                 grid, data = interp_to_grid(
                     self.params.source.objects,
                     self.params.source.data.values,
                     self.params.detection.resolution,
                     self.params.detection.max_distance,
+                    origin=origin,
+                    dtype=dtype,
+                    method=self.params.detection.gridding_method,
+                )
+
+        if detection.smoothing is not None:
+            with self.metrics.stage("smooth_grid"):
+                data = smooth_grid(
+                    data,
+                    sigma=(
+                        detection.smoothing / cell_size[1],
+                        detection.smoothing / cell_size[0],
+                    ),
+                    workers=self.params.execution.workers,
                 )
 
-            locations, edges, values = ContoursDriver.get_contours(
-                grid, data, self.params.detection.contours
+        self.metrics.count("grid_nodes", data.size)
+        self.metrics.count("levels", len(self.params.detection.contours))
+
+        with self.metrics.stage("get_contours"):
+            locations, edges, values, offsets = ContoursDriver.get_polylines(
+                grid,
+                data,
+                self.params.detection.contours,
+                self.params.execution,
+                dtype=dtype,
             )
 
-            if isinstance(entity, Grid2D):
-                locations = rotate_xyz(
-                    locations, center=entity.origin.tolist(), theta=entity.rotation
-                )
+        if isinstance(entity, Grid2D):
+            locations = rotate_xyz(
+                np.c_[locations, np.zeros(len(locations))],
+                center=[0.0, 0.0, 0.0],
+                theta=entity.rotation,
+            )[:, :2]
+
+        return CurvePayload(
+            vertices=locations.astype(dtype, copy=False),
+            cells=edges,
+            values={"values": values},
+            origin=np.r_[origin, 0.0],
+            offsets=offsets,
+        )
+
+    def write_curve(self, payload: CurvePayload) -> Curve:
+        """
+        Write the contours with their values.
 
-            if self.params.z_value:
-                locations = np.c_[locations, values]
-            else:
-                locations = set_vertices_height(locations, self.params.source.objects)
-
-            curve = Curve.create(
-                self.workspace,
-                name=string_name(self.params.export_as),
-                vertices=locations,
-                cells=edges,
-                parent=self.out_group,
+        :param payload: Computed contours.
+        """
+        values = payload.vertex_values("values")
+        if self.params.z_value:
+            locations = np.c_[payload.locations[:, :2], values]
+        else:
+            locations = set_vertices_height(
+                payload.locations[:, :2], self.params.source.objects
             )
-            curve.add_data(
-                {
-                    self.params.source.data.name: {
-                        "association": "VERTEX",
-                        "values": values,
-                    }
+
+        output = CurveOutput(
+            self.workspace,
+            name=string_name(self.params.export_as),
+            vertices=locations,
+            cells=payload.cells,
+            parent=self.out_group,
+        )
+        output.add_data(
+            {
+                self.params.source.data.name: {
+                    "association": "VERTEX",
+                    "values": values,
                 }
-            )
+            }
+        )
+        curve = output.write()
+        self.metrics.count("curves_out", len(np.unique(curve.parts)))
 
-            return curve
+        return curve
 
     @staticmethod
-    def get_contours(
-        grid: list[np.ndarray], data: np.ndarray, contour_list: list[float]
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def iter_contours(
+        grid: list[np.ndarray],
+        data: np.ndarray,
+        contour_list: list[float],
+        execution: ExecutionParameters | None = None,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, float]]:
         """
-        Return vertices, edges, and values for contours.
+        Generate the vertices, edges and value of contours, one line at a time.
+
+        The contour levels are traced with the backend of the execution options.
 
         :param grid: list of x and y grids.
         :param data: 2D array of data living in grid.
         :param contour_list: list of contour values.
+        :param execution: Parallel execution options.
+
+        :returns: Vertices, edges indexed on the vertices of the line, and value.
         """
+        levels = parallel_map(
+            ContoursDriver.get_level_contours,
+            contour_list,
+            execution,
+            arrays={"data": data},
+        )
 
         interp = image_to_grid_coordinate_transfer(data, grid)
-        vertices, edges, values = [], [], []
-        v0 = 0
-        for contour in contour_list:
-            coords = measure.find_contours(data, contour)
-            if not coords:
-                continue
-
-            for coord in coords:
+        for contour, lines in zip(contour_list, levels, strict=True):
+            for coord in lines:
                 segment_vertices = interp(coord[:, 1], coord[:, 0])
                 nv = len(segment_vertices)
-                segment_edges = np.c_[np.arange(nv - 1), np.arange(1, nv)] + v0
-                vertices.append(segment_vertices)
-                edges.append(segment_edges)
-                values.append([contour] * nv)
-                v0 += nv
+                segment_edges = np.c_[np.arange(nv - 1), np.arange(1, nv)]
+
+                yield segment_vertices, segment_edges, contour
+
+    @staticmethod
+    def get_polylines(
+        grid: list[np.ndarray],
+        data: np.ndarray,
+        contour_list: list[float],
+        execution: ExecutionParameters | None = None,
+        dtype=np.float64,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return contours as polylines, with one value per polyline.
+
+        Closed contours loop back onto their first vertex, rather than
+        repeating it.
 
-        if not vertices:
+        :param grid: list of x and y grids.
+        :param data: 2D array of data living in grid.
+        :param contour_list: list of contour values.
+        :param execution: Parallel execution options.
+        :param dtype: Data type of the vertices and values.
+
+        :returns: Vertices, edges, values of the polylines and offsets of the
+            polylines in the vertices, followed by the number of vertices.
+        """
+        buffer = CurveBuffer(dim=2, dtype=dtype)
+        starts, levels = [], []
+        for vertices, edges, value in ContoursDriver.iter_contours(
+            grid, data, contour_list, execution
+        ):
+            if len(vertices) > 3 and np.array_equal(vertices[0], vertices[-1]):
+                vertices = vertices[:-1]
+                edges[-1, 1] = 0
+
+            starts.append(buffer.n_vertices)
+            levels.append(value)
+            buffer.append(vertices, edges)
+
+        if buffer.n_vertices == 0:
             raise ValueError(
                 "No contours detected. Check that the requested contour "
                 "values are within the bounds of the data."
             )
 
         return (
-            np.vstack(vertices),
-            np.vstack(edges).astype("uint32"),
-            np.hstack(values),
+            buffer.vertices,
+            buffer.cells,
+            np.asarray(levels, dtype=dtype),
+            np.r_[starts, buffer.n_vertices].astype(np.uint32),
         )
 
+    @staticmethod
+    def get_level_contours(level: float, data: np.ndarray) -> list[np.ndarray]:
+        """
+        Trace the contour lines of a single level.
+
+        :param level: Contour value.
+        :param data: 2D array of data living in grid.
+
+        :returns: List of (row, column) coordinates of the lines.
+        """
+        from skimage import measure  # pylint: disable=import-outside-toplevel
+
+        return measure.find_contours(data, level)
+
+    @staticmethod
+    def get_contours(
+        grid: list[np.ndarray],
+        data: np.ndarray,
+        contour_list: list[float],
+        execution: ExecutionParameters | None = None,
+        dtype=np.float64,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return vertices, edges, and values for contours.
+
+        Lines are appended to a growable buffer as they are generated.
+
+        :param grid: list of x and y grids.
+        :param data: 2D array of data living in grid.
+        :param contour_list: list of contour values.
+        :param execution: Parallel execution options.
+        :param dtype: Data type of the vertices and values.
+        """
+        buffer = CurveBuffer(dim=2, dtype=dtype)
+        for vertices, edges, value in ContoursDriver.iter_contours(
+            grid, data, contour_list, execution
+        ):
+            buffer.append(vertices, edges, {"values": dtype(value)})
+
+        if buffer.n_vertices == 0:
+            raise ValueError(
+                "No contours detected. Check that the requested contour "
+                "values are within the bounds of the data."
+            )
+
+        return buffer.vertices, buffer.cells, buffer.values["values"]
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     file = sys.argv[1]
     driver = ContoursDriver.start(file)
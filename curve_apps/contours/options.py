@@ -11,16 +11,16 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Literal
 
 import numpy as np
-from geoapps_utils.base import Options
 from geoh5py.data import Data
 from geoh5py.objects import Curve, Grid2D, Points, Surface
 from geoh5py.ui_json.utils import str2list
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from curve_apps import assets_path
+from curve_apps.options import BaseCurveParameters
 
 
 class ContourSourceParameters(BaseModel):
@@ -47,6 +47,10 @@ class ContourDetectionParameters(BaseModel):
     :param fixed_contours: String defining list of fixed contours.
     :param max_distance: Maximum distance for interpolation.
     :param resolution: Resolution of underlying grid.
+    :param gridding_method: Interpolation of scattered data on the grid, one of
+        'curve_apps.gridding.GRIDDING_METHODS'.
+    :param smoothing: Standard deviation (m) of a Gaussian filter applied to
+        the grid before contouring.
     """
 
     interval_min: float | None = None
@@ -55,6 +59,8 @@ class ContourDetectionParameters(BaseModel):
     fixed_contours: list[float] | None = None
     max_distance: float = 500.0
     resolution: float = 50.0
+    gridding_method: Literal["idw", "linear", "cubic", "nearest", "block_mean"] = "idw"
+    smoothing: float | None = Field(default=None, gt=0)
 
     @field_validator("fixed_contours", mode="before")
     @classmethod
@@ -112,7 +118,7 @@ class ContourDetectionParameters(BaseModel):
         return contours
 
 
-class ContourParameters(Options):
+class ContourParameters(BaseCurveParameters):
     """
     Contour parameters for use with `contours.driver`.
 
@@ -126,7 +132,6 @@ class ContourParameters(Options):
     title: ClassVar[str] = "Contour Detection"
     run_command: ClassVar[str] = "curve_apps.contour_detection.driver"
 
-    conda_environment: str = "curve_apps"
     source: ContourSourceParameters
     detection: ContourDetectionParameters = ContourDetectionParameters()
     z_value: bool = False
@@ -0,0 +1,296 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import tracemalloc
+import warnings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+#: Approximate run time (s) and memory (bytes) per unit of work of the main
+#: stages, measured on synthetic data with curve_apps.benchmark. The units are
+#: grid nodes, times contour levels for the run time of 'get_contours', and
+#: vertices for 'find_curves'.
+STAGE_COSTS: dict[str, dict[str, float]] = {
+    "interp_to_grid": {"time": 2.5e-6, "memory": 330.0},
+    "smooth_grid": {"time": 1.2e-7, "memory": 60.0},
+    "get_contours": {"time": 3e-8, "memory": 10.0},
+    "get_canny_edges": {"time": 2.5e-7, "memory": 50.0},
+    "get_line_indices": {"time": 5e-8, "memory": 2.0},
+    "find_curves": {"time": 2e-4, "memory": 150.0},
+}
+
+# Tracing is process-wide, so the open stages of all runs share its state
+_TRACE_LOCK = threading.Lock()
+_TRACE_STATE: dict[str, Any] = {"started": False, "peaks": []}
+
+
+class RunMetrics:
+    """
+    Collect timers and counters over the stages of a driver run.
+
+    Stages entered several times accumulate their run time and number of calls.
+
+    With memory tracking, the tracemalloc high-water mark of each stage is
+    recorded, in MB, along with the increase of the peak resident set size
+    (RSS) of the process during the stage and the process-wide RSS high-water
+    mark at the end of the stage. The RSS includes the allocations made outside
+    of Python, e.g. by NumPy, but only grows when a stage exceeds the peak of
+    all the previous ones. Tracing is shared by the runs of the process, such
+    that the traced peaks of concurrent runs include each other's allocations.
+
+    :param track_memory: Record the peak memory of each stage.
+    :param memory_budget: Memory (MB) traced by tracemalloc above which a stage
+        raises a warning.
+    """
+
+    def __init__(self, track_memory: bool = False, memory_budget: float | None = None):
+        self.track_memory = track_memory
+        self.memory_budget = memory_budget
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, float] = {}
+        self._peaks: list[list[int]] = []
+        self._rss: list[float | None] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage of the process.
+
+        :param name: Name of the stage.
+        """
+        if self.track_memory:
+            self._enter_memory()
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {"time": 0.0, "calls": 0})
+            stage["time"] += perf_counter() - start
+            stage["calls"] += 1
+
+            if self.track_memory:
+                self._exit_memory(name, stage)
+
+    @staticmethod
+    def _update_peaks():
+        """
+        Propagate the current tracemalloc peak to the open stages of all runs.
+
+        Must be called while holding the trace lock.
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for value in _TRACE_STATE["peaks"]:
+            value[0] = max(value[0], peak)
+        tracemalloc.reset_peak()
+
+    def _enter_memory(self):
+        """
+        Start tracing memory for a new stage.
+        """
+        with _TRACE_LOCK:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _TRACE_STATE["started"] = True
+
+            self._update_peaks()
+            peak = [tracemalloc.get_traced_memory()[0]]
+            _TRACE_STATE["peaks"].append(peak)
+
+        self._peaks.append(peak)
+        self._rss.append(peak_rss())
+
+    def _exit_memory(self, name: str, stage: dict):
+        """
+        Record the memory high-water marks of a stage and check the budget.
+
+        Tracing stops with the last open stage of all runs, if started by them.
+
+        :param name: Name of the stage.
+        :param stage: Metrics of the stage.
+        """
+        peak = self._peaks.pop()
+        with _TRACE_LOCK:
+            self._update_peaks()
+            _TRACE_STATE["peaks"] = [
+                value for value in _TRACE_STATE["peaks"] if value is not peak
+            ]
+            if not _TRACE_STATE["peaks"] and _TRACE_STATE["started"]:
+                tracemalloc.stop()
+                _TRACE_STATE["started"] = False
+
+        traced = peak[0] / 1e6
+        stage["traced_peak"] = max(stage.get("traced_peak", 0.0), traced)
+
+        start, rss = self._rss.pop(), peak_rss()
+        if start is not None and rss is not None:
+            stage["rss_increase"] = max(stage.get("rss_increase", 0.0), rss - start)
+            stage["rss_high_water"] = rss
+
+        if self.memory_budget is not None and traced > self.memory_budget:
+            warnings.warn(
+                f"Stage '{name}' used {traced:.1f} MB, "
+                f"over the memory budget of {self.memory_budget:.1f} MB.",
+                stacklevel=3,
+            )
+
+    def count(self, name: str, value: float = 1):
+        """
+        Increment a counter.
+
+        :param name: Name of the counter.
+        :param value: Increment.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        """
+        Metrics as a json serializable dictionary.
+        """
+        return {
+            "stages": {name: dict(stage) for name, stage in self.stages.items()},
+            "counters": {
+                name: value.item() if hasattr(value, "item") else value
+                for name, value in self.counters.items()
+            },
+        }
+
+    def summary(self) -> str:
+        """
+        Summary of the stages and counters.
+        """
+        lines = []
+        for name, stage in self.stages.items():
+            line = f"{name:<28}{stage['time']:10.3f} s ({int(stage['calls'])} calls)"
+            if "traced_peak" in stage:
+                line += f" {stage['traced_peak']:10.1f} MB traced"
+            if "rss_increase" in stage:
+                line += f" {stage['rss_increase']:10.1f} MB RSS increase"
+            elif "traced_peak" in stage:
+                line += " (RSS unavailable)"
+            lines.append(line)
+
+        lines += [f"{name:<28}{value:>10}" for name, value in self.counters.items()]
+
+        return "\n".join(lines)
+
+    def write(self, path: str | Path, **kwargs) -> Path:
+        """
+        Write the metrics to a json file.
+
+        :param path: Path to the json file.
+        :param kwargs: Additional information stored with the metrics.
+
+        :returns: Path to the file.
+        """
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({**kwargs, **self.to_dict()}, file, indent=4)
+
+        return path
+
+
+def estimate_stage(
+    name: str, units: float, time_units: float | None = None
+) -> dict[str, float]:
+    """
+    Estimate the run time and peak memory of a stage.
+
+    :param name: Name of the stage in STAGE_COSTS.
+    :param units: Units of work, setting the memory.
+    :param time_units: Units of work setting the run time, defaults to units.
+
+    :returns: Run time (s) and memory (MB).
+    """
+    costs = STAGE_COSTS[name]
+    if time_units is None:
+        time_units = units
+
+    return {
+        "time": costs["time"] * time_units,
+        "memory": costs["memory"] * units / 1e6,
+    }
+
+
+def peak_rss() -> float | None:
+    """
+    Peak resident set size of the process in MB.
+
+    The peak working set is read from the Windows API, and the maximum RSS
+    from the resource module on other platforms.
+
+    :returns: Peak RSS, or None where neither is available.
+    """
+    if sys.platform == "win32":
+        return peak_working_set()
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes on Linux
+    scale = 1e-6 if sys.platform == "darwin" else 1e-3
+
+    return peak * scale
+
+
+def peak_working_set() -> float | None:  # pragma: no cover
+    """
+    Peak working set of the process in MB, on Windows.
+
+    :returns: Peak working set, or None if the query fails.
+    """
+    import ctypes  # pylint: disable=import-outside-toplevel
+    from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+    class ProcessMemoryCounters(ctypes.Structure):  # pylint: disable=too-few-public-methods
+        """
+        PROCESS_MEMORY_COUNTERS structure of the Windows API.
+        """
+
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters(cb=ctypes.sizeof(ProcessMemoryCounters))
+    windll = ctypes.windll  # type: ignore[attr-defined]
+    if not windll.psapi.GetProcessMemoryInfo(
+        windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+
+    return counters.PeakWorkingSetSize * 1e-6
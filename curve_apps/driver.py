@@ -11,16 +11,339 @@
 from __future__ import annotations
 
 import logging
+import os
+import pstats
+import random
+import threading
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cProfile import Profile
+from dataclasses import dataclass, field
+from pathlib import Path
 
+import numpy as np
 from geoapps_utils.base import Driver, Options
+from geoh5py import Workspace
+from geoh5py.data import Data
+from geoh5py.groups import Group
+from geoh5py.objects import CellObject, Curve, ObjectBase
+from geoh5py.shared.utils import find_unique_name
 from geoh5py.ui_json import InputFile
 from geoh5py.ui_json.utils import fetch_active_workspace
 
+from curve_apps import __version__
+from curve_apps.cache import ResultCache, fingerprint
+from curve_apps.diagnostics import RunMetrics
+from curve_apps.export import DeltaExport, export_in_background
+from curve_apps.parallel import blas_threads, limit_blas_threads
+
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class CurvePayload:
+    """
+    Computed vertices, cells and values of an output curve.
+
+    :param vertices: n x 3 array of vertices, relative to the origin.
+    :param cells: m x 2 array of cells.
+    :param values: Named arrays of values written with the curve.
+    :param origin: Local origin of the vertices, such that single precision
+        vertices keep their accuracy far from the coordinate system origin.
+    :param offsets: Start of each polyline in the vertices, followed by the
+        number of vertices, for payloads holding one value per polyline.
+    """
+
+    vertices: np.ndarray
+    cells: np.ndarray
+    values: dict[str, np.ndarray] = field(default_factory=dict)
+    origin: np.ndarray | None = None
+    offsets: np.ndarray | None = None
+
+    @property
+    def locations(self) -> np.ndarray:
+        """
+        Vertices in world coordinates, in double precision.
+        """
+        locations = self.vertices.astype(np.float64)
+        if self.origin is not None:
+            locations += self.origin[: locations.shape[1]]
+
+        return locations
+
+    def vertex_values(self, name: str) -> np.ndarray:
+        """
+        Values on the vertices, expanded from the polylines if needed.
+
+        :param name: Name of the values.
+        """
+        values = self.values[name]
+        if self.offsets is not None and len(values) == len(self.offsets) - 1:
+            values = np.repeat(values, np.diff(self.offsets))
+
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of the arrays in bytes.
+        """
+        return sum(array.nbytes for array in self.to_arrays().values())
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Flatten the payload to a dictionary of arrays.
+        """
+        arrays = {
+            "vertices": self.vertices,
+            "cells": self.cells,
+            **{f"values/{name}": value for name, value in self.values.items()},
+        }
+        if self.origin is not None:
+            arrays["origin"] = self.origin
+        if self.offsets is not None:
+            arrays["offsets"] = self.offsets
+
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> CurvePayload:
+        """
+        Create a payload from a dictionary of arrays.
+
+        :param arrays: Dictionary of arrays, as returned by 'to_arrays'.
+        """
+        return cls(
+            vertices=arrays["vertices"],
+            cells=arrays["cells"],
+            values={
+                name.removeprefix("values/"): value
+                for name, value in arrays.items()
+                if name.startswith("values/")
+            },
+            origin=arrays.get("origin"),
+            offsets=arrays.get("offsets"),
+        )
+
+
+class CurveBuffer:
+    """
+    Growable buffer of vertices, cells and vertex values, filled by chunks.
+
+    The cells of each chunk are indexed on the vertices of the chunk, and get
+    offset as they are appended. The arrays grow geometrically, such that the
+    results are never held as lists of arrays to be stacked.
+
+    :param dim: Dimension of the vertices.
+    :param capacity: Initial number of vertices and cells.
+    :param cells_dtype: Data type of the cells.
+    :param dtype: Data type of the vertices.
+    """
+
+    def __init__(
+        self,
+        dim: int = 3,
+        capacity: int = 1024,
+        cells_dtype="uint32",
+        dtype=np.float64,
+    ):
+        self._vertices = np.empty((capacity, dim), dtype=dtype)
+        self._cells = np.empty((capacity, 2), dtype=cells_dtype)
+        self._values: dict[str, np.ndarray] = {}
+        self.n_vertices = 0
+        self.n_cells = 0
+
+    @staticmethod
+    def grow(array: np.ndarray, size: int) -> np.ndarray:
+        """
+        Grow an array to hold at least 'size' rows, doubling its capacity.
+
+        :param array: Array to grow.
+        :param size: Number of rows needed.
+
+        :returns: The same array if large enough, or a larger copy.
+        """
+        if size <= len(array):
+            return array
+
+        new = np.empty((max(size, 2 * len(array)), *array.shape[1:]), array.dtype)
+        new[: len(array)] = array
+
+        return new
+
+    def append(
+        self,
+        vertices: np.ndarray,
+        cells: np.ndarray,
+        values: dict[str, np.ndarray | np.generic | float] | None = None,
+    ):
+        """
+        Append a chunk of vertices, cells and values.
+
+        :param vertices: Vertices of the chunk.
+        :param cells: Cells of the chunk, indexed on its vertices.
+        :param values: Values on the vertices, or scalars shared by the chunk.
+            The data type of NumPy scalars is kept.
+        """
+        start, end = self.n_vertices, self.n_vertices + len(vertices)
+
+        self._vertices = self.grow(self._vertices, end)
+        self._vertices[start:end] = vertices
+
+        self._cells = self.grow(self._cells, self.n_cells + len(cells))
+        self._cells[self.n_cells : self.n_cells + len(cells)] = cells + start
+
+        for name, value in (values or {}).items():
+            if name not in self._values:
+                self._values[name] = np.empty(
+                    len(self._vertices), dtype=np.asarray(value).dtype
+                )
+
+            self._values[name] = self.grow(self._values[name], end)
+            self._values[name][start:end] = value
+
+        self.n_vertices = end
+        self.n_cells += len(cells)
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """
+        Vertices appended so far.
+        """
+        return self._vertices[: self.n_vertices]
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        Cells appended so far.
+        """
+        return self._cells[: self.n_cells]
+
+    @property
+    def values(self) -> dict[str, np.ndarray]:
+        """
+        Vertex values appended so far.
+        """
+        return {name: value[: self.n_vertices] for name, value in self._values.items()}
+
+    def to_payload(self) -> CurvePayload:
+        """
+        Payload of the buffered curve.
+        """
+        return CurvePayload(
+            vertices=self.vertices, cells=self.cells, values=self.values
+        )
+
+
+class CurveOutput:
+    """
+    Assemble an output curve with its data, then write them in a single batch.
+
+    The curve and data are created in memory, then saved to the geoh5 file
+    together, followed by a single flush.
+
+    :param workspace: Target workspace.
+    :param name: Name of the curve.
+    :param vertices: n x 3 array of vertices.
+    :param cells: m x 2 array of cells.
+    :param parent: Parent group of the curve.
+    """
+
+    def __init__(
+        self,
+        workspace: Workspace,
+        name: str | None,
+        vertices: np.ndarray,
+        cells: np.ndarray,
+        parent: Group | None = None,
+    ):
+        self.workspace = workspace
+        self.attributes = {
+            "name": name,
+            "vertices": vertices,
+            "cells": cells,
+            "parent": parent,
+        }
+        self.data: list[tuple[ObjectBase | None, dict]] = []
+
+    def add_data(self, data: dict, entity: ObjectBase | None = None):
+        """
+        Queue data to be written, in the format of 'ObjectBase.add_data'.
+
+        :param data: Dictionary of data names and attributes.
+        :param entity: Existing object receiving the data, defaults to the curve.
+        """
+        self.data.append((entity, data))
+
+    def write(self) -> Curve:
+        """
+        Write the curve and all queued data.
+
+        :returns: The new curve.
+        """
+        curve = self.workspace.create_entity(
+            Curve,
+            entity={
+                key: value
+                for key, value in self.attributes.items()
+                if value is not None
+            },
+            save_on_creation=False,
+        )
+
+        others = []
+        for entity, data in self.data:
+            created = CurveOutput.create_data(entity or curve, data)
+            if entity is not None:
+                others += created
+
+        self.workspace.save_entity(curve)
+        for data_object in others:
+            self.workspace.save_entity(data_object)
+
+        self.workspace.geoh5.flush()
+
+        return curve
+
+    @staticmethod
+    def create_data(entity: ObjectBase, data: dict) -> list[Data]:
+        """
+        Create data on an object without saving them to file.
+
+        :param entity: Parent object.
+        :param data: Dictionary of data names and attributes.
+
+        :returns: List of new data.
+        """
+        names = [child.name for child in entity.children if isinstance(child, Data)]
+        created = []
+        for name, attributes in data.items():
+            name = find_unique_name(name, names)
+            names.append(name)
+            attributes, _ = entity.validate_association({**attributes, "name": name})
+            entity_type = entity.workspace.validate_data_type(
+                attributes, attributes.get("values")
+            )
+            data_object = entity.workspace.create_entity(
+                Data,
+                entity={
+                    "parent": entity,
+                    **{
+                        key: value
+                        for key, value in attributes.items()
+                        if key not in ["parent", "entity_type", "type", "visible"]
+                    },
+                },
+                entity_type=entity_type,
+                save_on_creation=False,
+            )
+            data_object.visible = attributes.get("visible", False)
+            created.append(data_object)
+
+        return created
+
+
 class BaseCurveDriver(Driver):
     """
     Driver for the edge detection application.
@@ -32,22 +355,411 @@ class BaseCurveDriver(Driver):
 
     def __init__(self, parameters: Options | InputFile):
         self._out_group = None
+        self.export_thread: threading.Thread | None = None
         if isinstance(parameters, InputFile):
             parameters = self._params_class.build(parameters)
 
+        diagnostics = getattr(parameters, "diagnostics", None)
+        self.metrics = RunMetrics(
+            track_memory=getattr(diagnostics, "track_memory", False),
+            memory_budget=getattr(diagnostics, "memory_budget", None),
+        )
+
         # TODO need to re-type params in base class
         super().__init__(parameters)
 
     @abstractmethod
-    def make_curve(self):
-        pass
+    def estimate(self) -> dict:
+        """
+        Estimate the size of the problem from the source metadata.
+
+        :returns: Dictionary of estimates, with the run time (s) and memory (MB)
+            of the main stages under 'stages' and the number of source values
+            under 'source_values'.
+        """
+
+    def dry_run(self) -> dict:
+        """
+        Estimate the cost of the run without loading the data or writing anything.
+
+        :returns: Dictionary of estimates, with the total run time (s) and peak
+            memory (MB).
+        """
+        with fetch_active_workspace(self.params.geoh5):
+            estimate = self.estimate()
+
+        stages = estimate.get("stages", {})
+        input_memory = 32 * (estimate.get("source_values") or 0) / 1e6
+        estimate["runtime"] = sum(stage["time"] for stage in stages.values())
+        estimate["peak_memory"] = input_memory + max(
+            (stage["memory"] for stage in stages.values()), default=0.0
+        )
+
+        lines = [
+            f"{name:<28}{value}" for name, value in estimate.items() if name != "stages"
+        ]
+        lines += [
+            f"{name:<28}{stage['time']:10.3f} s {stage['memory']:10.1f} MB"
+            for name, stage in stages.items()
+        ]
+        logger.info("Dry run estimates:\n%s", "\n".join(lines))
+
+        return estimate
+
+    @abstractmethod
+    def compute(self) -> CurvePayload | None:
+        """
+        Compute the vertices, cells and values of the output curve.
+        """
+
+    @abstractmethod
+    def write_curve(self, payload: CurvePayload) -> Curve:
+        """
+        Write the output curve from its computed payload.
+
+        :param payload: Computed curve.
+        """
+
+    def make_curve(self) -> Curve | None:
+        """
+        Make the output curve, from the result cache if possible.
+        """
+        with fetch_active_workspace(self.workspace, mode="r+"):
+            return self.write_payload(self.get_payload())
+
+    def write_payload(self, payload: CurvePayload | None) -> Curve | None:
+        """
+        Write the output curve of a computed payload.
+
+        :param payload: Computed curve, or None if nothing was found.
+
+        :returns: The new curve.
+        """
+        if payload is None:
+            logger.info("No curve found.")
+            return None
+
+        with self.metrics.stage("write"):
+            curve = self.write_curve(payload)
+
+        self.metrics.count("vertices_out", len(payload.vertices))
+        self.metrics.count("cells_out", len(payload.cells))
+        self.metrics.count("bytes_written", payload.nbytes)
+
+        return curve
+
+    @property
+    def sources(self) -> list:
+        """
+        Source objects and data of the application.
+        """
+        source = self.params.source
+        return [getattr(source, name) for name in type(source).model_fields]
+
+    def load_source(self):
+        """
+        Load the values, locations, cells and parts of the sources from file.
+        """
+        for item in self.sources:
+            if isinstance(item, Data):
+                _ = item.values
+            elif isinstance(item, ObjectBase):
+                _ = item.locations
+                if isinstance(item, CellObject):
+                    _ = item.cells
+                if isinstance(item, Curve):
+                    _ = item.parts
+
+    @property
+    def cache(self) -> ResultCache | None:
+        """
+        Result cache, if enabled.
+        """
+        options = getattr(self.params, "cache", None)
+        if options is None or not options.use_cache:
+            return None
+
+        return ResultCache(options.cache_directory, options.cache_size)
+
+    @property
+    def payload_options(self) -> list:
+        """
+        Parameters, other than the sources, read to compute the payload.
+        """
+        return [self.params.detection, self.params.precision]
+
+    def fingerprint(self) -> str:
+        """
+        Fingerprint of the source content and of the parameters of the payload.
+        """
+        return fingerprint(
+            type(self).__name__,
+            __version__,
+            *self.sources,
+            *self.payload_options,
+        )
+
+    def get_payload(self) -> CurvePayload | None:
+        """
+        Get the computed curve from the result cache, or compute and store it.
+        """
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = self.fingerprint()
+            arrays = cache.get(key)
+            if arrays is not None:
+                logger.info("Using cached result %s", cache.path(key))
+                self.metrics.count("cache_hits")
+                return CurvePayload.from_arrays(arrays)
+
+            self.metrics.count("cache_misses")
+
+        with limit_blas_threads(blas_threads(self.params.execution)):
+            payload = self.compute()
+
+        if cache is not None and key is not None and payload is not None:
+            cache.put(key, payload.to_arrays())
+
+        return payload
 
     def run(self):
         """
         Run method of the driver.
         """
+        if getattr(self.params, "dry_run", False):
+            self.dry_run()
+            return
+
         with fetch_active_workspace(self.params.geoh5, mode="r+"):
             logging.info("Begin Process ...")
-            curve = self.make_curve()
+            profiler = self.get_profiler()
+            with self.metrics.stage("make_curve"):
+                if profiler is None:
+                    curve = self.make_curve()
+                else:
+                    with profiler:
+                        curve = self.make_curve()
             logging.info("Process Complete.")
+            if profiler is not None:
+                self.write_profile(profiler)
+            self.finalize(curve)
+
+    def finalize(self, curve: Curve | None):
+        """
+        Write the run metrics and update the monitoring directory.
+
+        :param curve: Output curve.
+        """
+        self.write_metrics()
+        if curve is not None:
             self.update_monitoring_directory(curve)
+
+    def update_monitoring_directory(
+        self, entity: ObjectBase, copy_children: bool = True
+    ):
+        """
+        Export the output to the monitoring directory, if any.
+
+        With the 'delta' export, the curve is snapshot in memory and written to
+        a standalone geoh5 file on a background thread, kept in
+        'export_thread'. Other entities are always copied.
+
+        :param entity: Output curve.
+        :param copy_children: Copy the children of the entity, for the default
+            export.
+        """
+        delta = getattr(self.params, "monitoring_export", "copy") == "delta"
+        if not delta or not isinstance(entity, Curve):
+            super().update_monitoring_directory(entity, copy_children=copy_children)
+            return
+
+        self.add_ui_json(entity)
+        directory = self.params.monitoring_directory
+        if directory is None or not Path(directory).is_dir():
+            return
+
+        with self.metrics.stage("snapshot"):
+            export = DeltaExport.from_curve(entity)
+
+        self.metrics.count("bytes_exported", export.nbytes)
+        self.export_thread = export_in_background(export, Path(directory).resolve())
+
+    @property
+    def profile_fraction(self) -> float:
+        """
+        Fraction of the runs profiled.
+
+        The 'CURVE_APPS_PROFILE' environment variable, either a boolean or a
+        fraction, takes precedence over the diagnostics parameters.
+        """
+        value = os.environ.get("CURVE_APPS_PROFILE", "").strip().lower()
+        if value:
+            if value in ("true", "yes", "on"):
+                return 1.0
+            try:
+                return min(max(float(value), 0.0), 1.0)
+            except ValueError:
+                return 0.0
+
+        diagnostics = getattr(self.params, "diagnostics", None)
+        if diagnostics is None or not diagnostics.profile:
+            return 0.0
+
+        return diagnostics.profile_fraction
+
+    def get_profiler(self) -> Profile | None:
+        """
+        Profiler of the run, if the run is sampled for profiling.
+        """
+        fraction = self.profile_fraction
+        if fraction <= 0.0 or random.random() >= fraction:
+            return None
+
+        return Profile()
+
+    def get_output_path(
+        self, suffix: str, directory: str | Path | None = None
+    ) -> Path | None:
+        """
+        Path of a diagnostic file named after the workspace and the output.
+
+        :param suffix: Suffix and extension of the file name.
+        :param directory: Output directory, defaults to the workspace directory.
+
+        :returns: Path to the file, or None for workspaces held in memory.
+        """
+        h5file = self.workspace.h5file
+        if not isinstance(h5file, str | Path):
+            return None
+
+        name = self.params.export_as or self.params.name
+        directory = Path(directory or Path(h5file).parent)
+
+        return directory / f"{Path(h5file).stem}_{name}_{suffix}"
+
+    def write_profile(self, profiler: Profile) -> Path | None:
+        """
+        Write the pstats dump and a summary of the top functions by cumulative time.
+
+        Files are written to the monitoring directory, if any, or next to the workspace.
+
+        :param profiler: Profiler of the run.
+
+        :returns: Path to the pstats file.
+        """
+        directory = self.params.monitoring_directory
+        if directory is not None and not Path(directory).is_dir():
+            directory = None
+
+        path = self.get_output_path("profile.pstats", directory)
+        if path is None:
+            return None
+
+        diagnostics = getattr(self.params, "diagnostics", None)
+        top = getattr(diagnostics, "profile_top", 30)
+        try:
+            profiler.dump_stats(path)
+            with open(path.with_suffix(".txt"), "w", encoding="utf-8") as file:
+                stats = pstats.Stats(profiler, stream=file)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        except OSError as error:
+            logger.warning("Could not write profile to %s: %s", path, error)
+            return None
+
+        logger.info("Profile written to %s", path)
+
+        return path
+
+    def write_metrics(self) -> Path | None:
+        """
+        Log the run metrics and write them to a json file next to the workspace.
+
+        The file is also attached to the output group, if any.
+
+        :returns: Path to the metrics file.
+        """
+        logger.info("Run metrics:\n%s", self.metrics.summary())
+
+        path = self.get_output_path("metrics.json")
+        if path is None:
+            return None
+
+        try:
+            self.metrics.write(
+                path,
+                driver=type(self).__name__,
+                geoh5=str(self.workspace.h5file),
+                export_as=self.params.export_as or self.params.name,
+            )
+        except OSError as error:
+            logger.warning("Could not write metrics to %s: %s", path, error)
+            return None
+
+        if self.out_group is not None:
+            self.out_group.add_file(path)
+
+        return path
+
+
+def compute_payload(driver: BaseCurveDriver) -> CurvePayload | None:
+    """
+    Get the payload of a driver, timed under its 'compute' stage.
+
+    :param driver: Driver to compute.
+    """
+    with driver.metrics.stage("compute"):
+        return driver.get_payload()
+
+
+def run_concurrently(
+    drivers: list[BaseCurveDriver], workers: int | None = None
+) -> list[Curve | Exception | None]:
+    """
+    Compute several drivers in parallel threads, with a single writer.
+
+    The drivers must share the same workspace. The calling thread opens the
+    workspace, loads the sources and writes each curve as its computation
+    completes, such that only one thread ever accesses the geoh5 file. The
+    computation of each driver is timed under its 'compute' stage, excluding
+    the wait for a thread. The memory peaks tracked by the drivers include the
+    allocations of the other threads.
+
+    :param drivers: Drivers to run.
+    :param workers: Number of compute threads, defaults to the number of drivers.
+
+    :returns: Output curve, or error, of each driver.
+    """
+    workspaces = {driver.params.geoh5 for driver in drivers}
+    if len(workspaces) > 1:
+        raise ValueError("Concurrent drivers must share the same workspace.")
+
+    results: list[Curve | Exception | None] = [None] * len(drivers)
+    if not drivers:
+        return results
+
+    with fetch_active_workspace(drivers[0].params.geoh5, mode="r+"):
+        for driver in drivers:
+            if driver.params.dry_run:
+                driver.dry_run()
+            else:
+                driver.load_source()
+
+        with ThreadPoolExecutor(max_workers=workers or len(drivers)) as executor:
+            futures = {
+                executor.submit(compute_payload, driver): index
+                for index, driver in enumerate(drivers)
+                if not driver.params.dry_run
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                driver = drivers[index]
+                try:
+                    curve = driver.write_payload(future.result())
+                    driver.finalize(curve)
+                    results[index] = curve
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    logger.exception("Driver %s failed.", type(driver).__name__)
+                    results[index] = error
+
+    return results
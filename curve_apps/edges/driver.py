@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import logging
 import sys
+from functools import partial
 
 import numpy as np
 from geoapps_utils.utils.locations import (
@@ -20,20 +21,29 @@ from geoapps_utils.utils.locations import (
     map_indices_to_coordinates,
 )
 from geoh5py.data import FloatData
-from geoh5py.objects import Curve, Grid2D
-from geoh5py.ui_json import InputFile, utils
-from scipy.spatial import cKDTree
-from skimage.feature import canny  # pylint: disable=no-name-in-module
-from skimage.transform import (  # pylint: disable=no-name-in-module
-    probabilistic_hough_line,
-)
+from geoh5py.objects import Curve, Grid2D, Points, Surface
+from geoh5py.ui_json import InputFile
 
-from curve_apps.driver import BaseCurveDriver
+from curve_apps.diagnostics import estimate_stage
+from curve_apps.driver import BaseCurveDriver, CurveOutput, CurvePayload
 from curve_apps.edges.options import EdgeDetectionParameters, EdgeParameters
+from curve_apps.options import ExecutionParameters
+from curve_apps.parallel import parallel_map
+from curve_apps.segments import fuse_collinear_segments
+from curve_apps.utils import (
+    estimate_grid,
+    interp_to_grid,
+    segment_azimuths,
+    set_vertices_height,
+    weld_vertices,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Scipy and Scikit-Image are only imported by the stages that need them.
+# pylint: disable=import-outside-toplevel, no-name-in-module
+
 
 class EdgesDriver(BaseCurveDriver):
     """
@@ -47,87 +57,227 @@ class EdgesDriver(BaseCurveDriver):
     def __init__(self, parameters: EdgeParameters | InputFile):
         super().__init__(parameters)
 
-    def make_curve(self):
+    def estimate(self) -> dict:
         """
-        Make curve object from edges detected in source data.
+        Estimate the grid size and number of tiles.
+        """
+        entity = self.params.source.objects
+        detection = self.params.detection
+        shape, stages = estimate_grid(entity, detection.resolution)
+        nodes = shape[0] * shape[1]
+
+        stages["get_canny_edges"] = estimate_stage("get_canny_edges", nodes)
+        stages["get_line_indices"] = estimate_stage("get_line_indices", nodes)
+
+        estimate = {"grid_shape": shape, "grid_nodes": nodes}
+        if detection.engine == "hough":
+            estimate["tiles"] = len(EdgesDriver.get_tiles(shape, detection.window_size))
+
+        return {
+            **estimate,
+            "source_values": self.params.source.data.n_values,
+            "stages": stages,
+        }
+
+    def compute(self) -> CurvePayload | None:
+        """
+        Compute the edges detected in source data.
 
         The application relies on the Canny and Hough transforms from the
         Scikit-Image library.
-
         """
-        with utils.fetch_active_workspace(self.workspace, mode="r+") as workspace:
-            logging.info("Generated edges ...")
-            canny_grid = EdgesDriver.get_canny_edges(
-                self.params.source.objects,
+        logging.info("Generated edges ...")
+        entity = self.params.source.objects
+        self.metrics.count("vertices_in", len(self.params.source.data.values))
+
+        with self.metrics.stage("interp_to_grid"):
+            grid, grid_data = EdgesDriver.get_gridded_data(
+                entity,
                 self.params.source.data,
                 self.params.detection,
+                dtype=self.params.dtype,
             )
-            vertices, cells = EdgesDriver.get_edges(
-                self.params.source.objects,
-                canny_grid,
+        self.metrics.count("grid_nodes", grid_data.size)
+
+        with self.metrics.stage("get_canny_edges"):
+            canny_grid = EdgesDriver.get_canny_edges(
+                grid_data,
                 self.params.detection,
             )
 
-            if vertices is None or cells is None:
-                return None
-
-            self.params.source.objects.add_data(
-                {"canny filter": {"values": canny_grid.flatten(order="F")}}
+        with self.metrics.stage("get_line_indices"):
+            indices = EdgesDriver.find_lines(
+                canny_grid, self.params.detection, self.params.execution
             )
-            curve = Curve.create(
-                workspace=workspace,
-                name=self.params.export_as,
-                vertices=vertices,
-                cells=cells,
-                parent=self.out_group,
+
+        if self.params.detection.engine == "hough":
+            self.metrics.count(
+                "tiles",
+                len(
+                    EdgesDriver.get_tiles(
+                        canny_grid.shape, self.params.detection.window_size
+                    )
+                ),
             )
+        self.metrics.count("edges", sum(len(ind) // 2 for ind in indices))
 
-            # Compute positive angle from North
-            # TODO: Move to geoapps-utils
-            delta = np.c_[
-                vertices[cells[:, 1], 0] - vertices[cells[:, 0], 0],
-                vertices[cells[:, 1], 1] - vertices[cells[:, 0], 1],
-            ]
-            delta[delta[:, 0] < 0, :] *= -1
-            amp = np.linalg.norm(delta, axis=1)
-            orientation = np.arccos(delta[:, 1] / amp)
-
-            # TODO: Assign values to vertices until better handling of cell data by GA
-            vert_azimuth = np.zeros(curve.n_vertices) * np.nan
-            vert_azimuth[cells.flatten()] = np.repeat(orientation, 2)
-            curve.add_data(
-                {
-                    "azimuth": {"values": np.degrees(vert_azimuth)},
-                }
+        with self.metrics.stage("get_edges"):
+            vertices, cells = EdgesDriver.get_segments(
+                grid, indices, self.params.detection
             )
 
-            vert_lengths = np.zeros(curve.n_vertices) * np.nan
-            vert_lengths[cells.flatten()] = np.repeat(amp, 2)
-            curve.add_data(
-                {
-                    "lengths": {"values": vert_lengths},
-                }
+        if vertices is None or cells is None:
+            return None
+
+        if not isinstance(entity, Grid2D):
+            vertices = set_vertices_height(vertices[:, :2], entity)
+
+        if self.params.detection.fuse_angle is not None:
+            with self.metrics.stage("fuse_collinear_segments"):
+                vertices, cells = fuse_collinear_segments(
+                    vertices, cells, self.params.detection.fuse_angle
+                )
+
+        values = {}
+        if isinstance(entity, Grid2D) and self.params.auxiliary_output == "boolean":
+            values["canny filter"] = canny_grid.astype(bool, copy=False)
+        elif isinstance(entity, Grid2D) and self.params.auxiliary_output == "full":
+            values["canny filter"] = np.where(
+                np.isnan(grid_data), np.nan, canny_grid.astype(grid_data.dtype)
             )
 
+        # Vertices are held relative to the lower corner of the source
+        origin = np.r_[entity.locations[:, :2].min(axis=0), 0.0]
+
+        return CurvePayload(
+            vertices=(vertices - origin).astype(self.params.dtype, copy=False),
+            cells=cells,
+            values=values,
+            origin=origin,
+        )
+
+    @property
+    def payload_options(self) -> list:
+        """
+        Parameters, other than the sources, read to compute the payload.
+        """
+        return super().payload_options + [self.params.auxiliary_output]
+
+    def write_curve(self, payload: CurvePayload) -> Curve:
+        """
+        Write the edges and the auxiliary products.
+
+        :param payload: Computed edges, with the Canny filter of Grid2D sources
+            in the format of the auxiliary output policy.
+        """
+        output = CurveOutput(
+            self.workspace,
+            name=self.params.export_as,
+            vertices=payload.locations,
+            cells=payload.cells,
+            parent=self.out_group,
+        )
+        self.add_auxiliary_output(output, payload)
+        curve = output.write()
+        self.metrics.count("curves_out", len(payload.cells))
+
         return curve
 
+    def add_auxiliary_output(self, output: CurveOutput, payload: CurvePayload):
+        """
+        Queue the auxiliary products requested by the output policy.
+
+        The Canny edges are stored on Grid2D sources only, as computed in the
+        payload: either as a boolean mask or as floats with no-data values
+        outside the data mask. The azimuth and lengths of the segments are
+        stored on the curve cells.
+
+        :param output: Output curve assembly.
+        :param payload: Computed edges.
+        """
+        policy = self.params.auxiliary_output
+        entity = self.params.source.objects
+        canny_grid = payload.values.get("canny filter")
+
+        if policy == "none":
+            return
+
+        if isinstance(entity, Grid2D) and isinstance(canny_grid, np.ndarray):
+            output.add_data(
+                {"canny filter": {"values": canny_grid.flatten(order="F")}}, entity
+            )
+
+        # Compute positive angle from North
+        orientation, amp = segment_azimuths(payload.vertices, payload.cells)
+        self.metrics.count("bytes_written", orientation.nbytes + amp.nbytes)
+        output.add_data(
+            {
+                "azimuth": {"values": np.degrees(orientation), "association": "CELL"},
+                "lengths": {"values": amp, "association": "CELL"},
+            }
+        )
+
+    @staticmethod
+    def get_gridded_data(
+        entity: Grid2D | Points | Curve | Surface,
+        data: FloatData,
+        detection: EdgeDetectionParameters,
+        dtype=np.float64,
+    ) -> tuple[Grid2D | list[np.ndarray], np.ndarray]:
+        """
+        Get a 2D array of values from the source data.
+
+        Values of scattered sources are interpolated in memory on a regular grid,
+        relative to the lower corner of the source.
+
+        :param entity: Source object.
+        :param data: FloatData object.
+        :param detection: Detection parameters.
+        :param dtype: Data type of the values.
+
+        :returns: The Grid2D or list of x and y grid axes, and the 2D array of
+            values indexed along the (x, y) axes.
+        """
+        if data.values is None:
+            raise ValueError("Data must be defined.")
+
+        if isinstance(entity, Grid2D):
+            if entity.shape is None:
+                raise ValueError("Grid must be defined.")
+
+            return entity, data.values.reshape(entity.shape, order="F").astype(
+                dtype, copy=False
+            )
+
+        if entity.locations is None:
+            raise ValueError("Entity must have locations.")
+
+        origin = entity.locations[:, :2].min(axis=0)
+        axes, values = interp_to_grid(
+            entity,
+            data.values,
+            detection.resolution,
+            detection.max_distance,
+            origin=origin,
+            dtype=dtype,
+        )
+        axes = [axis + offset for axis, offset in zip(axes, origin, strict=True)]
+
+        return axes, values.T
+
     @staticmethod
     def get_canny_edges(
-        grid: Grid2D, data: FloatData, detection: EdgeDetectionParameters
+        grid_data: np.ndarray, detection: EdgeDetectionParameters
     ) -> np.ndarray:
         """
-        Get edges from a grid.
+        Get edges from gridded values.
 
-        :param grid: Grid2D object.
-        :param data: FloatData object.
+        :param grid_data: 2D array of values.
         :param detection: Detection parameters.
 
         :returns: Edges from Canny transform.
         """
-        if grid.shape is None or data.values is None:
-            raise ValueError("Grid and data must be defined.")
-
-        grid_data = data.values.reshape(grid.shape, order="F")
+        from skimage.feature import canny
 
         if np.all(np.isnan(grid_data)):
             raise ValueError("No data to process.")
@@ -140,101 +290,375 @@ class EdgesDriver(BaseCurveDriver):
             mask=~np.isnan(grid_data),
             mode="reflect",
         )
-        grid.add_data({"canny filter": {"values": edges.flatten(order="F")}})
 
         return edges
 
     @staticmethod
     def get_edges(
-        grid: Grid2D,
+        grid: Grid2D | list[np.ndarray],
         edges: np.ndarray,
         detection: EdgeDetectionParameters,
     ) -> tuple[np.ndarray, np.ndarray] | tuple[None, None]:
         """
         Find edges in gridded data.
 
-        :params grid: A Grid2D object.
+        :params grid: A Grid2D object or list of x and y grid axes.
         :params edges: Edges representation of the grid from Canny transform.
         :params detection: Detection parameters.
 
         :returns : n x 3 array. Vertices of edges.
         :returns : n x 2 float array. Cells of edges.
         """
-        # Find lines
-        indices = EdgesDriver.get_line_indices(
+        indices = EdgesDriver.find_lines(edges, detection)
+
+        return EdgesDriver.get_segments(grid, indices, detection)
+
+    @staticmethod
+    def find_lines(
+        edges: np.ndarray,
+        detection: EdgeDetectionParameters,
+        execution: ExecutionParameters | None = None,
+    ) -> list:
+        """
+        Find lines on a canny image with the requested engine.
+
+        :params edges: Edges representation of the grid from Canny transform.
+        :params detection: Detection parameters.
+        :params execution: Parallel execution options of the Hough tiles.
+
+        :returns: List of indices.
+        """
+        if detection.engine == "skeleton":
+            return EdgesDriver.get_skeleton_line_indices(
+                edges,
+                detection.line_length,
+                detection.tolerance,
+            )
+
+        return EdgesDriver.get_line_indices(
             edges,
             detection.line_length,
             detection.line_gap,
             detection.threshold,
             detection.window_size,
+            execution=execution,
         )
 
+    @staticmethod
+    def get_segments(
+        grid: Grid2D | list[np.ndarray],
+        indices: list,
+        detection: EdgeDetectionParameters,
+    ) -> tuple[np.ndarray, np.ndarray] | tuple[None, None]:
+        """
+        Convert line indices to vertices and cells, merging close vertices.
+
+        :params grid: A Grid2D object or list of x and y grid axes.
+        :params indices: List of line indices.
+        :params detection: Detection parameters.
+
+        :returns : n x 3 array. Vertices of edges.
+        :returns : n x 2 float array. Cells of edges.
+        """
+        from scipy.spatial import cKDTree
+
         if len(indices) == 0:
             return None, None
 
         pixel_coordinates = np.vstack(indices)
+        u_ind, r_ind = np.unique(pixel_coordinates, axis=0, return_inverse=True)
+        cells = r_ind.reshape((-1, 2))
 
         if detection.merge_length is not None:
-            vertices = map_indices_to_coordinates(grid, pixel_coordinates)
-            tree = cKDTree(vertices)
+            tree = cKDTree(EdgesDriver.map_indices(grid, u_ind))
             merge = tree.query_pairs(detection.merge_length, output_type="ndarray")
-            pixel_coordinates[merge[:, 0], :] = pixel_coordinates[merge[:, 1], :]
+            cells = weld_vertices(u_ind.shape[0], merge)[cells]
 
-        u_ind, r_ind = np.unique(pixel_coordinates, axis=0, return_inverse=True)
-        vertices = map_indices_to_coordinates(grid, u_ind)
+            # Remove collapsed and duplicated segments left by the welding
+            cells = np.sort(cells[cells[:, 0] != cells[:, 1]], axis=1)
+            cells = np.unique(cells, axis=0)
+
+            if len(cells) == 0:
+                return None, None
+
+            used, r_ind = np.unique(cells, return_inverse=True)
+            u_ind, cells = u_ind[used], r_ind.reshape((-1, 2))
+
+        vertices = EdgesDriver.map_indices(grid, u_ind)
 
-        cells = r_ind.reshape((-1, 2))
         return vertices, cells
 
     @staticmethod
-    def get_line_indices(
+    def map_indices(grid: Grid2D | list[np.ndarray], indices: np.ndarray) -> np.ndarray:
+        """
+        Map pixel indices to world coordinates.
+
+        :param grid: A Grid2D object or list of x and y grid axes.
+        :param indices: Indices (i, j) of grid cells.
+
+        :returns: n x 3 array of coordinates, with zero elevation for grid axes.
+        """
+        if isinstance(grid, Grid2D):
+            return map_indices_to_coordinates(grid, indices)
+
+        return np.c_[
+            grid[0][indices[:, 0]],
+            grid[1][indices[:, 1]],
+            np.zeros(indices.shape[0]),
+        ]
+
+    @staticmethod
+    def get_line_indices(  # pylint: disable=too-many-arguments
         canny_image: np.ndarray,
         line_length: int = 1,
         line_gap: int = 1,
         threshold: int = 1,
         window_size: int | None = None,
+        *,
+        execution: ExecutionParameters | None = None,
     ) -> list:
         """
         Get indices forming lines on a canny image.
 
-        The process is done over tiles of square size. The tiles overlap by 25%.
+        The process is done over tiles of square size. The tiles overlap by 25%
+        and are processed with the backend of the execution options.
 
         :param canny_image: Edges.
         :param line_length: Minimum accepted pixel length of detected lines. (Hough)
         :param line_gap: Maximum gap between pixels to still form a line. (Hough)
         :param threshold: Value threshold. (Hough)
         :param window_size: Size of the window to search for lines.
+        :param execution: Parallel execution options.
 
         :returns: List of indices.
         """
-        # Cycle through tiles of square size
-        width = np.min(canny_image.shape)
+        tiles = EdgesDriver.get_tiles(canny_image.shape, window_size)
+        lines = parallel_map(
+            partial(
+                EdgesDriver.get_tile_line_indices,
+                line_length=line_length,
+                line_gap=line_gap,
+                threshold=threshold,
+            ),
+            tiles,
+            execution,
+            arrays={"canny_image": canny_image},
+        )
+
+        return [indices for indices in lines if indices is not None]
+
+    @staticmethod
+    def get_tile_line_indices(
+        tile: tuple,
+        canny_image: np.ndarray,
+        line_length: int = 1,
+        line_gap: int = 1,
+        threshold: int = 1,
+    ) -> np.ndarray | None:
+        """
+        Get indices forming lines on a tile of a canny image.
+
+        :param tile: Pair of (start, end) limits of the tile along the two axes.
+        :param canny_image: Edges.
+        :param line_length: Minimum accepted pixel length of detected lines.
+        :param line_gap: Maximum gap between pixels to still form a line.
+        :param threshold: Value threshold.
+
+        :returns: Indices of the line ends, or None if no line is found.
+        """
+        from skimage.transform import probabilistic_hough_line
+
+        x_lim, y_lim = tile
+        lines = probabilistic_hough_line(
+            canny_image[x_lim[0] : x_lim[1], y_lim[0] : y_lim[1]],
+            line_length=line_length,
+            threshold=threshold,
+            line_gap=line_gap,
+            rng=0,
+        )
+
+        if not np.any(lines):
+            return None
+
+        # Add the limits of the tile to the indices
+        return np.vstack(lines)[:, ::-1] + np.c_[x_lim[0], y_lim[0]]
+
+    @staticmethod
+    def get_tiles(shape: tuple[int, ...], window_size: int | None = None) -> list:
+        """
+        Get the limits of square tiles covering an image.
+
+        The tiles overlap by 25%.
+
+        :param shape: Shape of the image.
+        :param window_size: Size of the tiles.
+
+        :returns: List of pairs of (start, end) limits along the two axes.
+        """
+        width = np.min(shape)
         if window_size is not None:
             width = np.min([window_size, width])
 
-        x_limits = get_overlapping_limits(canny_image.shape[0], width)
-        y_limits = get_overlapping_limits(canny_image.shape[1], width)
+        x_limits = get_overlapping_limits(shape[0], width)
+        y_limits = get_overlapping_limits(shape[1], width)
+
+        return [(x_lim, y_lim) for x_lim in x_limits for y_lim in y_limits]
+
+    @staticmethod
+    def get_skeleton_line_indices(
+        canny_image: np.ndarray,
+        line_length: int = 1,
+        tolerance: float = 1.0,
+    ) -> list:
+        """
+        Get indices forming lines by tracing the skeleton of a canny image.
+
+        The edges are thinned to single pixel chains, split at junctions, then
+        simplified into straight runs with the Douglas-Peucker algorithm.
+
+        :param canny_image: Edges.
+        :param line_length: Minimum accepted pixel length of detected lines.
+        :param tolerance: Maximum pixel deviation of a chain from a straight run.
+
+        :returns: List of indices.
+        """
+        from skimage.measure import approximate_polygon
+        from skimage.morphology import skeletonize
+
+        chains = EdgesDriver.trace_pixel_chains(skeletonize(canny_image))
 
-        # TODO: Loop in parallel
         indices = []
-        for x_lim in x_limits:
-            for y_lim in y_limits:
-                lines = probabilistic_hough_line(
-                    canny_image[x_lim[0] : x_lim[1], y_lim[0] : y_lim[1]],
-                    line_length=line_length,
-                    threshold=threshold,
-                    line_gap=line_gap,
-                    rng=0,
-                )
+        for chain in chains:
+            corners = approximate_polygon(chain, tolerance=tolerance)
+            lines = np.c_[corners[:-1], corners[1:]].reshape((-1, 2, 2))
+            lengths = np.linalg.norm(lines[:, 1] - lines[:, 0], axis=1)
+            lines = lines[lengths >= line_length]
 
-                if np.any(lines):
-                    # Add the limits of the tile to the indices
-                    lines = np.vstack(lines)[:, ::-1] + np.c_[x_lim[0], y_lim[0]]
-                    indices.append(lines)
+            if len(lines) > 0:
+                indices.append(lines.reshape((-1, 2)).astype(int))
 
         return indices
 
+    @staticmethod
+    def link_skeleton_pixels(skeleton: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Link the pixels of a skeleton image to their 8-connected neighbours.
+
+        Diagonal links already covered by two orthogonal links are ignored.
+
+        :param skeleton: Boolean image of single pixel wide lines.
+
+        :returns: n x 2 array of linked pixels and m x 2 array of their (row,
+            column) indices.
+        """
+        rows, cols = np.nonzero(skeleton)
+        padded = np.pad(skeleton, 1)
+        index = np.pad(np.full(skeleton.shape, -1), 1, constant_values=-1)
+        index[rows + 1, cols + 1] = np.arange(rows.shape[0])
+
+        links: list[np.ndarray] = []
+        for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            neighbours = index[rows + 1 + d_row, cols + 1 + d_col]
+            keep = neighbours >= 0
+
+            if d_row and d_col:
+                keep &= ~padded[rows + 1 + d_row, cols + 1]
+                keep &= ~padded[rows + 1, cols + 1 + d_col]
+
+            links.append(np.c_[np.where(keep)[0], neighbours[keep]])
+
+        return np.vstack(links), np.c_[rows, cols]
+
+    @staticmethod
+    def split_junction_pixels(
+        links: np.ndarray, coordinates: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Give each link its own copy of the junction pixels.
+
+        :param links: n x 2 array of linked pixels.
+        :param coordinates: m x 2 array of (row, column) indices of the pixels.
+
+        :returns: Links and coordinates, with junction pixels (more than two
+            neighbours) duplicated at the end.
+        """
+        flat = links.flatten()
+        junction = np.bincount(flat, minlength=coordinates.shape[0])[flat] > 2
+        duplicates = coordinates[flat[junction]]
+        flat[junction] = coordinates.shape[0] + np.arange(np.sum(junction))
+
+        return flat.reshape((-1, 2)), np.vstack([coordinates, duplicates])
+
+    @staticmethod
+    def order_pixel_chains(links: np.ndarray, n_nodes: int) -> list[np.ndarray]:
+        """
+        Order the nodes of linked chains, from an end node or around loops.
+
+        :param links: n x 2 array of linked nodes, at most two per node.
+        :param n_nodes: Number of nodes.
+
+        :returns: List of ordered node indices, closed loops ending on their
+            first node.
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components, depth_first_order
+
+        degree = np.bincount(links.flatten(), minlength=n_nodes)
+        _, labels = connected_components(
+            coo_matrix(
+                (np.ones(links.shape[0], dtype=bool), (links[:, 0], links[:, 1])),
+                shape=(n_nodes, n_nodes),
+            ),
+            directed=False,
+        )
+
+        # Start each chain from an end point, or anywhere along closed loops
+        order = np.lexsort((np.arange(n_nodes), degree != 1, labels))
+        first = np.r_[True, labels[order][1:] != labels[order][:-1]]
+        starts = order[first & (degree[order] > 0)]
+
+        if len(starts) == 0:
+            return []
+
+        # Walk all chains at once from a virtual root linked to the starts
+        links = np.vstack([links, np.c_[np.full_like(starts, n_nodes), starts]])
+        graph = coo_matrix(
+            (np.ones(links.shape[0], dtype=bool), (links[:, 0], links[:, 1])),
+            shape=(n_nodes + 1, n_nodes + 1),
+        ).tocsr()
+        walk, predecessors = depth_first_order(
+            graph, n_nodes, directed=False, return_predecessors=True
+        )
+        walk = walk[1:]
+        breaks = np.where(predecessors[walk] == n_nodes)[0][1:]
+
+        return [
+            np.r_[chain, chain[0]] if degree[chain[0]] == 2 else chain
+            for chain in np.split(walk, breaks)
+        ]
+
+    @staticmethod
+    def trace_pixel_chains(skeleton: np.ndarray) -> list[np.ndarray]:
+        """
+        Trace ordered chains of connected pixels on a skeleton image.
+
+        Pixels are linked to their 8-connected neighbours, while diagonal links
+        already covered by two orthogonal links are ignored. Junction pixels
+        (more than two neighbours) terminate the chains they connect.
+
+        :param skeleton: Boolean image of single pixel wide lines.
+
+        :returns: List of n x 2 arrays of (row, column) indices.
+        """
+        links, coordinates = EdgesDriver.split_junction_pixels(
+            *EdgesDriver.link_skeleton_pixels(skeleton)
+        )
+        chains = EdgesDriver.order_pixel_chains(links, coordinates.shape[0])
+
+        return [coordinates[chain] for chain in chains]
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     file = sys.argv[1]
     driver = EdgesDriver.start(file)
@@ -11,27 +11,27 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Literal
 
-from geoapps_utils.base import Options
 from geoh5py.data import FloatData
-from geoh5py.objects import Grid2D
+from geoh5py.objects import Curve, Grid2D, Points, Surface
 from pydantic import BaseModel, ConfigDict
 
 from curve_apps import assets_path
+from curve_apps.options import BaseCurveParameters
 
 
 class EdgeSourceParameters(BaseModel):
     """
     Source parameters expected by the ui.json file format.
 
-    :param objects: A Grid2D source object.
+    :param objects: A Grid2D, Points, Curve or Surface source object.
     :param data: Data values to find edges on.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    objects: Grid2D
+    objects: Grid2D | Points | Curve | Surface
     data: FloatData
 
 
@@ -39,29 +39,45 @@ class EdgeDetectionParameters(BaseModel):
     """
     Edge detection parameters.
 
+    :param engine: Line extraction method, either the probabilistic Hough
+        transform or the tracing of the skeletonized edges.
     :param line_length: Minimum accepted pixel length of detected lines. (Hough)
     :param line_gap: Maximum gap between pixels to still form a line. (Hough)
     :param sigma: Standard deviation of the Gaussian filter. (Canny)
     :param threshold: Value threshold. (Hough)
-    :param window_size: Size of the window to search for lines.
+    :param tolerance: Maximum pixel deviation from straight lines. (Skeleton)
+    :param window_size: Size of the window to search for lines. (Hough)
     :param merge_length: Minimum length between nodes that should be merged.
+    :param fuse_angle: Maximum angle (degree) between touching segments and the
+        line they are fused into.
+    :param max_distance: Maximum distance for interpolation of scattered sources.
+    :param resolution: Resolution of the grid for scattered sources.
     """
 
+    engine: Literal["hough", "skeleton"] = "hough"
     line_length: int = 1
     line_gap: int = 1
     sigma: float = 10
     threshold: int = 1
+    tolerance: float = 1.0
     window_size: int | None = None
     merge_length: float | None = None
+    fuse_angle: float | None = None
+    max_distance: float = 500.0
+    resolution: float = 50.0
 
 
-class EdgeParameters(Options):
+class EdgeParameters(BaseCurveParameters):
     """
     Edge detection parameters for use with `edges.driver`.
 
     :param detection: Detection parameters expected for the edge detection.
     :param source: Parameters for the source object and data.
-    :param output: Output parameters.
+    :param export_as: Name of the output curve.
+    :param auxiliary_output: Auxiliary products to store along with the curve:
+        'none', 'boolean' for a boolean Canny mask on Grid2D sources with the
+        azimuth and lengths of segments, or 'full' to store the Canny mask as
+        floats with no-data values outside the data mask.
     """
 
     name: ClassVar[str] = "edges"
@@ -69,7 +85,7 @@ class EdgeParameters(Options):
     title: ClassVar[str] = "Edge Detection"
     run_command: ClassVar[str] = "curve_apps.edges.driver"
 
-    conda_environment: str = "curve_apps"
     source: EdgeSourceParameters
     detection: EdgeDetectionParameters = EdgeDetectionParameters()
     export_as: str | None = "edges"
+    auxiliary_output: Literal["none", "boolean", "full"] = "boolean"
@@ -0,0 +1,189 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import logging
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from uuid import UUID, uuid4
+
+import numpy as np
+from geoh5py import Workspace
+from geoh5py.data import Data, FilenameData, ReferencedData
+from geoh5py.groups import Group, RootGroup
+from geoh5py.objects import Curve
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeltaExport:
+    """
+    In-memory snapshot of a new curve, its data and files.
+
+    The snapshot holds plain arrays only, such that it can be written to a
+    standalone geoh5 file from another thread while the project workspace is
+    in use. The curve and its parent group keep their unique identifiers, and
+    the source entities are referenced by the ui.json file rather than copied.
+
+    :param uid: Unique identifier of the curve.
+    :param name: Name of the curve.
+    :param vertices: n x 3 array of vertices.
+    :param cells: m x 2 array of cells.
+    :param data: Data of the curve, in the format of 'ObjectBase.add_data'.
+    :param files: Names and content of the files attached to the curve.
+    :param group: Class, unique identifier and name of the parent group.
+    """
+
+    uid: UUID
+    name: str
+    vertices: np.ndarray
+    cells: np.ndarray
+    data: dict[str, dict] = field(default_factory=dict)
+    files: dict[str, bytes] = field(default_factory=dict)
+    group: tuple[type[Group], UUID, str] | None = None
+
+    @classmethod
+    def from_curve(cls, curve: Curve) -> DeltaExport:
+        """
+        Snapshot a curve and its children.
+
+        :param curve: Curve to export.
+        """
+        data: dict[str, dict] = {}
+        files: dict[str, bytes] = {}
+        for child in curve.children:
+            if isinstance(child, FilenameData):
+                if child.file_bytes is not None:
+                    files[child.name] = child.file_bytes
+            elif isinstance(child, Data) and child.values is not None:
+                data[child.name] = DeltaExport.get_data_attributes(child)
+
+        group = None
+        if isinstance(curve.parent, Group) and not isinstance(curve.parent, RootGroup):
+            group = (type(curve.parent), curve.parent.uid, curve.parent.name)
+
+        return cls(
+            uid=curve.uid,
+            name=curve.name,
+            vertices=np.asarray(curve.vertices),
+            cells=np.asarray(curve.cells),
+            data=data,
+            files=files,
+            group=group,
+        )
+
+    @staticmethod
+    def get_data_attributes(data: Data) -> dict:
+        """
+        Attributes needed to re-create data, in the format of 'add_data'.
+
+        :param data: Data to snapshot.
+        """
+        attributes = {
+            "values": np.asarray(data.values),
+            "association": data.association.name,
+        }
+        if isinstance(data, ReferencedData) and data.value_map is not None:
+            attributes["type"] = "referenced"
+            attributes["value_map"] = {
+                key: value for key, value in data.value_map().items() if key != 0
+            }
+
+        return attributes
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the arrays and files in bytes.
+        """
+        return (
+            self.vertices.nbytes
+            + self.cells.nbytes
+            + sum(item["values"].nbytes for item in self.data.values())
+            + sum(len(content) for content in self.files.values())
+        )
+
+    def write(self, directory: str | Path) -> Path:
+        """
+        Write the snapshot to a new geoh5 file in a monitoring directory.
+
+        The file is written in the '.working' sub-directory, then moved, such
+        that it is only picked up once complete.
+
+        :param directory: Monitoring directory.
+
+        :returns: Path to the new file.
+        """
+        directory = Path(directory)
+        working = directory / ".working"
+        working.mkdir(exist_ok=True)
+        name = f"temp{time():.3f}_{uuid4().hex[:8]}.geoh5"
+
+        with tempfile.TemporaryDirectory() as folder:
+            with Workspace.create(working / name) as workspace:
+                parent = None
+                if self.group is not None:
+                    group_class, uid, group_name = self.group
+                    parent = group_class.create(workspace, uid=uid, name=group_name)
+
+                curve = Curve.create(
+                    workspace,
+                    uid=self.uid,
+                    name=self.name,
+                    vertices=self.vertices,
+                    cells=self.cells,
+                    parent=parent,
+                )
+                if self.data:
+                    curve.add_data(self.data)
+
+                for file_name, content in self.files.items():
+                    path = Path(folder) / file_name
+                    path.write_bytes(content)
+                    curve.add_file(str(path))
+
+        shutil.move(working / name, directory / name)
+
+        return directory / name
+
+
+def export_in_background(
+    export: DeltaExport, directory: str | Path
+) -> threading.Thread:
+    """
+    Write a delta export on a background thread.
+
+    The thread is not a daemon, such that the interpreter waits for the file
+    to be complete before exiting.
+
+    :param export: Snapshot to write.
+    :param directory: Monitoring directory.
+
+    :returns: The running thread.
+    """
+
+    def target():
+        try:
+            path = export.write(directory)
+            logger.info("Exported %s to %s", export.name, path)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Export of %s to %s failed.", export.name, directory)
+
+    thread = threading.Thread(target=target, name=f"export-{export.uid}")
+    thread.start()
+
+    return thread
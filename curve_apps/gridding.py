@@ -0,0 +1,242 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+
+# Heavy dependencies are imported by the functions using them, to keep the
+# start-up time of the applications low.
+# pylint: disable=import-outside-toplevel
+
+#: Gridding functions, called as func(locations, values, axes, **options), with
+#: the 'resolution' and 'max_distance' options.
+GRIDDING_METHODS: dict[str, Callable] = {}
+
+
+def register(name: str) -> Callable[[Callable], Callable]:
+    """
+    Register a gridding function under a method name.
+
+    :param name: Name of the method.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        GRIDDING_METHODS[name] = func
+        return func
+
+    return decorator
+
+
+def grid_nodes(axes: list[np.ndarray]) -> np.ndarray:
+    """
+    Horizontal coordinates of the grid nodes, in row-major order along y.
+
+    :param axes: Axes of the grid along x and y.
+
+    :returns: n x 2 array of coordinates.
+    """
+    x, y = np.meshgrid(axes[0], axes[1])
+
+    return np.c_[x.flatten(), y.flatten()]
+
+
+@register("idw")
+def idw_gridding(
+    locations: np.ndarray,
+    values: np.ndarray,
+    axes: list[np.ndarray],
+    *,
+    resolution: float,
+    max_distance: float = np.inf,
+    **_,
+) -> np.ndarray:
+    """
+    Inverse distance weighted average of the eight nearest points.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+    :param resolution: Grid resolution, used to smooth the weights.
+    :param max_distance: Distance beyond which points do not contribute.
+
+    :returns: Gridded values.
+    """
+    from geoapps_utils.utils.numerical import weighted_average
+
+    nodes = grid_nodes(axes)
+    gridded = weighted_average(
+        locations,
+        np.c_[nodes, np.zeros(nodes.shape[0])],
+        [values],
+        threshold=resolution / 2.0,
+        n=8,
+        max_distance=max_distance,
+    )
+
+    return gridded[0]
+
+
+@register("linear")
+def linear_gridding(
+    locations: np.ndarray, values: np.ndarray, axes: list[np.ndarray], **_
+) -> np.ndarray:
+    """
+    Linear interpolation on a Delaunay triangulation of the points.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+
+    :returns: Gridded values, NaN outside the convex hull.
+    """
+    from scipy.interpolate import LinearNDInterpolator
+
+    return LinearNDInterpolator(locations[:, :2], values)(grid_nodes(axes))
+
+
+@register("cubic")
+def cubic_gridding(
+    locations: np.ndarray, values: np.ndarray, axes: list[np.ndarray], **_
+) -> np.ndarray:
+    """
+    Piecewise cubic (Clough-Tocher) interpolation on a Delaunay triangulation.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+
+    :returns: Gridded values, NaN outside the convex hull.
+    """
+    from scipy.interpolate import CloughTocher2DInterpolator
+
+    return CloughTocher2DInterpolator(locations[:, :2], values)(grid_nodes(axes))
+
+
+@register("nearest")
+def nearest_gridding(
+    locations: np.ndarray, values: np.ndarray, axes: list[np.ndarray], **_
+) -> np.ndarray:
+    """
+    Value of the nearest point.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+
+    :returns: Gridded values.
+    """
+    from scipy.spatial import cKDTree
+
+    _, ind = cKDTree(locations[:, :2]).query(grid_nodes(axes))
+
+    return values[ind]
+
+
+@register("block_mean")
+def block_mean_gridding(
+    locations: np.ndarray, values: np.ndarray, axes: list[np.ndarray], **_
+) -> np.ndarray:
+    """
+    Mean of the points falling in the cell centered on each node.
+
+    Suited to data much denser than the grid, as nodes without points are
+    left empty.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+
+    :returns: Gridded values, NaN on nodes without points.
+    """
+    shape = (axes[1].shape[0], axes[0].shape[0])
+    indices = []
+    for dim, axis in enumerate(axes):
+        step = axis[1] - axis[0] if axis.shape[0] > 1 else 1.0
+        index = np.round((locations[:, dim] - axis[0]) / step).astype(int)
+        indices.append(np.clip(index, 0, axis.shape[0] - 1))
+
+    cells = np.ravel_multi_index((indices[1], indices[0]), shape)
+    total = np.bincount(cells, weights=values, minlength=shape[0] * shape[1])
+    count = np.bincount(cells, minlength=shape[0] * shape[1])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return total / count
+
+
+def mask_max_distance(
+    locations: np.ndarray,
+    values: np.ndarray,
+    axes: list[np.ndarray],
+    max_distance: float,
+) -> np.ndarray:
+    """
+    Blank the grid nodes farther than a distance from any data location.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Gridded values, of shape (ny, nx).
+    :param axes: Axes of the grid along x and y.
+    :param max_distance: Maximum horizontal distance to the nearest location.
+
+    :returns: Gridded values, NaN on the blanked nodes.
+    """
+    from scipy.spatial import cKDTree
+
+    distance, _ = cKDTree(locations[:, :2]).query(
+        grid_nodes(axes), distance_upper_bound=max_distance
+    )
+    values[np.isinf(distance).reshape(values.shape)] = np.nan
+
+    return values
+
+
+def grid_values(
+    locations: np.ndarray,
+    values: np.ndarray,
+    axes: list[np.ndarray],
+    resolution: float,
+    max_distance: float,
+    *,
+    method: str = "idw",
+) -> np.ndarray:
+    """
+    Interpolate scattered values on a regular grid with a registered method.
+
+    Locations with NaN values are ignored, and nodes farther than the maximum
+    distance from any valid location are left empty, whatever the method.
+
+    :param locations: n x 3 array of the data locations.
+    :param values: Values at the locations.
+    :param axes: Axes of the grid along x and y.
+    :param resolution: Grid resolution.
+    :param max_distance: Maximum distance between the nodes and the data.
+    :param method: Name of the gridding method.
+
+    :returns: Gridded values, of shape (ny, nx).
+    """
+    if method not in GRIDDING_METHODS:
+        raise ValueError(
+            f"Unknown gridding method '{method}'. "
+            f"Choose one of {list(GRIDDING_METHODS)}."
+        )
+
+    valid = ~np.isnan(values)
+    locations, values = locations[valid], values[valid]
+    gridded = GRIDDING_METHODS[method](
+        locations, values, axes, resolution=resolution, max_distance=max_distance
+    )
+    gridded = np.asarray(gridded, dtype=float).reshape(
+        (axes[1].shape[0], axes[0].shape[0])
+    )
+
+    return mask_max_distance(locations, gridded, axes, max_distance)
@@ -0,0 +1,109 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+from geoapps_utils.base import Options
+from pydantic import BaseModel, Field
+
+
+class DiagnosticParameters(BaseModel):
+    """
+    Optional diagnostics of the driver runs.
+
+    :param track_memory: Record the peak memory used by each stage.
+    :param memory_budget: Memory (MB) traced by tracemalloc above which a stage
+        raises a warning.
+    :param profile: Profile the process with cProfile.
+    :param profile_fraction: Fraction of the runs to profile.
+    :param profile_top: Number of functions listed in the profile summary.
+    """
+
+    track_memory: bool = False
+    memory_budget: float | None = None
+    profile: bool = False
+    profile_fraction: float = Field(default=1.0, ge=0.0, le=1.0)
+    profile_top: int = 30
+
+
+class CacheParameters(BaseModel):
+    """
+    Options of the result cache.
+
+    :param use_cache: Re-use the results computed from identical inputs.
+    :param cache_directory: Cache directory, defaults to the
+        'CURVE_APPS_CACHE_DIR' environment variable or '~/.cache/curve_apps'.
+    :param cache_size: Maximum size of the cache (MB).
+    """
+
+    use_cache: bool = False
+    cache_directory: Path | None = None
+    cache_size: float = 1000.0
+
+
+class ExecutionParameters(BaseModel):
+    """
+    Parallel execution options of the drivers.
+
+    :param workers: Number of workers of the parallel stages.
+    :param parallel_backend: Run the parallel stages in threads, processes,
+        or serially.
+    :param chunk_size: Number of items sent to a worker at a time, defaults
+        to about four chunks per worker.
+    :param blas_threads: Maximum number of BLAS and OpenMP threads, defaults to
+        one thread when running in parallel.
+    """
+
+    workers: int = Field(default=1, ge=1)
+    parallel_backend: Literal["serial", "thread", "process"] = "thread"
+    chunk_size: int | None = Field(default=None, ge=1)
+    blas_threads: int | None = Field(default=None, ge=1)
+
+    @property
+    def parallel(self) -> bool:
+        """
+        True if the stages run with more than one worker.
+        """
+        return self.workers > 1 and self.parallel_backend != "serial"
+
+
+class BaseCurveParameters(Options):
+    """
+    Parameters shared by the curve applications.
+
+    :param dry_run: Only estimate the cost of the run, without computing or
+        writing anything.
+    :param monitoring_export: Export the output to the monitoring directory
+        as a copy, or as a delta file written in the background.
+    :param precision: Floating point precision of the gridded values and
+        output vertices, relative to a local origin.
+    :param diagnostics: Diagnostics options.
+    :param cache: Result cache options.
+    :param execution: Parallel execution options.
+    """
+
+    conda_environment: str = "curve_apps"
+    dry_run: bool = False
+    monitoring_export: Literal["copy", "delta"] = "copy"
+    precision: Literal["double", "single"] = "double"
+    diagnostics: DiagnosticParameters = DiagnosticParameters()
+    cache: CacheParameters = CacheParameters()
+    execution: ExecutionParameters = ExecutionParameters()
+
+    @property
+    def dtype(self) -> type[np.floating]:
+        """
+        Floating point type of the computations.
+        """
+        return np.float32 if self.precision == "single" else np.float64
@@ -0,0 +1,240 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+
+import numpy as np
+
+from curve_apps.options import ExecutionParameters
+from curve_apps.shared_arrays import SharedArrays, SharedArraySpec, attach
+
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # pragma: no cover
+    threadpool_limits = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+#: Environment variables read by the BLAS and OpenMP runtimes on start-up.
+BLAS_VARIABLES = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+#: Guard of the process-wide BLAS limits, shared by concurrent contexts.
+_BLAS_LOCK = threading.Lock()
+_BLAS_STATE: dict[str, Any] = {"count": 0, "restore": None}
+
+
+def blas_threads(execution: ExecutionParameters) -> int | None:
+    """
+    Number of BLAS threads allowed by the execution options.
+
+    Unless set explicitly, BLAS runs single-threaded under a parallel backend,
+    such that the pool workers do not compete with nested BLAS threads.
+
+    :param execution: Execution options.
+
+    :returns: Number of threads, or None for no limit.
+    """
+    if execution.blas_threads is not None:
+        return execution.blas_threads
+
+    if execution.parallel:
+        return 1
+
+    return None
+
+
+@contextmanager
+def limit_blas_threads(limit: int | None) -> Iterator[None]:
+    """
+    Limit the number of threads of the BLAS and OpenMP libraries.
+
+    The limits are applied with threadpoolctl when installed. Otherwise, the
+    environment variables are set for the processes started within the
+    context, as the libraries already loaded cannot be changed.
+
+    The limits are global to the process, so they are set by the first of
+    nested or concurrent contexts, e.g. from several threads, and only
+    restored once the last one exits.
+
+    :param limit: Number of threads, or None for no limit.
+    """
+    if limit is None:
+        yield
+        return
+
+    with _BLAS_LOCK:
+        if _BLAS_STATE["count"] == 0:
+            _BLAS_STATE["restore"] = apply_blas_limit(limit)
+        _BLAS_STATE["count"] += 1
+
+    try:
+        yield
+    finally:
+        with _BLAS_LOCK:
+            _BLAS_STATE["count"] -= 1
+            if _BLAS_STATE["count"] == 0:
+                _BLAS_STATE.pop("restore")()
+
+
+def apply_blas_limit(limit: int) -> Callable[[], None]:
+    """
+    Set the number of threads of the BLAS and OpenMP libraries.
+
+    :param limit: Number of threads.
+
+    :returns: Function restoring the previous limits.
+    """
+    if threadpool_limits is not None:
+        return threadpool_limits(limits=limit).restore_original_limits
+
+    previous = {name: os.environ.get(name) for name in BLAS_VARIABLES}
+    os.environ.update({name: str(limit) for name in BLAS_VARIABLES})
+
+    def restore():
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return restore
+
+
+def get_chunks(items: Sequence, chunk_size: int) -> list[Sequence]:
+    """
+    Split a sequence into consecutive chunks.
+
+    :param items: Items to split.
+    :param chunk_size: Number of items per chunk.
+    """
+    return [
+        items[start : start + chunk_size] for start in range(0, len(items), chunk_size)
+    ]
+
+
+def run_chunk(func: Callable, chunk: Sequence, arrays: dict[str, np.ndarray]) -> list:
+    """
+    Apply a function to each item of a chunk.
+
+    :param func: Function called as func(item, **arrays).
+    :param chunk: Items of the chunk.
+    :param arrays: Arrays passed to the function.
+    """
+    return [func(item, **arrays) for item in chunk]
+
+
+def run_shared_chunk(
+    func: Callable,
+    chunk: Sequence,
+    specs: dict[str, SharedArraySpec],
+    limit: int | None,
+) -> list:
+    """
+    Apply a function to each item of a chunk, in a worker process.
+
+    :param func: Function called as func(item, **arrays).
+    :param chunk: Items of the chunk.
+    :param specs: Specs of the arrays published in shared memory.
+    :param limit: Number of BLAS threads of the worker.
+    """
+    with limit_blas_threads(limit), attach(specs) as arrays:
+        return run_chunk(func, chunk, arrays)
+
+
+def parallel_map(
+    func: Callable,
+    items: Sequence,
+    execution: ExecutionParameters | None = None,
+    arrays: dict[str, np.ndarray] | None = None,
+) -> Iterator[Any]:
+    """
+    Apply a function to items with the backend of the execution options.
+
+    The items are processed in chunks and the results are yielded in order, as
+    soon as their chunk and all the previous ones are done, such that they can
+    be consumed while the next chunks are computed. The pool is held until the
+    generator is exhausted or closed.
+    With the process backend, the function must be importable by the workers
+    and the arrays are published once in shared memory rather than pickled
+    for each chunk. The results must not reference the shared arrays.
+
+    :param func: Function called as func(item, **arrays).
+    :param items: Items to process.
+    :param execution: Execution options, defaults to serial.
+    :param arrays: Large arrays shared by all items.
+
+    :returns: Results of the items.
+    """
+    execution = execution or ExecutionParameters()
+    arrays = arrays or {}
+    items = list(items)
+
+    if not execution.parallel or len(items) < 2:
+        for item in items:
+            yield func(item, **arrays)
+        return
+
+    workers = min(execution.workers, len(items))
+    chunk_size = execution.chunk_size or math.ceil(len(items) / (4 * workers))
+    chunks = get_chunks(items, chunk_size)
+    logger.debug(
+        "Mapping %s items in %s chunks over %s %s workers.",
+        len(items),
+        len(chunks),
+        workers,
+        execution.parallel_backend,
+    )
+
+    if execution.parallel_backend == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for results in executor.map(
+                run_chunk,
+                [func] * len(chunks),
+                chunks,
+                [arrays] * len(chunks),
+            ):
+                yield from results
+    else:
+        # The limits are also set in the parent, such that the environment
+        # variables of the fallback are inherited by the new processes
+        limit = blas_threads(execution)
+        context = multiprocessing.get_context("spawn")
+        with (
+            limit_blas_threads(limit),
+            SharedArrays() as shared,
+            ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor,
+        ):
+            specs = shared.update(**arrays)
+            for results in executor.map(
+                run_shared_chunk,
+                [func] * len(chunks),
+                chunks,
+                [specs] * len(chunks),
+                [limit] * len(chunks),
+            ):
+                yield from results
@@ -0,0 +1,282 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import numpy as np
+
+
+# Heavy dependencies are imported by the functions using them, to keep the
+# start-up time of the applications low.
+# pylint: disable=import-outside-toplevel
+
+
+def link_segment_ends(n_vertices: int, cells: np.ndarray) -> np.ndarray:
+    """
+    Link the ends of the segments meeting at the vertices of degree two.
+
+    The end of segment i at vertex cells[i, j] is indexed 2 * i + j.
+
+    :param n_vertices: Number of vertices.
+    :param cells: m x 2 array of vertex indices for the segments.
+
+    :returns: Index of the end linked to each segment end, -1 for free ends.
+    """
+    flat = cells.flatten()
+    degree = np.bincount(flat, minlength=n_vertices)
+    order = np.argsort(flat, kind="stable")
+    joints = np.r_[0, np.cumsum(degree)[:-1]][degree == 2]
+
+    link = np.full(flat.shape[0], -1)
+    link[order[joints]] = order[joints + 1]
+    link[order[joints + 1]] = order[joints]
+
+    return link
+
+
+def walk_segment_ends(
+    flat: np.ndarray, link: np.ndarray, starts: np.ndarray
+) -> list[np.ndarray]:
+    """
+    Walk simultaneously along chains of linked segments.
+
+    :param flat: Vertex index of each segment end.
+    :param link: Index of the end linked to each segment end, -1 for free ends.
+    :param starts: Segment end starting each chain.
+
+    :returns: Ordered vertex indices of each chain.
+    """
+    current, chain = starts, np.arange(starts.shape[0])
+    chains, indices = [chain], [flat[current]]
+    while current.shape[0] > 0:
+        chains.append(chain)
+        indices.append(flat[current ^ 1])
+        current = link[current ^ 1]
+        active = current >= 0
+        chain, current = chain[active], current[active]
+
+    labels = np.concatenate(chains)
+    ind = np.argsort(labels, kind="stable")
+
+    return np.split(np.concatenate(indices)[ind], np.cumsum(np.bincount(labels))[:-1])
+
+
+def get_segment_chains(n_vertices: int, cells: np.ndarray) -> list[np.ndarray]:
+    """
+    Order segments into chains joined at the vertices shared by two segments.
+
+    Chains stop at the vertices of degree other than two, while closed loops
+    are opened at one of their vertices, which is repeated at both ends.
+
+    :param n_vertices: Number of vertices.
+    :param cells: m x 2 array of vertex indices for the segments.
+
+    :returns: Ordered vertex indices of each chain.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    if cells.shape[0] == 0:
+        return []
+
+    link = link_segment_ends(n_vertices, cells)
+    ends = np.arange(link.shape[0])
+    linked = link >= 0
+    graph = coo_matrix(
+        (np.ones(linked.sum(), dtype=bool), (ends[linked] // 2, link[linked] // 2)),
+        shape=(cells.shape[0], cells.shape[0]),
+    )
+    _, labels = connected_components(graph, directed=False)
+
+    # Start from the first free end of each chain, else open the loop
+    first = np.full(labels.max() + 1, 2 * link.shape[0])
+    np.minimum.at(first, labels[ends // 2], linked * link.shape[0] + ends)
+    starts = first % link.shape[0]
+    loops = starts[first >= link.shape[0]]
+    link[link[loops]] = -1
+    link[loops] = -1
+
+    return walk_segment_ends(cells.flatten(), link, starts)
+
+
+def get_section_bounds(nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    First and last vertex of the sections holding the vertices of chains.
+
+    :param nodes: Vertices starting or ending a section, in chain order.
+
+    :returns: Index of the closest node before and after each vertex,
+        themselves for the nodes.
+    """
+    index = np.arange(nodes.shape[0])
+    start = np.maximum.accumulate(np.where(nodes, index, 0))
+    end = np.minimum.accumulate(np.where(nodes, index, nodes.shape[0])[::-1])[::-1]
+
+    return start, end
+
+
+def get_chord_distances(
+    points: np.ndarray, bounds: tuple[np.ndarray, np.ndarray], candidates: np.ndarray
+) -> np.ndarray:
+    """
+    Distance of vertices to the chord of their section.
+
+    :param points: Ordered vertices of all chains, as complex x + iy.
+    :param bounds: First and last vertex of the section holding each vertex.
+    :param candidates: Indices of the vertices.
+
+    :returns: Distance to the chord, or to the section start for closed sections.
+    """
+    start, end = bounds
+    chord = points[end[candidates]] - points[start[candidates]]
+    offset = points[candidates] - points[start[candidates]]
+    length = np.abs(chord) ** 2
+    ratio = (offset * chord.conj()).real / np.where(length > 0, length, 1.0)
+
+    return np.abs(offset - np.clip(ratio, 0.0, 1.0) * chord)
+
+
+def split_sections(
+    points: np.ndarray,
+    bounds: tuple[np.ndarray, np.ndarray],
+    flagged: np.ndarray,
+    bad: np.ndarray,
+) -> np.ndarray:
+    """
+    Choose the vertex splitting each section holding deviating segments.
+
+    Sections are split at the interior vertex farthest from their chord, or
+    next to a deviating segment if all vertices lie on the chord, as for
+    sections folding back on themselves.
+
+    :param points: Ordered vertices of all chains, as complex x + iy.
+    :param bounds: First and last vertex of the section holding each vertex.
+    :param flagged: Vertices starting the sections to split.
+    :param bad: Segments deviating from the chord of their section, with
+        segment i joining vertices i and i + 1.
+
+    :returns: Indices of the splitting vertices, one per section to split.
+    """
+    start = bounds[0]
+    candidates = np.flatnonzero(flagged[start])
+    candidates = candidates[start[candidates] != candidates]
+    distance = get_chord_distances(points, bounds, candidates)
+    turn = bad[candidates - 1] | bad[candidates]
+
+    # Candidates are contiguous by section, reduced to the first farthest one
+    change = start[candidates][1:] != start[candidates][:-1]
+    first = np.flatnonzero(np.r_[True, change])
+    farthest = np.maximum.reduceat(distance, first)[np.cumsum(np.r_[False, change])]
+    chosen = (distance == farthest) & ((farthest > 0) | turn)
+    position = np.where(chosen, np.arange(candidates.shape[0]), candidates.shape[0])
+
+    return candidates[np.minimum.reduceat(position, first)]
+
+
+def refine_sections(
+    points: np.ndarray, nodes: np.ndarray, moving: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """
+    Split sections until no segment deviates from their chord.
+
+    Only the segments of the sections split last are checked again, such
+    that each pass shrinks to the sections still being refined.
+
+    :param points: Ordered vertices of all chains, as complex x + iy.
+    :param nodes: Vertices starting or ending a section, in chain order.
+    :param moving: Segments of non-zero length joining vertices of a chain.
+    :param tolerance: Maximum angle (radians) between a segment and its section.
+
+    :returns: Vertices starting or ending the refined sections.
+    """
+    nodes = nodes.copy()
+    angles = np.angle(np.diff(points))
+    pending = moving
+    while np.any(pending):
+        start, end = get_section_bounds(nodes)
+        segments = np.flatnonzero(pending)
+        chord = points[end[segments + 1]] - points[start[segments]]
+        deviation = angles[segments] - np.angle(chord)
+        deviation = np.abs((deviation + np.pi) % (2 * np.pi) - np.pi)
+        deviation[chord == 0] = np.inf
+
+        bad = np.zeros(pending.shape[0], dtype=bool)
+        bad[segments[deviation > tolerance]] = True
+        if not np.any(bad):
+            break
+
+        flagged = np.zeros(nodes.shape[0], dtype=bool)
+        flagged[start[:-1][bad]] = True
+        pending = moving & flagged[start[:-1]]
+        nodes[split_sections(points, (start, end), flagged, bad)] = True
+
+    return nodes
+
+
+def split_chains(
+    vertices: np.ndarray, chains: list[np.ndarray], tolerance: float
+) -> np.ndarray:
+    """
+    Split ordered chains of vertices into straight sections.
+
+    All chains are processed at once, by recursively splitting the sections
+    holding a segment that deviates from the chord of the section by more than
+    the tolerance.
+
+    :param vertices: n x 2 array of vertices.
+    :param chains: Ordered vertex indices of each chain.
+    :param tolerance: Maximum angle (radians) between a segment and its section.
+
+    :returns: m x 2 array of vertex indices for the ends of the sections.
+    """
+    indices = np.concatenate(chains)
+    labels = np.repeat(np.arange(len(chains)), [chain.shape[0] for chain in chains])
+    points = vertices[indices, 0] + 1j * vertices[indices, 1]
+    breaks = labels[1:] != labels[:-1]
+    nodes = np.r_[True, breaks] | np.r_[breaks, True]
+
+    # Consecutive segments turning by more than twice the tolerance cannot
+    # share a section
+    delta = np.diff(points)
+    moving = ~breaks & (delta != 0)
+    turn = np.abs((np.diff(np.angle(delta)) + np.pi) % (2 * np.pi) - np.pi)
+    nodes[1:-1] |= moving[:-1] & moving[1:] & (turn > 2 * tolerance)
+
+    nodes = np.flatnonzero(refine_sections(points, nodes, moving, tolerance))
+    sections = labels[nodes[1:]] == labels[nodes[:-1]]
+
+    return np.c_[indices[nodes[:-1]], indices[nodes[1:]]][sections]
+
+
+def fuse_collinear_segments(
+    vertices: np.ndarray, cells: np.ndarray, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse chains of touching segments with matching direction into single segments.
+
+    Segments are chained through the vertices shared by exactly two of them,
+    then each chain is simplified to the segments joining the ends of its
+    straight sections, such that no original segment deviates from the fused
+    segment covering it by more than the tolerance. Closed loops are kept.
+
+    :param vertices: n x 3 array of vertices.
+    :param cells: m x 2 array of vertex indices for the segments.
+    :param tolerance: Maximum angle (degree) between a segment and its fused line.
+
+    :returns: Vertices and cells of the fused segments.
+    """
+    chains = get_segment_chains(vertices.shape[0], cells)
+    if not chains:
+        return vertices[:0], np.empty((0, 2), dtype=int)
+
+    cells = split_chains(vertices[:, :2], chains, np.deg2rad(tolerance))
+    used, r_ind = np.unique(cells, return_inverse=True)
+
+    return vertices[used], r_ind.reshape((-1, 2))
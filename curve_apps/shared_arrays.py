@@ -0,0 +1,276 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import sys
+import weakref
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import overload
+from uuid import uuid4
+
+import numpy as np
+
+
+try:
+    import _posixshmem
+except ImportError:  # pragma: no cover
+    _posixshmem = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """
+    Picklable description of an array published in shared memory.
+
+    :param block: Name of the shared memory block.
+    :param shape: Shape of the array.
+    :param dtype: Data type string of the array.
+    """
+
+    block: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the array in bytes.
+        """
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+
+#: Attach blocks without registering them with the resource tracker.
+UNTRACKED_ATTACH = sys.version_info >= (3, 13)
+
+
+@contextmanager
+def map_block(name: str) -> Iterator[memoryview]:
+    """
+    Read-only mapping of an existing shared memory block, without ownership.
+
+    Before Python 3.13, attaching a block with ``SharedMemory`` registers it
+    with the resource tracker shared by the processes, which then removes the
+    block when any worker exits. POSIX blocks are therefore mapped directly,
+    such that a worker exiting, or crashing, never removes a block still used
+    by the publisher.
+
+    :param name: Name of the block.
+
+    :returns: Buffer of the block, unmapped when the context exits.
+    """
+    block: shared_memory.SharedMemory | None = None
+    mapping: mmap.mmap | None = None
+
+    if _posixshmem is None or UNTRACKED_ATTACH:
+        kwargs = {"track": False} if UNTRACKED_ATTACH else {}
+        block = shared_memory.SharedMemory(name=name, **kwargs)
+        if block.buf is None:
+            raise ValueError(f"Shared block {name} could not be mapped.")
+        buffer = block.buf
+    else:
+        descriptor = _posixshmem.shm_open(f"/{name}", os.O_RDONLY, mode=0o600)
+        try:
+            mapping = mmap.mmap(
+                descriptor, os.fstat(descriptor).st_size, access=mmap.ACCESS_READ
+            )
+        finally:
+            os.close(descriptor)
+        buffer = memoryview(mapping)
+
+    try:
+        yield buffer
+    finally:
+        try:
+            if block is not None:
+                block.close()
+            elif mapping is not None:
+                buffer.release()
+                mapping.close()
+        except BufferError:
+            logger.warning("Views of shared block %s are still referenced.", name)
+
+
+def release_blocks(blocks: list[shared_memory.SharedMemory]):
+    """
+    Close and remove shared memory blocks.
+
+    :param blocks: Blocks owned by the publisher.
+    """
+    while blocks:
+        block = blocks.pop()
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArrays:
+    """
+    Arrays published once in shared memory and read by worker processes.
+
+    The publisher owns the memory blocks and removes them when the context
+    exits, when the object is garbage collected or at interpreter exit,
+    whether or not the workers completed. Workers get zero-copy, read-only
+    views with :func:`attach`, from the picklable specs.
+
+    :param prefix: Prefix of the block names.
+    """
+
+    def __init__(self, prefix: str = "curve_apps"):
+        self.prefix = prefix
+        self.specs: dict[str, SharedArraySpec] = {}
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, release_blocks, self._blocks)
+
+    def __enter__(self) -> SharedArrays:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __getitem__(self, name: str) -> SharedArraySpec:
+        return self.specs[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of the published arrays in bytes.
+        """
+        return sum(spec.nbytes for spec in self.specs.values())
+
+    def publish(self, name: str, array: np.ndarray) -> SharedArraySpec:
+        """
+        Copy an array into a new shared memory block.
+
+        :param name: Name of the array.
+        :param array: Array to publish.
+
+        :returns: Spec of the shared array.
+        """
+        if name in self.specs:
+            raise KeyError(f"Array '{name}' is already published.")
+
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(f"Array '{name}' of dtype object cannot be shared.")
+
+        block = shared_memory.SharedMemory(
+            name=f"{self.prefix}_{uuid4().hex[:16]}",
+            create=True,
+            size=max(array.nbytes, 1),
+        )
+        self._blocks.append(block)
+
+        view: np.ndarray = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        view[...] = array
+
+        spec = SharedArraySpec(block.name, array.shape, array.dtype.str)
+        self.specs[name] = spec
+        logger.debug("Published '%s' (%s bytes) as %s.", name, spec.nbytes, spec.block)
+
+        return spec
+
+    def update(self, **arrays: np.ndarray) -> dict[str, SharedArraySpec]:
+        """
+        Publish several arrays.
+
+        :param arrays: Arrays to publish, by name.
+
+        :returns: Specs of all published arrays.
+        """
+        for name, array in arrays.items():
+            self.publish(name, array)
+
+        return dict(self.specs)
+
+    def close(self):
+        """
+        Release the shared memory blocks.
+        """
+        self._finalizer()
+        self.specs = {}
+
+
+@contextmanager
+def attach_arrays(specs: dict[str, SharedArraySpec]) -> Iterator[dict[str, np.ndarray]]:
+    """
+    Read-only views of published arrays, valid within the context.
+
+    :param specs: Specs of the shared arrays, by name.
+
+    :returns: Views of the arrays, by name.
+    """
+    views: dict[str, np.ndarray] = {}
+    with ExitStack() as stack:
+        try:
+            for name, spec in specs.items():
+                buffer = stack.enter_context(map_block(spec.block))
+                view: np.ndarray = np.ndarray(
+                    spec.shape, dtype=np.dtype(spec.dtype), buffer=buffer
+                )
+                view.flags.writeable = False
+                views[name] = view
+
+            yield views
+        finally:
+            views.clear()
+
+
+@contextmanager
+def attach_array(spec: SharedArraySpec) -> Iterator[np.ndarray]:
+    """
+    Read-only view of a published array, valid within the context.
+
+    :param spec: Spec of the shared array.
+
+    :returns: View of the array.
+    """
+    with attach_arrays({"": spec}) as views:
+        yield views.pop("")
+
+
+@overload
+def attach(specs: SharedArraySpec) -> AbstractContextManager[np.ndarray]: ...
+
+
+@overload
+def attach(
+    specs: dict[str, SharedArraySpec],
+) -> AbstractContextManager[dict[str, np.ndarray]]: ...
+
+
+def attach(
+    specs: dict[str, SharedArraySpec] | SharedArraySpec,
+) -> AbstractContextManager[dict[str, np.ndarray]] | AbstractContextManager[np.ndarray]:
+    """
+    Read-only views of published arrays, valid within the context.
+
+    :param specs: Spec, or dictionary of specs, of the shared arrays.
+
+    :returns: Context manager of the view, or dictionary of views, of the arrays.
+    """
+    if isinstance(specs, SharedArraySpec):
+        return attach_array(specs)
+
+    return attach_arrays(specs)
@@ -14,14 +14,26 @@ from __future__ import annotations
 
 import logging
 import sys
+from collections.abc import Iterator
+from functools import partial
 
 import numpy as np
 from geoh5py.objects import Curve
-from geoh5py.ui_json import InputFile, utils
+from geoh5py.ui_json import InputFile
 from tqdm import tqdm
 
-from curve_apps.driver import BaseCurveDriver
-from curve_apps.trend_lines.options import TrendLineParameters
+from curve_apps.diagnostics import estimate_stage
+from curve_apps.driver import (
+    BaseCurveDriver,
+    CurveBuffer,
+    CurveOutput,
+    CurvePayload,
+)
+from curve_apps.parallel import parallel_map
+from curve_apps.trend_lines.options import (
+    TrendLineDetectionParameters,
+    TrendLineParameters,
+)
 from curve_apps.utils import find_curves
 
 
@@ -40,92 +52,151 @@ class TrendLinesDriver(BaseCurveDriver):
     def __init__(self, parameters: TrendLineParameters | InputFile):
         super().__init__(parameters)
 
-    def make_curve(self):
-        """Make curve object from trend lines detected in source data."""
+    def estimate(self) -> dict:
+        """
+        Estimate the number of vertices and labels to connect.
+        """
+        n_vertices = self.params.source.entity.n_vertices
+        labels = 1
+        if self.params.source.data is not None:
+            labels = max(len(self.params.source.data.value_map) - 1, 1)
+
+        return {
+            "vertices": n_vertices,
+            "labels": labels,
+            "source_values": n_vertices,
+            "stages": {"find_curves": estimate_stage("find_curves", n_vertices)},
+        }
+
+    def compute(self) -> CurvePayload | None:
+        """
+        Compute the trend lines detected in source data.
+        """
+        logging.info("Generating trend lines ...")
+        self.metrics.count("vertices_in", self.vertices.shape[0])
+        vertices, cells, labels = self.get_connections()
 
-        with utils.fetch_active_workspace(self.workspace, mode="r+") as workspace:
-            logging.info("Generating trend lines ...")
-            vertices, cells, labels = self.get_connections()
+        if cells is None:
+            logger.info("No connections found.")
+            return None
 
-            if cells is None:
-                logger.info("No connections found.")
-                return None
+        return CurvePayload(vertices=vertices, cells=cells, values={"labels": labels})
 
-            curve = Curve.create(
-                workspace=workspace,
-                name=self.params.export_as,
-                vertices=vertices,
-                cells=cells,
-                parent=self.out_group,
-            )
+    def write_curve(self, payload: CurvePayload) -> Curve:
+        """
+        Write the trend lines with their labels.
 
-            if curve is not None and self.params.source.data is not None:
-                curve.add_data(
-                    {
-                        self.params.source.data.name: {
-                            "values": labels,
-                            "entity_type": self.params.source.data.entity_type,
-                            "association": "VERTEX",
-                        }
+        :param payload: Computed trend lines.
+        """
+        output = CurveOutput(
+            self.workspace,
+            name=self.params.export_as,
+            vertices=payload.vertices,
+            cells=payload.cells,
+            parent=self.out_group,
+        )
+
+        if self.params.source.data is not None:
+            output.add_data(
+                {
+                    self.params.source.data.name: {
+                        "values": payload.values["labels"],
+                        "entity_type": self.params.source.data.entity_type,
+                        "association": "VERTEX",
                     }
-                )
+                }
+            )
+
+        curve = output.write()
 
         return curve
 
-    def get_connections(self) -> tuple:
+    def iter_connections(self) -> Iterator[tuple[np.ndarray, np.ndarray, int]]:
         """
-        Find connections between entity parts.
+        Generate the connections between entity parts, one label at a time.
 
-        :params entity: A Curve object with parts.
-        :params data: Input referenced data.
-        :params detection: Detection parameters.
+        The labels are processed with the backend of the execution options.
 
-        :returns : n x 3 array. Vertices of connecting lines.
-        :returns : n x 2 float array. Cells of edges.
-        :returns : n x 1 array. Labels of vertices.
+        :returns: Vertices of the connecting lines, cells indexed on the
+            vertices and label.
         """
-        path_list = []
-        out_labels = np.zeros_like(self.labels).astype("int32")
+        vertices, parts, labels = self.vertices, self.parts, self.labels
 
-        for value in tqdm(np.unique(self.labels), desc="Looping over data labels"):
+        groups = []
+        for value in np.unique(labels):
             if value == 0:
                 continue
 
-            ind = np.where(self.labels == value)[0]
+            ind = np.where(labels == value)[0]
 
             if len(ind) < 2:
                 continue
 
-            segments = find_curves(
-                self.vertices[ind, :2],
-                self.parts[ind],
-                self.params.detection,
-            )
+            groups.append((value, ind))
+
+        results = parallel_map(
+            partial(TrendLinesDriver.get_label_curves, detection=self.params.detection),
+            [ind for _, ind in groups],
+            self.params.execution,
+            arrays={"vertices": vertices[:, :2], "parts": parts},
+        )
 
-            if any(segments):
-                path_list += ind[np.vstack(segments)].tolist()
-                out_labels[ind] = value
+        for value, ind in tqdm(groups, desc="Looping over data labels"):
+            with self.metrics.stage("find_curves"):
+                segments = next(results, None)
 
-        if any(path_list):
-            path = np.vstack(path_list)
+            if segments is None:
+                raise RuntimeError(f"Missing curves for label {value}.")
+
+            self.metrics.count("labels")
+            self.metrics.count("curves_out", len(segments))
+
+            if not any(segments):
+                continue
 
             # Truncate vertices and renumber
-            verts_bool = np.zeros(self.vertices.shape[0], dtype=bool)
+            path = ind[np.vstack(segments)]
+            uni_ind, cells = np.unique(path, return_inverse=True)
+
+            yield vertices[uni_ind, :], cells.reshape(path.shape), value
+
+    @staticmethod
+    def get_label_curves(
+        ind: np.ndarray,
+        vertices: np.ndarray,
+        parts: np.ndarray,
+        detection: TrendLineDetectionParameters,
+    ) -> list:
+        """
+        Find the curves connecting the vertices of a label.
 
-            uni_ind = np.unique(path.flatten())
+        :param ind: Indices of the vertices of the label.
+        :param vertices: Horizontal coordinates of all vertices.
+        :param parts: Part identifiers of all vertices.
+        :param detection: Detection parameters.
 
-            verts_bool[uni_ind] = True
-            new_indices = np.ones_like(verts_bool, dtype="int32")
-            new_indices[verts_bool] = np.arange(uni_ind.shape[0])
-            path = new_indices[path]
+        :returns: List of segments, indexed on the vertices of the label.
+        """
+        return find_curves(vertices[ind], parts[ind], detection)
 
-            return (
-                self.vertices[uni_ind, :],
-                path,
-                out_labels[uni_ind],
-            )
+    def get_connections(self) -> tuple:
+        """
+        Find connections between entity parts.
+
+        Connections are appended to a growable buffer as they are found.
+
+        :returns : n x 3 array. Vertices of connecting lines.
+        :returns : n x 2 float array. Cells of edges.
+        :returns : n x 1 array. Labels of vertices.
+        """
+        buffer = CurveBuffer(cells_dtype="int32")
+        for vertices, cells, value in self.iter_connections():
+            buffer.append(vertices, cells, {"labels": np.int32(value)})
+
+        if buffer.n_cells == 0:
+            return self.vertices, None, np.zeros_like(self.labels).astype("int32")
 
-        return self.vertices, None, out_labels
+        return buffer.vertices, buffer.cells, buffer.values["labels"]
 
     @property
     def vertices(self) -> np.ndarray:
@@ -167,5 +238,6 @@ class TrendLinesDriver(BaseCurveDriver):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     file = sys.argv[1]
     driver = TrendLinesDriver.start(file)
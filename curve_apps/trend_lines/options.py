@@ -11,14 +11,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Literal
 
-from geoapps_utils.base import Options
 from geoh5py.data import Data, ReferencedData
 from geoh5py.objects import Curve, Points
 from pydantic import BaseModel, ConfigDict
 
 from curve_apps import assets_path
+from curve_apps.options import BaseCurveParameters
 
 
 class TrendLineSourceParameters(BaseModel):
@@ -46,6 +46,8 @@ class TrendLineDetectionParameters(BaseModel):
     :param damping: Damping factor between [0, 1] for the path roughness.
     :param min_edges: Minimum number of points in a curve.
     :param max_distance: Maximum distance between points in a curve.
+    :param engine: Link the points with a greedy walk from the shortest edges,
+        or along the minimum spanning forest of the candidate edges.
     """
 
     azimuth: float | None = None
@@ -53,9 +55,10 @@ class TrendLineDetectionParameters(BaseModel):
     damping: float = 0
     min_edges: int = 1
     max_distance: float | None = None
+    engine: Literal["greedy", "mst"] = "greedy"
 
 
-class TrendLineParameters(Options):
+class TrendLineParameters(BaseCurveParameters):
     """
     Trend lines parameters for use with `trend_lines.driver`.
 
@@ -69,7 +72,6 @@ class TrendLineParameters(Options):
     title: ClassVar[str] = "Trend Lines Detection"
     run_command: ClassVar[str] = "curve_apps.trend_line_detection.driver"
 
-    conda_environment: str = "curve_apps"
     source: TrendLineSourceParameters
     detection: TrendLineDetectionParameters = TrendLineDetectionParameters()
     export_as: str | None = "trend_lines"
@@ -10,17 +10,24 @@
 
 from __future__ import annotations
 
+import math
 import re
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 import numpy as np
-from geoapps_utils.utils.numerical import weighted_average
 from geoh5py.objects import Curve, Grid2D, ObjectBase, Points, Surface
-from scipy.interpolate import LinearNDInterpolator, interp1d
-from scipy.spatial import Delaunay
 
-from curve_apps.contours.options import ContourDetectionParameters
-from curve_apps.trend_lines.options import TrendLineDetectionParameters
+from curve_apps.diagnostics import estimate_stage
+
+
+if TYPE_CHECKING:
+    from curve_apps.contours.options import ContourDetectionParameters
+    from curve_apps.trend_lines.options import TrendLineDetectionParameters
+
+# Heavy dependencies are imported by the functions using them, to keep the
+# start-up time of the applications low.
+# pylint: disable=import-outside-toplevel
 
 
 def image_to_grid_coordinate_transfer(
@@ -31,6 +38,8 @@ def image_to_grid_coordinate_transfer(
 
     :param grid: list of x and y grids.
     """
+    from scipy.interpolate import interp1d
+
     row = np.arange(image.shape[0])
     col = np.arange(image.shape[1])
     x_interp = interp1d(col, grid[0])
@@ -43,7 +52,14 @@ def image_to_grid_coordinate_transfer(
 
 
 def interp_to_grid(
-    entity: ObjectBase, values: np.ndarray, resolution: float, max_distance: float
+    entity: ObjectBase,
+    values: np.ndarray,
+    resolution: float,
+    max_distance: float,
+    *,
+    origin: np.ndarray | None = None,
+    dtype=np.float64,
+    method: str = "idw",
 ) -> tuple[list[np.ndarray], np.ndarray]:
     """
     Interpolate values into a regular grid based on entity locations.
@@ -51,35 +67,185 @@ def interp_to_grid(
     :param entity: Geoh5py object with locations data.
     :param values: Data to be interpolated to grid.
     :param resolution: Grid resolution
-    :param max_distance: Maximum distance used in weighted average.
+    :param max_distance: Maximum distance between the grid nodes and the data.
+    :param origin: Local origin subtracted from the grid axes.
+    :param dtype: Data type of the grid axes and values.
+    :param method: Name of the gridding method, one of
+        'curve_apps.gridding.GRIDDING_METHODS'.
     """
+    from curve_apps.gridding import grid_values
 
     if entity.locations is None:
         raise ValueError("Entity must have locations.")
 
+    locations = entity.locations
+    if origin is not None:
+        locations = locations - np.r_[origin[:2], np.zeros(locations.shape[1] - 2)]
+
     grid = []
     for dim in np.arange(2):
         grid += [
             np.arange(
-                entity.locations[:, dim].min(),
-                entity.locations[:, dim].max() + resolution,
+                locations[:, dim].min(),
+                locations[:, dim].max() + resolution,
                 resolution,
             )
         ]
 
-    x, y = np.meshgrid(grid[0], grid[1])
-    z = np.zeros_like(x)
-    values = weighted_average(
-        entity.locations,
-        np.c_[x.flatten(), y.flatten(), z.flatten()],
-        [values],
-        threshold=resolution / 2.0,
-        n=8,
-        max_distance=max_distance,
+    values = grid_values(
+        locations,
+        np.asarray(values, dtype=float),
+        grid,
+        resolution,
+        max_distance,
+        method=method,
+    )
+
+    return [axis.astype(dtype) for axis in grid], values.astype(dtype, copy=False)
+
+
+def smooth_grid(
+    values: np.ndarray, sigma: tuple[float, float], workers: int | None = None
+) -> np.ndarray:
+    """
+    Gaussian smoothing of a grid with NaN values, in the Fourier domain.
+
+    The values and the mask of valid nodes are both filtered, then divided,
+    such that empty nodes do not bias their neighbours. The empty nodes are
+    left empty. The grid is padded by four standard deviations in the
+    'reflect' mode of scipy.ndimage, as used by the Canny filter of the edges
+    application, which is the 'symmetric' mode of numpy.
+
+    :param values: 2D array of values, with NaN on empty nodes.
+    :param sigma: Standard deviation of the filter (cells), along each axis.
+    :param workers: Number of threads of the Fourier transforms.
+
+    :returns: Smoothed values, of the same shape and data type.
+    """
+    from scipy import fft
+
+    mask = ~np.isnan(values)
+    pad: tuple[int, int] = (
+        math.ceil(4.0 * sigma[0]),
+        math.ceil(4.0 * sigma[1]),
+    )
+    shape = [
+        fft.next_fast_len(n + 2 * width, real=True)
+        for n, width in zip(values.shape, pad, strict=True)
+    ]
+
+    # Gaussian transfer function, separable along the two axes
+    transfer = np.outer(
+        np.exp(-2.0 * (np.pi * sigma[0] * fft.fftfreq(shape[0])) ** 2),
+        np.exp(-2.0 * (np.pi * sigma[1] * fft.rfftfreq(shape[1])) ** 2),
+    ).astype(values.dtype, copy=False)
+
+    def convolve(array: np.ndarray) -> np.ndarray:
+        padded = np.pad(array, [(width, width) for width in pad], mode="symmetric")
+        spectrum = fft.rfft2(padded, s=shape, workers=workers)
+        filtered = fft.irfft2(spectrum * transfer, s=shape, workers=workers)
+        rows = slice(pad[0], pad[0] + values.shape[0])
+        cols = slice(pad[1], pad[1] + values.shape[1])
+
+        return np.asarray(filtered)[rows, cols]
+
+    weights = convolve(mask.astype(values.dtype))
+    smoothed = convolve(np.where(mask, values, 0.0).astype(values.dtype, copy=False))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        smoothed /= weights
+
+    smoothed[~mask] = np.nan
+
+    return smoothed.astype(values.dtype, copy=False)
+
+
+def get_grid_shape(entity: ObjectBase, resolution: float) -> tuple[int, int]:
+    """
+    Shape of the grid used by 'interp_to_grid', from the extent of an entity.
+
+    :param entity: Geoh5py object with locations.
+    :param resolution: Grid resolution.
+
+    :returns: Number of grid nodes along x and y.
+    """
+    if entity.extent is None:
+        raise ValueError("Entity must have locations.")
+
+    width = entity.extent[1, :2] - entity.extent[0, :2]
+    n_x, n_y = np.ceil(width / resolution + 1).astype(int)
+
+    return int(n_x), int(n_y)
+
+
+def estimate_grid(
+    entity: ObjectBase, resolution: float
+) -> tuple[tuple[int, int], dict[str, dict[str, float]]]:
+    """
+    Shape of the grid processed for an entity, with the cost of gridding it.
+
+    :param entity: Geoh5py object, gridded unless it is a Grid2D.
+    :param resolution: Grid resolution.
+
+    :returns: Number of grid nodes along x and y, and the estimated stages.
+    """
+    if isinstance(entity, Grid2D):
+        return (int(entity.shape[0]), int(entity.shape[1])), {}
+
+    shape = get_grid_shape(entity, resolution)
+
+    return shape, {
+        "interp_to_grid": estimate_stage("interp_to_grid", shape[0] * shape[1])
+    }
+
+
+def weld_vertices(n_vertices: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Find a single representative for clusters of vertices linked by pairs.
+
+    The pairs are treated as edges of an undirected graph, such that merging
+    is transitive and independent of the order of the pairs. Each vertex is
+    assigned to the lowest index found in its connected component.
+
+    :param n_vertices: Total number of vertices.
+    :param pairs: n x 2 array of indices for vertices to be merged.
+
+    :returns: Array of representative vertex indices, one per vertex.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    pairs = np.asarray(pairs, dtype=int).reshape((-1, 2))
+    graph = coo_matrix(
+        (np.ones(pairs.shape[0], dtype=bool), (pairs[:, 0], pairs[:, 1])),
+        shape=(n_vertices, n_vertices),
     )
-    values = values[0].reshape(x.shape)
+    _, labels = connected_components(graph, directed=False)
+
+    representative = np.full(labels.max(initial=-1) + 1, n_vertices, dtype=int)
+    np.minimum.at(representative, labels, np.arange(n_vertices))
+
+    return representative[labels]
+
+
+def segment_azimuths(
+    vertices: np.ndarray, cells: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the orientation and length of line segments.
 
-    return grid, values
+    :param vertices: n x 2 (or 3) array of vertices.
+    :param cells: m x 2 array of vertex indices for the segments.
+
+    :returns: Positive angle (radians) from North, within [0, pi].
+    :returns: Length of the segments.
+    """
+    delta = vertices[cells[:, 1], :2] - vertices[cells[:, 0], :2]
+    delta[delta[:, 0] < 0, :] *= -1
+    amp = np.linalg.norm(delta, axis=1)
+    orientation = np.arccos(delta[:, 1] / amp)
+
+    return orientation, amp
 
 
 def set_vertices_height(vertices: np.ndarray, entity: ObjectBase):
@@ -91,6 +257,8 @@ def set_vertices_height(vertices: np.ndarray, entity: ObjectBase):
 
     returns: Nx3 array of vertices.
     """
+    from scipy.interpolate import LinearNDInterpolator
+
     if isinstance(entity, Points | Curve | Surface):
         if entity.vertices is None:
             raise ValueError("Entity does not have vertices.")
@@ -145,7 +313,7 @@ def find_curves(
     vertices: np.ndarray,
     parts: np.ndarray,
     params: TrendLineDetectionParameters | None = None,
-) -> list[list[list[float]]]:
+) -> list[list[list[int]]]:
     """
     Find curves in a set of points.
 
@@ -155,6 +323,10 @@ def find_curves(
 
     :return: List of curves.
     """
+    from scipy.spatial import Delaunay
+
+    from curve_apps.trend_lines.options import TrendLineDetectionParameters
+
     if params is None:
         params = TrendLineDetectionParameters()
 
@@ -190,6 +362,9 @@ def find_curves(
         )
         edges = edges[ind]
 
+    if params.engine == "mst":
+        return find_spanning_paths(vertices, edges, params)
+
     # Walk edges until no more edges can be added
     mask = np.ones(vertices.shape[0], dtype=bool)
     out_curves = []
@@ -214,6 +389,324 @@ def find_curves(
     return out_curves
 
 
+def get_edge_angles(
+    vertices: np.ndarray, edges: np.ndarray, azimuth: float | None = None
+) -> np.ndarray:
+    """
+    Compute the angle between undirected edges and a reference orientation.
+
+    Without azimuth, the reference is the dominant orientation of the edges,
+    from the length-weighted mean of their doubled angles.
+
+    :param vertices: Vertices for points.
+    :param edges: Edges for points.
+    :param azimuth: Reference angle (degree), clockwise from North.
+
+    :return: Angles (radians) within [0, pi/2].
+    """
+    vectors = vertices[edges[:, 1], :2] - vertices[edges[:, 0], :2]
+
+    if azimuth is None:
+        doubled = np.arctan2(vectors[:, 0], vectors[:, 1]) * 2.0
+        weights = np.linalg.norm(vectors, axis=1)
+        azimuth = np.rad2deg(
+            np.arctan2(
+                np.sum(weights * np.sin(doubled)), np.sum(weights * np.cos(doubled))
+            )
+            / 2.0
+        )
+
+    reference = np.array([np.sin(np.deg2rad(azimuth)), np.cos(np.deg2rad(azimuth))])
+    cosine = np.abs(vectors @ reference) / np.maximum(
+        np.linalg.norm(vectors, axis=1), np.finfo(float).tiny
+    )
+
+    return np.arccos(np.clip(cosine, 0.0, 1.0))
+
+
+def get_farthest_vertices(
+    forest, labels: np.ndarray, used: np.ndarray, seeds: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the vertex of each tree farthest from a seed vertex.
+
+    All the trees are traversed at once from a virtual node, linked to the
+    seed of every tree.
+
+    :param forest: Sparse matrix of the edge lengths of the forest.
+    :param labels: Tree index of all vertices.
+    :param used: Indices of the vertices of the forest.
+    :param seeds: One seed vertex per tree, in order of the tree index.
+
+    :returns: Farthest vertex of each tree.
+    :returns: Predecessors of all vertices, the virtual node for the seeds.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    n_vertices = forest.shape[0]
+    graph = coo_matrix(
+        (
+            np.r_[forest.data, np.ones(seeds.shape[0])],
+            (
+                np.r_[forest.row, np.full(seeds.shape[0], n_vertices)],
+                np.r_[forest.col, seeds],
+            ),
+        ),
+        shape=(n_vertices + 1, n_vertices + 1),
+    )
+    distances, predecessors = dijkstra(
+        graph, directed=False, indices=n_vertices, return_predecessors=True
+    )
+    order = np.lexsort((-distances[used], labels[used]))
+    _, first = np.unique(labels[used[order]], return_index=True)
+
+    return used[order[first]], predecessors
+
+
+def trace_predecessors(
+    predecessors: np.ndarray, starts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Walk back from vertices of a traversal until reaching its source.
+
+    :param predecessors: Predecessors of all vertices, the source being the
+        last index.
+    :param starts: Vertices to start from.
+
+    :returns: Vertices along the paths, in order.
+    :returns: Index of the start vertex of the paths.
+    """
+    source = predecessors.shape[0] - 1
+    path_ids = [np.arange(starts.shape[0])]
+    steps = [starts]
+    while True:
+        current = predecessors[steps[-1]]
+        alive = (current >= 0) & (current < source)
+        if not np.any(alive):
+            break
+        path_ids.append(path_ids[-1][alive])
+        steps.append(current[alive])
+
+    ids = np.hstack(path_ids)
+    order = np.argsort(ids, kind="stable")
+
+    return np.hstack(steps)[order], ids[order]
+
+
+def get_longest_paths(
+    n_vertices: int, edges: np.ndarray, lengths: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the longest path of each tree in a forest.
+
+    The two ends of the paths are found with two traversals of all the trees
+    at once, from an arbitrary vertex then from the farthest vertex found.
+
+    :param n_vertices: Total number of vertices.
+    :param edges: n x 2 array of vertex indices for the edges of the forest.
+    :param lengths: Length of the edges.
+
+    :returns: Vertices of the paths, in order along each path.
+    :returns: Tree index of the vertices.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    forest = coo_matrix(
+        (lengths, (edges[:, 0], edges[:, 1])), shape=(n_vertices, n_vertices)
+    )
+    _, labels = connected_components(forest, directed=False)
+    used = np.unique(edges)
+
+    _, first = np.unique(labels[used], return_index=True)
+    ends, _ = get_farthest_vertices(forest, labels, used, used[first])
+    starts, predecessors = get_farthest_vertices(forest, labels, used, ends)
+
+    return trace_predecessors(predecessors, starts)
+
+
+def get_vertex_pairs(ends: np.ndarray) -> np.ndarray:
+    """
+    List all pairs of edge ends sharing a vertex.
+
+    :param ends: Vertex index of the edge ends.
+
+    :returns: n x 2 array of indices of the paired edge ends.
+    """
+    order = np.argsort(ends, kind="stable")
+    degree = np.bincount(ends)
+    last = np.repeat(np.cumsum(degree), degree)
+
+    pairs = [np.zeros((0, 2), dtype=int)]
+    for offset in range(1, int(degree.max())):
+        position = np.where(np.arange(ends.shape[0]) + offset < last)[0]
+        pairs.append(np.c_[order[position], order[position + offset]])
+
+    return np.vstack(pairs)
+
+
+def select_best_pairs(pairs: np.ndarray, n_items: int) -> np.ndarray:
+    """
+    Select pairs in order of preference, using each item at most once.
+
+    The pairs ranking first for both of their items are selected, then the
+    pairs with a selected item are removed, until no pair is left.
+
+    :param pairs: n x 2 array of item indices, in order of preference.
+    :param n_items: Total number of items.
+
+    :returns: m x 2 array of the selected pairs.
+    """
+    selected = [np.zeros((0, 2), dtype=int)]
+    while pairs.shape[0] > 0:
+        index = np.arange(pairs.shape[0])
+        best = np.full(n_items, pairs.shape[0])
+        np.minimum.at(best, pairs[:, 0], index)
+        np.minimum.at(best, pairs[:, 1], index)
+        mutual = (best[pairs[:, 0]] == index) & (best[pairs[:, 1]] == index)
+        selected.append(pairs[mutual])
+
+        used = np.zeros(n_items, dtype=bool)
+        used[pairs[mutual].flatten()] = True
+        pairs = pairs[~np.any(used[pairs], axis=1)]
+
+    return np.vstack(selected)
+
+
+def pair_straight_edges(vertices: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Pair the edges continuing most straight through their shared vertices.
+
+    At each vertex, the pairs of edges turning the least are selected first,
+    each edge end being used once. As for :func:`walk_edges`, edges turning by
+    90 degrees or more are never paired.
+
+    :param vertices: Vertices for points.
+    :param edges: n x 2 array of vertex indices for the edges.
+
+    :returns: m x 2 array of edge indices, for the paired edges.
+    """
+    ends = edges.flatten()
+    outgoing = vertices[edges[:, ::-1].flatten(), :2] - vertices[ends, :2]
+    outgoing /= np.maximum(np.linalg.norm(outgoing, axis=1), np.finfo(float).tiny)[
+        :, None
+    ]
+
+    pairs = get_vertex_pairs(ends)
+    straightness = -np.sum(outgoing[pairs[:, 0]] * outgoing[pairs[:, 1]], axis=1)
+    order = np.argsort(-straightness, kind="stable")
+    pairs = pairs[order[straightness[order] > 0]]
+
+    return select_best_pairs(pairs, ends.shape[0]) // 2
+
+
+def order_chains(
+    vertices: np.ndarray, edges: np.ndarray, chains: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Order the vertices of chains of edges, possibly sharing vertices.
+
+    :param vertices: Vertices for points.
+    :param edges: n x 2 array of vertex indices for the edges.
+    :param chains: Chain index of the edges.
+
+    :returns: Vertices of the chains, in order along each chain.
+    :returns: Chain index of the vertices.
+    """
+    n_vertices = vertices.shape[0]
+    keys, local = np.unique(chains[:, None] * n_vertices + edges, return_inverse=True)
+    path, chain_ids = get_longest_paths(
+        keys.shape[0],
+        local.reshape(edges.shape),
+        np.linalg.norm(vertices[edges[:, 0]] - vertices[edges[:, 1]], axis=1),
+    )
+
+    return keys[path] % n_vertices, chain_ids
+
+
+def get_spanning_forest(
+    vertices: np.ndarray,
+    edges: np.ndarray,
+    params: TrendLineDetectionParameters,
+) -> np.ndarray:
+    """
+    Minimum spanning forest of candidate edges.
+
+    Edges are weighted by their length, times an angle penalty controlled by
+    the damping factor.
+
+    :param vertices: Vertices for points.
+    :param edges: Candidate edges for points.
+    :param params: Trend line detection parameters.
+
+    :return: n x 2 array of vertex indices for the edges of the forest.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import minimum_spanning_tree
+
+    lengths = np.linalg.norm(vertices[edges[:, 0]] - vertices[edges[:, 1]], axis=1)
+    angles = get_edge_angles(vertices, edges, params.azimuth)
+
+    # Zero weights are treated as missing edges
+    weights = np.maximum(
+        lengths * (1.0 + angles) ** (1.0 - params.damping), np.finfo(float).eps
+    )
+    tree = minimum_spanning_tree(
+        coo_matrix(
+            (weights, (edges[:, 0], edges[:, 1])), shape=(vertices.shape[0],) * 2
+        )
+    ).tocoo()
+
+    return np.c_[tree.row, tree.col]
+
+
+def find_spanning_paths(
+    vertices: np.ndarray,
+    edges: np.ndarray,
+    params: TrendLineDetectionParameters,
+) -> list[list[list[int]]]:
+    """
+    Link points along the minimum spanning forest of the candidate edges.
+
+    The trees are split into chains, continuing as straight as possible
+    through each vertex and never turning by 90 degrees or more. Chains with
+    less than the minimum number of edges are dropped.
+
+    :param vertices: Vertices for points.
+    :param edges: Candidate edges for points.
+    :param params: Trend line detection parameters.
+
+    :return: List of curves.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    if params.damping < 0 or params.damping > 1:
+        raise ValueError("Damping must be between 0 and 1.")
+
+    if edges.shape[0] == 0:
+        return []
+
+    edges = get_spanning_forest(vertices, edges, params)
+    pairs = pair_straight_edges(vertices, edges)
+    _, chains = connected_components(
+        coo_matrix(
+            (np.ones(pairs.shape[0], dtype=bool), (pairs[:, 0], pairs[:, 1])),
+            shape=(edges.shape[0],) * 2,
+        ),
+        directed=False,
+    )
+    path, chain_ids = order_chains(vertices, edges, chains)
+    splits = np.where(np.diff(chain_ids))[0] + 1
+
+    return [
+        np.c_[chain[:-1], chain[1:]].tolist()
+        for chain in np.split(path, splits)
+        if len(chain) > params.min_edges
+    ]
+
+
 def walk_edges(  # pylint: disable=too-many-arguments
     path: list,
     incoming: list,
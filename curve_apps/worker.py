@@ -0,0 +1,386 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import shutil
+import signal
+import sys
+from dataclasses import dataclass
+from importlib import import_module
+from multiprocessing.connection import Connection
+from pathlib import Path
+from time import monotonic, sleep, time
+
+from curve_apps.batch import DRIVERS, BatchRunner
+
+
+logger = logging.getLogger(__name__)
+
+# Heavy dependencies are imported by the workers on start-up.
+# pylint: disable=import-outside-toplevel
+
+WARM_MODULES = [
+    "scipy.spatial",
+    "skimage.feature",
+    "skimage.measure",
+    "skimage.morphology",
+    "skimage.transform",
+]
+
+
+def warm_up():
+    """
+    Import the drivers and their heavy dependencies.
+    """
+    for module in sorted({module for module, _ in DRIVERS.values()}) + WARM_MODULES:
+        import_module(module)
+
+
+def worker_loop(jobs, results):
+    """
+    Run jobs from a queue until a None sentinel is received.
+
+    :param jobs: Queue of paths to ui.json files assigned to the worker.
+    :param results: Connection sending ('started' | 'done', path, status,
+        message) to the parent.
+    """
+    # Interrupts are handled by the parent, terminations end the worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    warm_up()
+
+    while (path := jobs.get()) is not None:
+        results.send(("started", path, "running", ""))
+        job = BatchRunner([path]).run()[0]
+        results.send(("done", path, job.status, job.message))
+
+
+@dataclass
+class WorkerProcess:
+    """
+    Worker process, the queue of jobs assigned to it and its result pipe.
+
+    Each worker reports on its own pipe, such that a worker terminated while
+    sending a message cannot corrupt the messages of the other workers.
+
+    :param process: Worker process.
+    :param jobs: Queue of paths to ui.json files.
+    :param results: Receiving end of the pipe of messages from the worker.
+    """
+
+    process: multiprocessing.Process
+    jobs: multiprocessing.Queue
+    results: Connection
+
+
+@dataclass
+class RunningJob:
+    """
+    Job being processed by a worker.
+
+    :param path: Path to the ui.json file.
+    :param start: Start time, from time.monotonic, or dispatch time until the
+        worker reports the job as started.
+    """
+
+    path: Path
+    start: float
+
+
+class WatchFolderWorker:
+    """
+    Process ui.json files dropped in a directory with a pool of warm workers.
+
+    New files are queued once unchanged for one polling interval, then
+    dispatched one at a time to the idle workers. Jobs writing to the same
+    geoh5 file are queued one at a time, as the file can only be opened by one
+    process. Processed files are moved to the 'done' or 'failed'
+    sub-directories. Workers exceeding the job timeout are terminated and
+    replaced, and the job of a worker exiting unexpectedly is failed.
+
+    Workers are not daemonic, such that jobs can run their own pool of
+    processes, and are stopped explicitly on shutdown.
+
+    :param directory: Directory watched for ui.json files.
+    :param workers: Number of worker processes.
+    :param queue_size: Maximum number of jobs queued but not yet started.
+    :param timeout: Maximum run time of a job in seconds.
+    :param interval: Polling interval in seconds.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        directory: str | Path,
+        workers: int = 2,
+        queue_size: int = 8,
+        timeout: float = 3600.0,
+        interval: float = 0.5,
+    ):
+        self.directory = Path(directory).resolve()
+        self.n_workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.interval = interval
+
+        self.queued: list[Path] = []
+        self.workers: dict[int, WorkerProcess] = {}
+        self.pending: dict[Path, Path | None] = {}
+        self.running: dict[int, RunningJob] = {}
+        self.history: dict[Path, str] = {}
+        self.stopping = False
+
+    def start_worker(self):
+        """
+        Start a new worker process.
+        """
+        jobs: multiprocessing.Queue = multiprocessing.Queue()
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=worker_loop, args=(jobs, sender), daemon=False
+        )
+        process.start()
+
+        # Only the worker holds the sending end, closed when it exits
+        sender.close()
+
+        if process.pid is None:
+            raise RuntimeError("Worker process failed to start.")
+
+        self.workers[process.pid] = WorkerProcess(process, jobs, receiver)
+
+    def stop(self, *_):
+        """
+        Stop accepting new jobs and shut down once running jobs are done.
+        """
+        if not self.stopping:
+            logger.info("Shutting down, waiting for %s jobs.", len(self.pending))
+        self.stopping = True
+
+    def scan(self) -> list[Path]:
+        """
+        List new ui.json files, unchanged for one polling interval.
+        """
+        now = time()
+        files = [
+            path
+            for path in self.directory.glob("*.ui.json")
+            if path not in self.pending and now - path.stat().st_mtime > self.interval
+        ]
+
+        return sorted(files, key=lambda path: path.stat().st_mtime)
+
+    @staticmethod
+    def get_geoh5(path: Path) -> Path | None:
+        """
+        Target geoh5 file of a job, relative to the ui.json file.
+
+        :param path: Path to the ui.json file.
+        """
+        try:
+            with open(path, encoding="utf-8") as file:
+                geoh5 = json.load(file).get("geoh5")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+        return (path.parent / geoh5).resolve() if geoh5 else None
+
+    def submit(self):
+        """
+        Queue new files, up to the queue size.
+        """
+        for path in self.scan():
+            if len(self.queued) >= self.queue_size:
+                break
+
+            geoh5 = self.get_geoh5(path)
+            if geoh5 is not None and geoh5 in self.pending.values():
+                continue
+
+            logger.info("Queued %s", path.name)
+            self.queued.append(path)
+            self.pending[path] = geoh5
+
+    def dispatch(self):
+        """
+        Assign the queued jobs to the idle workers.
+        """
+        for pid, worker in self.workers.items():
+            if not self.queued:
+                return
+
+            if pid not in self.running:
+                path = self.queued.pop(0)
+                self.running[pid] = RunningJob(path, monotonic())
+                worker.jobs.put(path)
+
+    def finish(self, path: Path, status: str, message: str = ""):
+        """
+        Move a processed file to the 'done' or 'failed' directory.
+
+        :param path: Path to the ui.json file.
+        :param status: Status of the job.
+        :param message: Error message of failed jobs.
+        """
+        self.pending.pop(path, None)
+        self.history[path] = status
+        folder = self.directory / ("done" if status == "success" else "failed")
+        folder.mkdir(exist_ok=True)
+
+        if path.is_file():
+            shutil.move(path, folder / path.name)
+
+        if status == "success":
+            logger.info("Completed %s", path.name)
+        else:
+            logger.warning("Failed %s %s", path.name, message)
+
+    def receive(self, pid: int, worker: WorkerProcess):
+        """
+        Process the messages sent by a worker.
+
+        Reading stops once the pipe is empty, or closed by a worker that
+        exited, possibly in the middle of a message.
+
+        :param pid: Process identifier of the worker.
+        :param worker: Worker process.
+        """
+        while True:
+            try:
+                if not worker.results.poll():
+                    return
+                event, path, status, message = worker.results.recv()
+            except (EOFError, OSError):
+                return
+
+            if event == "started":
+                self.running[pid] = RunningJob(path, monotonic())
+            else:
+                self.running.pop(pid, None)
+                self.finish(path, status, message)
+
+    def collect(self):
+        """
+        Process the messages from the workers.
+        """
+        for pid, worker in self.workers.items():
+            self.receive(pid, worker)
+
+    def supervise(self):
+        """
+        Replace the workers that timed out or died.
+        """
+        for pid, worker in list(self.workers.items()):
+            job = self.running.get(pid)
+            timed_out = job is not None and monotonic() - job.start > self.timeout
+
+            if timed_out:
+                worker.process.terminate()
+                worker.process.join()
+
+            if worker.process.is_alive():
+                continue
+
+            # Messages sent in full before the worker exited are still valid
+            self.receive(pid, worker)
+            worker.results.close()
+            job = self.running.get(pid)
+
+            del self.workers[pid]
+            if job is not None:
+                del self.running[pid]
+                reason = "timed out" if timed_out else "worker died"
+                self.finish(job.path, "failed", f"({reason})")
+
+            if not self.stopping:
+                self.start_worker()
+
+    def serve(self, idle_exit: bool = False):
+        """
+        Watch the directory until interrupted.
+
+        :param idle_exit: Stop once all jobs found in the directory are done.
+        """
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        try:
+            for _ in range(self.n_workers):
+                self.start_worker()
+
+            logger.info(
+                "Watching %s with %s workers.", self.directory, len(self.workers)
+            )
+            while not self.stopping or self.pending:
+                self.collect()
+                self.supervise()
+
+                if not self.stopping:
+                    self.submit()
+                    idle = not self.pending and not any(
+                        self.directory.glob("*.ui.json")
+                    )
+                    if idle_exit and idle:
+                        self.stop()
+
+                if not self.workers:
+                    break
+
+                self.dispatch()
+                sleep(self.interval / 5)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """
+        Stop the workers, once their current job is done.
+        """
+        for worker in self.workers.values():
+            worker.jobs.put(None)
+        for worker in self.workers.values():
+            worker.process.join(timeout=self.timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.results.close()
+
+        self.workers = {}
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line interface of the worker.
+
+    :param args: Command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Watch a directory for ui.json jobs.")
+    parser.add_argument("directory", help="Directory watched for ui.json files.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=3600.0)
+    parser.add_argument("--interval", type=float, default=0.5)
+    options = parser.parse_args(args)
+
+    WatchFolderWorker(
+        options.directory,
+        workers=options.workers,
+        queue_size=options.queue_size,
+        timeout=options.timeout,
+        interval=options.interval,
+    ).serve()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
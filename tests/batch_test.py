@@ -0,0 +1,121 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import json
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from geoh5py import Workspace
+from geoh5py.ui_json import InputFile
+
+from curve_apps import assets_path
+from curve_apps.batch import BatchRunner, get_driver_class
+from curve_apps.edges.driver import EdgesDriver
+
+from .edge_detection_run_test import setup_example
+
+
+def write_edge_job(workspace, grid, data, path: Path, name: str):
+    ifile = InputFile.read_ui_json(
+        assets_path() / "uijson/edge_detection.ui.json", validate=False
+    )
+    changes = {
+        "geoh5": workspace,
+        "objects": grid,
+        "data": data,
+        "line_length": 12,
+        "sigma": 1.0,
+        "export_as": name,
+    }
+    for key, value in changes.items():
+        ifile.set_data_value(key, value)
+
+    ifile.write_ui_json(name, str(path))
+
+
+def test_batch_runner(tmp_path: Path):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    workspace = Workspace.create(tmp_path / "batch.geoh5")
+    grid, data = setup_example(workspace)
+
+    with workspace.open():
+        for name in ["first", "second"]:
+            write_edge_job(workspace, grid, data, jobs, name)
+
+    with open(jobs / "first.ui.json", encoding="utf-8") as file:
+        ui_json = json.load(file)
+
+    ui_json["geoh5"] = str(tmp_path / "missing.geoh5")
+    with open(jobs / "missing.ui.json", "w", encoding="utf-8") as file:
+        json.dump(ui_json, file)
+
+    runner = BatchRunner([jobs])
+    assert len(runner.group_jobs()) == 2
+
+    status = {job.path.name: job.status for job in runner.run()}
+
+    assert status == {
+        "first.ui.json": "success",
+        "missing.ui.json": "failed",
+        "second.ui.json": "success",
+    }
+    assert "2/3 jobs completed successfully." in runner.summary()
+
+    with workspace.open():
+        for name in ["first", "second"]:
+            assert len(workspace.get_entity(name)) == 1
+
+
+def test_get_driver_class():
+    assert get_driver_class("curve_apps.edges.driver") is EdgesDriver
+
+    with pytest.raises(ValueError, match="No curve_apps driver"):
+        get_driver_class("other_app.driver")
+
+
+def test_batch_runner_workers(tmp_path: Path):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    workspace = Workspace.create(tmp_path / "batch.geoh5")
+    grid, data = setup_example(workspace)
+
+    with workspace.open():
+        for name in ["first", "second", "third"]:
+            write_edge_job(workspace, grid, data, jobs, name)
+
+    with open(jobs / "first.ui.json", encoding="utf-8") as file:
+        ui_json = json.load(file)
+
+    ui_json["run_command"] = "other_app.driver"
+    with open(jobs / "unknown.ui.json", "w", encoding="utf-8") as file:
+        json.dump(ui_json, file)
+
+    runner = BatchRunner([jobs], workers=2)
+    start = perf_counter()
+    status = {job.path.name: job.status for job in runner.run()}
+    elapsed = perf_counter() - start
+
+    # Each job reports its own compute and write time
+    durations = [job.duration for job in runner.jobs if job.status == "success"]
+    assert all(0 < duration < elapsed for duration in durations)
+    assert len(set(durations)) == 3
+
+    assert status == {
+        "first.ui.json": "success",
+        "second.ui.json": "success",
+        "third.ui.json": "success",
+        "unknown.ui.json": "failed",
+    }
+
+    with workspace.open():
+        for name in ["first", "second", "third"]:
+            assert len(workspace.get_entity(name)) == 1
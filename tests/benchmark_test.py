@@ -0,0 +1,87 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import json
+
+import numpy as np
+from geoh5py import Workspace
+
+from curve_apps.benchmark import BENCHMARKS, compare, main, make_picks, run_benchmarks
+
+
+def test_make_picks(tmp_path):
+    with Workspace.create(tmp_path / "picks.geoh5") as workspace:
+        curve, data = make_picks(workspace, 5, n_lines=10)
+        other, _ = make_picks(workspace, 5, n_lines=10)
+
+        assert curve.n_vertices == 50
+        assert len(np.unique(curve.parts)) == 10
+        assert np.allclose(curve.vertices, other.vertices)
+        assert set(np.unique(data.values)) <= {1, 2, 3}
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(["get_contours", "find_curves"], scale=0.1, repeat=2)
+
+    assert set(results["results"]) == {
+        "get_contours[25]",
+        "get_contours[51]",
+        "get_contours[102]",
+        "find_curves[2]",
+        "find_curves[8]",
+        "find_curves[32]",
+    }
+    for result in results["results"].values():
+        assert result["repeat"] == 2
+        assert 0 < result["min"] <= result["median"]
+
+
+def test_driver_benchmarks(tmp_path):
+    for name, size in [
+        ("contours_driver", 400),
+        ("edges_driver", 64),
+        ("trend_lines_driver", 5),
+    ]:
+        with Workspace.create(tmp_path / f"{name}.geoh5") as workspace:
+            n_objects = len(workspace.objects)
+            func = BENCHMARKS[name].setup(workspace, size, 0)
+            func()
+            func()
+
+            # Repeated calls do not write to the workspace
+            assert len(workspace.objects) == n_objects + 1
+            assert not list(tmp_path.glob("*_metrics.json"))
+
+            # Write benchmarks add a curve per call
+            func = BENCHMARKS[name.replace("driver", "write")].setup(workspace, size, 0)
+            n_objects = len(workspace.objects)
+            func()
+            func()
+
+            assert len(workspace.objects) == n_objects + 2
+
+
+def test_compare(tmp_path):
+    baseline = {"results": {"a[1]": {"min": 1.0}, "b[1]": {"min": 1.0}}}
+    current = {
+        "results": {"a[1]": {"min": 1.1}, "b[1]": {"min": 2.0}, "c[1]": {"min": 1.0}}
+    }
+
+    regressions = compare(current, baseline, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b[1]")
+
+    for name, content in [("current", current), ("baseline", baseline)]:
+        with open(tmp_path / f"{name}.json", "w", encoding="utf-8") as file:
+            json.dump(content, file)
+
+    args = ["compare", str(tmp_path / "current.json"), str(tmp_path / "baseline.json")]
+    assert main(args) == 1
+    assert main([*args, "--threshold", "1.5"]) == 0
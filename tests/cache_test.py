@@ -0,0 +1,69 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import os
+
+import numpy as np
+from geoh5py import Workspace
+from geoh5py.objects import Curve, Points
+
+from curve_apps.cache import ResultCache, fingerprint
+from curve_apps.driver import CurvePayload
+from curve_apps.edges.options import EdgeDetectionParameters
+
+
+def test_fingerprint(tmp_path):
+    with Workspace.create(tmp_path / "test.geoh5") as workspace:
+        vertices = np.random.randn(10, 3)
+        points = Points.create(workspace, vertices=vertices)
+        copy = Points.create(workspace, vertices=vertices)
+        other = Points.create(workspace, vertices=vertices + 1.0)
+
+        detection = EdgeDetectionParameters(sigma=2.0)
+        key = fingerprint(points, detection)
+
+        assert fingerprint(copy, EdgeDetectionParameters(sigma=2.0)) == key
+        assert fingerprint(other, detection) != key
+        assert fingerprint(points, EdgeDetectionParameters(sigma=1.0)) != key
+        assert fingerprint(np.arange(3)) != fingerprint(np.arange(3.0))
+
+        # Curves are also hashed from their cells
+        line = Curve.create(workspace, vertices=vertices, cells=[[0, 1], [1, 2]])
+        other = Curve.create(workspace, vertices=vertices, cells=[[0, 1], [2, 3]])
+        assert fingerprint(line) != fingerprint(other)
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_size=0.06)
+    payload = CurvePayload(
+        vertices=np.random.randn(500, 3),
+        cells=np.c_[np.arange(499), np.arange(1, 500)],
+        values={"values": np.arange(500.0)},
+    )
+
+    assert cache.get("first") is None
+
+    cache.put("first", payload.to_arrays())
+    loaded = CurvePayload.from_arrays(cache.get("first"))
+
+    assert np.all(loaded.vertices == payload.vertices)
+    assert np.all(loaded.cells == payload.cells)
+    assert np.all(loaded.values["values"] == payload.values["values"])
+
+    # Reading the oldest entry makes it the most recently used
+    cache.put("second", payload.to_arrays())
+    os.utime(cache.path("first"), (0, 0))
+    os.utime(cache.path("second"), (1, 1))
+    cache.get("first")
+    cache.put("third", payload.to_arrays())
+
+    assert cache.path("first").is_file()
+    assert not cache.path("second").is_file()
+    assert cache.path("third").is_file()
@@ -7,13 +7,18 @@
 #  (see LICENSE file at the root of this source code package).                 '
 #                                                                              '
 # ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+import json
+
 import numpy as np
+import pytest
 from geoh5py import Workspace
-from geoh5py.objects import Points
+from geoh5py.groups import UIJsonGroup
+from geoh5py.objects import Grid2D, Points
 
 from curve_apps.contours.driver import ContoursDriver
 from curve_apps.contours.options import ContourParameters
-from curve_apps.utils import image_to_grid_coordinate_transfer
+from curve_apps.driver import run_concurrently
+from curve_apps.utils import image_to_grid_coordinate_transfer, interp_to_grid
 
 
 def get_contour_data(tmp_path):
@@ -51,6 +56,360 @@ def test_driver(tmp_path):
         distances = np.linalg.norm(curve.vertices[:, :2], axis=1)
         assert np.allclose(distances, np.ones(len(distances)), atol=1e-2)
 
+    with open(tmp_path / "test_my curve_metrics.json", encoding="utf-8") as file:
+        metrics = json.load(file)
+
+    assert metrics["driver"] == "ContoursDriver"
+    assert {"make_curve", "interp_to_grid", "get_contours", "write"} <= set(
+        metrics["stages"]
+    )
+    assert metrics["counters"]["levels"] == 1
+    assert metrics["counters"]["vertices_out"] == len(distances)
+    assert metrics["counters"]["bytes_written"] > 0
+
+
+@pytest.mark.parametrize("method", ["linear", "cubic"])
+def test_gridding_method(tmp_path, method: str):
+    params = get_contour_data(tmp_path)
+    params.detection.gridding_method = method
+    ContoursDriver(params).run()
+
+    with params.geoh5.open():
+        curve = params.geoh5.get_entity("my curve")[0]
+        distances = np.linalg.norm(curve.vertices[:, :2], axis=1)
+        assert np.allclose(distances, np.ones(len(distances)), atol=1e-2)
+
+
+def test_metrics_out_group(tmp_path):
+    params = get_contour_data(tmp_path)
+    with params.geoh5.open():
+        group = UIJsonGroup.create(params.geoh5, name="contours")
+        params = ContourParameters.build(
+            geoh5=params.geoh5,
+            objects=params.source.objects,
+            data=params.source.data,
+            fixed_contours=[0.0],
+            resolution=np.pi / 200,
+            max_distance=np.pi / 80,
+            export_as="my curve",
+            out_group=group,
+        )
+
+    ContoursDriver(params).run()
+
+    with params.geoh5.open():
+        group = params.geoh5.get_entity("contours")[0]
+        files = [child.name for child in group.children if hasattr(child, "file_name")]
+        assert "test_my curve_metrics.json" in files
+
+
+def test_track_memory(tmp_path):
+    params = get_contour_data(tmp_path)
+    params = ContourParameters.build(
+        geoh5=params.geoh5,
+        objects=params.source.objects,
+        data=params.source.data,
+        fixed_contours=[0.0],
+        resolution=np.pi / 200,
+        max_distance=np.pi / 80,
+        export_as="my curve",
+        track_memory=True,
+    )
+    assert params.diagnostics.track_memory
+
+    ContoursDriver(params).run()
+
+    with open(tmp_path / "test_my curve_metrics.json", encoding="utf-8") as file:
+        metrics = json.load(file)
+
+    for name in ["interp_to_grid", "get_contours", "write"]:
+        assert metrics["stages"][name]["traced_peak"] > 0
+
+
+def test_profile(tmp_path, monkeypatch):
+    params = get_contour_data(tmp_path)
+    monitoring = tmp_path / "monitoring"
+    monitoring.mkdir()
+    params = ContourParameters.build(
+        geoh5=params.geoh5,
+        objects=params.source.objects,
+        data=params.source.data,
+        fixed_contours=[0.0],
+        resolution=np.pi / 200,
+        max_distance=np.pi / 80,
+        export_as="my curve",
+        monitoring_directory=str(monitoring),
+        profile=True,
+        profile_top=5,
+    )
+
+    monkeypatch.setenv("CURVE_APPS_PROFILE", "0")
+    ContoursDriver(params).run()
+    assert not list(monitoring.glob("*_profile.*"))
+
+    monkeypatch.delenv("CURVE_APPS_PROFILE")
+    ContoursDriver(params).run()
+
+    assert (monitoring / "test_my curve_profile.pstats").is_file()
+    summary = (monitoring / "test_my curve_profile.txt").read_text(encoding="utf-8")
+    assert "make_curve" in summary
+
+
+def test_result_cache(tmp_path):
+    params = get_contour_data(tmp_path)
+    cache_directory = tmp_path / "cache"
+
+    curves = []
+    for name in ["first", "second"]:
+        params = ContourParameters.build(
+            geoh5=params.geoh5,
+            objects=params.source.objects,
+            data=params.source.data,
+            fixed_contours=[0.0],
+            resolution=np.pi / 200,
+            max_distance=np.pi / 80,
+            export_as=name,
+            use_cache=True,
+            cache_directory=cache_directory,
+        )
+        driver = ContoursDriver(params)
+        driver.run()
+        curves.append(driver.params.geoh5.get_entity(name)[0])
+
+    assert driver.metrics.counters["cache_hits"] == 1
+    assert "get_contours" not in driver.metrics.stages
+    assert len(list(cache_directory.glob("*.npz"))) == 1
+
+    with params.geoh5.open():
+        first, second = (params.geoh5.get_entity(curve.uid)[0] for curve in curves)
+        assert np.allclose(first.vertices, second.vertices)
+        assert np.all(first.cells == second.cells)
+        assert np.allclose(
+            first.get_data("my data")[0].values, second.get_data("my data")[0].values
+        )
+
+        # Parameters read by the computation change the key
+        single = params.model_copy(update={"precision": "single"})
+        assert ContoursDriver(single).fingerprint() != driver.fingerprint()
+
+
+def test_dry_run(tmp_path):
+    params = get_contour_data(tmp_path)
+    params = ContourParameters.build(
+        geoh5=params.geoh5,
+        objects=params.source.objects,
+        data=params.source.data,
+        interval_min=-0.5,
+        interval_max=0.5,
+        interval_spacing=0.25,
+        resolution=np.pi / 200,
+        max_distance=np.pi / 80,
+        export_as="my curve",
+        dry_run=True,
+    )
+    driver = ContoursDriver(params)
+    estimate = driver.dry_run()
+    driver.run()
+
+    with params.geoh5.open():
+        grid, _ = interp_to_grid(
+            params.source.objects,
+            params.source.data.values,
+            params.detection.resolution,
+            params.detection.max_distance,
+        )
+        assert params.geoh5.get_entity("my curve") == [None]
+
+    assert estimate["grid_shape"] == (len(grid[0]), len(grid[1]))
+    assert estimate["levels"] == 5
+    assert estimate["source_values"] == 99 * 101
+    assert set(estimate["stages"]) == {"interp_to_grid", "get_contours"}
+    assert estimate["runtime"] > 0
+    assert estimate["peak_memory"] > 0
+    assert not list(tmp_path.glob("*_metrics.json"))
+
+
+def test_dry_run_unknown_size(tmp_path, monkeypatch):
+    params = get_contour_data(tmp_path)
+    params = ContourParameters.build(
+        geoh5=params.geoh5,
+        objects=params.source.objects,
+        data=params.source.data,
+        fixed_contours=[0.0],
+        resolution=np.pi / 200,
+        dry_run=True,
+    )
+
+    # Data without an expected number of values, e.g. of unknown association
+    monkeypatch.setattr(
+        type(params.source.data), "n_values", property(lambda self: None)
+    )
+    estimate = ContoursDriver(params).dry_run()
+
+    assert estimate["source_values"] is None
+    assert estimate["peak_memory"] > 0
+
+
+def test_run_concurrently(tmp_path):
+    params = get_contour_data(tmp_path)
+    drivers = [ContoursDriver(params)]
+    for name, contours in [("second curve", [0.5]), ("third curve", [1.0])]:
+        drivers.append(
+            ContoursDriver(
+                ContourParameters.build(
+                    geoh5=params.geoh5,
+                    objects=params.source.objects,
+                    data=params.source.data,
+                    fixed_contours=contours,
+                    resolution=np.pi / 200,
+                    max_distance=np.pi / 80,
+                    export_as=name,
+                )
+            )
+        )
+
+    curves = run_concurrently(drivers, workers=2)
+
+    with params.geoh5.open():
+        for curve, level in zip(curves, [0.0, 0.5, 1.0], strict=True):
+            curve = params.geoh5.get_entity(curve.uid)[0]
+            distances = np.linalg.norm(curve.vertices[:, :2], axis=1)
+            assert np.allclose(distances, np.sqrt(1 + level), atol=1e-2)
+
+    for name in ["my curve", "second curve", "third curve"]:
+        assert (tmp_path / f"test_{name}_metrics.json").is_file()
+
+
+def test_compact_polylines(tmp_path):
+    params = get_contour_data(tmp_path)
+    params = ContourParameters.build(
+        geoh5=params.geoh5,
+        objects=params.source.objects,
+        data=params.source.data,
+        fixed_contours=[0.0, 0.5],
+        resolution=np.pi / 200,
+        max_distance=np.pi / 80,
+        export_as="compact",
+    )
+    driver = ContoursDriver(params)
+    with params.geoh5.open():
+        payload = driver.compute()
+
+    # Two closed circles, sharing their first and last vertices
+    np.testing.assert_array_equal(payload.values["values"], [0.0, 0.5])
+    assert payload.vertices.shape[1] == 2
+    assert len(payload.offsets) == 3
+    assert len(payload.cells) == len(payload.vertices)
+    end = payload.offsets[1]
+    np.testing.assert_array_equal(payload.cells[end - 1], [end - 1, 0])
+    np.testing.assert_allclose(
+        np.linalg.norm(payload.locations, axis=1),
+        np.sqrt(1.0 + payload.vertex_values("values")),
+        atol=1e-2,
+    )
+
+    driver.run()
+    with params.geoh5.open():
+        curve = params.geoh5.get_entity("compact")[0]
+        assert len(np.unique(curve.parts)) == 2
+        assert len(curve.vertices) == len(payload.vertices)
+        values = curve.get_data(params.source.data.name)[0].values
+        np.testing.assert_allclose(values, payload.vertex_values("values"))
+
+
+def test_smoothing(tmp_path):
+    ws = Workspace(tmp_path / "test.geoh5")
+    grid = Grid2D.create(
+        ws, origin=[0, 0, 0], u_cell_size=2.0, v_cell_size=4.0, u_count=200, v_count=100
+    )
+    locations = grid.centroids[:, :2] - [200.0, 200.0]
+    values = np.linalg.norm(locations, axis=1) + np.random.default_rng(0).normal(
+        scale=5.0, size=grid.n_cells
+    )
+    values[:2000] = np.nan
+    data = grid.add_data({"noisy": {"values": values}})
+
+    counts = {}
+    for smoothing in [None, 20.0]:
+        params = ContourParameters.build(
+            geoh5=ws,
+            objects=grid,
+            data=data,
+            fixed_contours=[100.0, 150.0],
+            smoothing=smoothing,
+            export_as=f"smoothing {smoothing}",
+        )
+        driver = ContoursDriver(params)
+        payload = driver.compute()
+        counts[smoothing] = len(np.unique(payload.cells))
+
+    assert "smooth_grid" in driver.metrics.stages
+    assert counts[20.0] < counts[None] / 2
+    assert set(driver.dry_run()["stages"]) == {"smooth_grid", "get_contours"}
+
+
+def get_far_contours(tmp_path, source: str, precision: str):
+    """Contours of the distance to a center, far from the coordinate origin."""
+    ws = Workspace(tmp_path / f"{source}_{precision}.geoh5")
+    center = np.r_[512345.6, 7012345.6]
+
+    if source == "grid":
+        entity = Grid2D.create(
+            ws,
+            origin=[center[0] - 300.0, center[1] - 200.0, 0.0],
+            u_cell_size=5.0,
+            v_cell_size=5.0,
+            u_count=120,
+            v_count=90,
+            rotation=30.0,
+        )
+        locations = entity.centroids
+        center = locations[:, :2].mean(axis=0)
+    else:
+        x, y = np.meshgrid(np.linspace(-400, 400, 81), np.linspace(-400, 400, 81))
+        locations = np.c_[x.flatten() + center[0], y.flatten() + center[1]]
+        entity = Points.create(ws, vertices=np.c_[locations, np.zeros(len(x.flat))])
+
+    distances = np.linalg.norm(locations[:, :2] - center, axis=1)
+    data = entity.add_data({"distance": {"values": distances}})
+
+    params = ContourParameters.build(
+        geoh5=ws,
+        objects=entity,
+        data=data,
+        fixed_contours=[100.0, 150.0],
+        resolution=10.0,
+        max_distance=50.0,
+        export_as="rings",
+        precision=precision,
+    )
+    driver = ContoursDriver(params)
+    with ws.open():
+        payload = driver.compute()
+
+    return payload, center
+
+
+def test_single_precision(tmp_path):
+    """
+    Contours computed in single precision, relative to a local origin, match
+    those in double precision within 1e-3 m for coordinates of ~1e7 m.
+    """
+    for source in ["grid", "points"]:
+        double, center = get_far_contours(tmp_path, source, "double")
+        single, _ = get_far_contours(tmp_path, source, "single")
+
+        assert single.vertices.dtype == np.float32
+        assert single.values["values"].dtype == np.float32
+        assert double.vertices.dtype == np.float64
+        assert single.vertices.shape == double.vertices.shape
+        np.testing.assert_array_equal(single.cells, double.cells)
+        np.testing.assert_allclose(single.locations, double.locations, atol=1e-3)
+
+        if source == "points":
+            radius = np.linalg.norm(single.locations[:, :2] - center, axis=1)
+            np.testing.assert_allclose(radius, single.vertex_values("values"), atol=5.0)
+
 
 def test_image_to_grid():
     x = np.linspace(0, 10, 21)
@@ -0,0 +1,102 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import json
+import tracemalloc
+from contextlib import ExitStack
+
+import numpy as np
+import pytest
+
+from curve_apps import diagnostics
+from curve_apps.diagnostics import RunMetrics, peak_rss
+
+
+def test_run_metrics(tmp_path):
+    metrics = RunMetrics()
+
+    for _ in range(3):
+        with metrics.stage("loop"):
+            metrics.count("items", np.int64(2))
+
+    with pytest.raises(ValueError), metrics.stage("failing"):
+        raise ValueError("Stage failed.")
+
+    assert metrics.stages["loop"]["calls"] == 3
+    assert metrics.stages["failing"]["calls"] == 1
+    assert metrics.counters["items"] == 6
+    assert "loop" in metrics.summary()
+
+    path = metrics.write(tmp_path / "metrics.json", driver="test")
+    with open(path, encoding="utf-8") as file:
+        content = json.load(file)
+
+    assert content["driver"] == "test"
+    assert content["counters"] == {"items": 6}
+    assert content["stages"]["loop"]["time"] >= 0
+
+
+def test_memory_tracking():
+    metrics = RunMetrics(track_memory=True, memory_budget=1.0)
+
+    with metrics.stage("outer"):
+        with pytest.warns(UserWarning, match="'inner' used"):
+            with metrics.stage("inner"):
+                array = np.ones(int(1e6))
+        del array
+
+        with metrics.stage("small"):
+            np.ones(10)
+
+    assert metrics.stages["inner"]["traced_peak"] >= 8.0
+    assert metrics.stages["small"]["traced_peak"] < 1.0
+    assert metrics.stages["outer"]["traced_peak"] >= 8.0
+    assert "MB traced" in metrics.summary()
+
+    if peak_rss() is not None:
+        assert metrics.stages["inner"]["rss_high_water"] > 0
+        assert 0 <= metrics.stages["small"]["rss_increase"] < 1.0
+        assert (
+            metrics.stages["outer"]["rss_increase"]
+            >= metrics.stages["inner"]["rss_increase"]
+        )
+
+
+def test_memory_tracking_overlapping_runs(monkeypatch):
+    first, second = RunMetrics(track_memory=True), RunMetrics(track_memory=True)
+
+    with ExitStack() as stack:
+        with first.stage("outer"):
+            stack.enter_context(second.stage("inner"))
+            array = np.ones(int(1e6))
+            del array
+
+        # The end of the first run neither stops tracing nor resets the peak
+        assert tracemalloc.is_tracing()
+
+    assert not tracemalloc.is_tracing()
+    assert second.stages["inner"]["traced_peak"] >= 8.0
+
+    # Missing RSS values are reported as such
+    monkeypatch.setattr(diagnostics, "peak_rss", lambda: None)
+    with first.stage("unavailable"):
+        pass
+
+    assert "rss_increase" not in first.stages["unavailable"]
+    assert "(RSS unavailable)" in first.summary()
+
+
+def test_memory_tracking_off():
+    metrics = RunMetrics()
+
+    with metrics.stage("loop"):
+        np.ones(int(1e6))
+
+    assert "traced_peak" not in metrics.stages["loop"]
@@ -0,0 +1,69 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import numpy as np
+from geoh5py import Workspace
+from geoh5py.groups import ContainerGroup
+from geoh5py.objects import Points
+
+from curve_apps.driver import CurveBuffer, CurveOutput
+
+
+def test_curve_output(tmp_path):
+    h5file = tmp_path / "test.geoh5"
+    vertices = np.random.randn(10, 3)
+    cells = np.c_[np.arange(9), np.arange(1, 10)]
+
+    with Workspace.create(h5file) as workspace:
+        points = Points.create(workspace, vertices=vertices)
+        points.add_data({"values": {"values": np.ones(10)}})
+        group = ContainerGroup.create(workspace, name="outputs")
+
+        output = CurveOutput(
+            workspace, name="curve", vertices=vertices, cells=cells, parent=group
+        )
+        output.add_data(
+            {
+                "on vertices": {"values": np.arange(10.0)},
+                "on cells": {"values": np.arange(9.0), "association": "CELL"},
+            }
+        )
+        output.add_data({"values": {"values": np.zeros(10)}}, points)
+        curve = output.write()
+
+    with Workspace(h5file) as workspace:
+        curve = workspace.get_entity(curve.uid)[0]
+        assert curve.parent.name == "outputs"
+        assert np.allclose(curve.vertices, vertices)
+        assert np.all(curve.cells == cells)
+        assert curve.get_data("on cells")[0].association.name == "CELL"
+        assert np.allclose(curve.get_data("on vertices")[0].values, np.arange(10.0))
+
+        points = workspace.get_entity(points.uid)[0]
+        assert np.allclose(points.get_data("values(1)")[0].values, 0.0)
+
+
+def test_curve_buffer():
+    buffer = CurveBuffer(dim=2, capacity=4)
+    chunks = [np.random.randn(n, 2) for n in [3, 5, 2]]
+
+    for value, vertices in enumerate(chunks):
+        cells = np.c_[np.arange(len(vertices) - 1), np.arange(1, len(vertices))]
+        buffer.append(vertices, cells, {"values": float(value)})
+
+    assert buffer.n_vertices == 10
+    assert buffer.n_cells == 7
+    assert np.allclose(buffer.vertices, np.vstack(chunks))
+    assert np.all(buffer.cells[2:6] == np.c_[np.arange(3, 7), np.arange(4, 8)])
+    assert np.all(buffer.values["values"] == np.repeat([0.0, 1.0, 2.0], [3, 5, 2]))
+
+    payload = buffer.to_payload()
+    assert payload.cells.dtype == np.uint32
+    assert len(payload.values["values"]) == 10
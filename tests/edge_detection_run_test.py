@@ -10,8 +10,9 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 from geoh5py import Workspace
-from geoh5py.objects import Grid2D
+from geoh5py.objects import Grid2D, Points
 from geoh5py.ui_json import InputFile
 
 from curve_apps import assets_path
@@ -94,6 +95,76 @@ def test_window_size(tmp_path: Path):
         assert len(edges.cells) == 22  # type: ignore
 
 
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_window_size_parallel(tmp_path: Path, backend: str):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    grid, data = setup_example(workspace)
+    params = EdgeParameters.build(
+        {
+            "geoh5": workspace,
+            "objects": grid,
+            "data": data,
+            "line_length": 4,
+            "line_gap": 1,
+            "sigma": 1,
+            "window_size": 32,
+            "export_as": "square_32",
+            "workers": 2,
+            "parallel_backend": backend,
+        }
+    )
+    assert params.execution.parallel
+
+    driver = EdgesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+
+    with workspace.open():
+        edges = workspace.get_entity("square_32")[0]
+
+        assert len(edges.cells) == 22  # type: ignore
+
+
+def test_single_precision(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    grid, data = setup_example(workspace)
+    payloads = {}
+    for precision in ["double", "single"]:
+        params = EdgeParameters.build(
+            {
+                "geoh5": workspace,
+                "objects": grid,
+                "data": data,
+                "line_length": 12,
+                "line_gap": 1,
+                "sigma": 1,
+                "precision": precision,
+                "auxiliary_output": "full",
+            }
+        )
+        with workspace.open():
+            payload = EdgesDriver(params).compute()
+
+        payloads[precision] = payload
+        assert len(payload.cells) == 4
+
+    # Rounding only flips pixels on the edge of the quantile thresholds
+    canny = {key: payload.values["canny filter"] for key, payload in payloads.items()}
+    assert canny["single"].dtype == np.float32
+    assert np.mean(~np.isclose(canny["single"], canny["double"], equal_nan=True)) < 0.01
+
+    # Vertices are held relative to the lower corner of the grid
+    assert payloads["single"].vertices.dtype == np.float32
+    np.testing.assert_allclose(
+        payloads["single"].origin[:2], grid.locations[:, :2].min(axis=0)
+    )
+    np.testing.assert_allclose(
+        payloads["single"].locations, payloads["double"].locations, atol=1e-3
+    )
+
+
 def test_merge_length(tmp_path: Path):
     workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
 
@@ -118,7 +189,10 @@ def test_merge_length(tmp_path: Path):
     with workspace.open():
         edges = workspace.get_entity("square")[0]
 
-        assert len(np.unique(edges.parts)) == 2  # type: ignore
+        # Corners are welded into a single closed square
+        assert len(edges.vertices) == 4  # type: ignore
+        assert len(edges.cells) == 4  # type: ignore
+        assert np.all(np.bincount(edges.cells.flatten()) == 2)  # type: ignore
 
 
 def test_input_file(tmp_path: Path):
@@ -149,3 +223,200 @@ def test_input_file(tmp_path: Path):
     with workspace.open():
         edges = workspace.get_entity("square")[0]
         assert edges is not None
+
+
+def test_fuse_angle(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    grid, data = setup_example(workspace)
+    n_cells = {}
+    for fuse_angle in [None, 5.0]:
+        params = EdgeParameters.build(
+            **{
+                "geoh5": workspace,
+                "objects": grid,
+                "data": data,
+                "line_length": 4,
+                "line_gap": 1,
+                "sigma": 1,
+                "window_size": 32,
+                "merge_length": 10.0,
+                "fuse_angle": fuse_angle,
+                "export_as": f"fused_{fuse_angle}",
+            }
+        )
+        driver = EdgesDriver(params)
+        with workspace.open(mode="r+"):
+            driver.run()
+
+        with workspace.open():
+            edges = workspace.get_entity(f"fused_{fuse_angle}")[0]
+            lengths = edges.get_data("lengths")[0].values
+            assert np.all(lengths[~np.isnan(lengths)] > 0)  # type: ignore
+            n_cells[fuse_angle] = len(edges.cells)  # type: ignore
+
+    assert n_cells[5.0] < n_cells[None]
+
+
+def test_skeleton_engine(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    grid, data = setup_example(workspace)
+    params = EdgeParameters.build(
+        **{
+            "geoh5": workspace,
+            "objects": grid,
+            "data": data,
+            "engine": "skeleton",
+            "line_length": 12,
+            "tolerance": 1.0,
+            "sigma": 1,
+            "export_as": "square",
+        }
+    )
+
+    driver = EdgesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+
+    with workspace.open():
+        edges = workspace.get_entity("square")[0]
+        assert len(edges.cells) == 4  # type: ignore
+
+
+def test_trace_pixel_chains():
+    image = np.zeros((40, 40), dtype=bool)
+    image[5, 5:30] = True  # Horizontal line
+    image[5:25, 17] = True  # Branch forming a T junction
+    image[30:38, 30:38] = np.eye(8, dtype=bool)  # Diagonal line
+    image[20:30, [2, 10]] = True  # Closed square
+    image[[20, 29], 2:11] = True
+
+    chains = EdgesDriver.trace_pixel_chains(image)
+
+    assert len(chains) == 5
+    assert sorted(len(chain) for chain in chains) == [8, 13, 13, 20, 35]
+
+    # Chains meet at the junction
+    ends = [tuple(chain[0]) for chain in chains] + [
+        tuple(chain[-1]) for chain in chains
+    ]
+    assert ends.count((5, 17)) == 3
+
+    indices = EdgesDriver.get_skeleton_line_indices(image, line_length=3)
+    lines = np.vstack(indices).reshape((-1, 2, 2))
+    assert [[30, 30], [37, 37]] in lines.tolist()
+
+
+def test_points_source(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    with workspace.open(mode="r+"):
+        x_grid, y_grid = np.meshgrid(np.arange(0, 640, 5.0), np.arange(0, 320, 5.0))
+        values = np.ones_like(x_grid) * 2.0
+        values[(x_grid > 200) & (x_grid < 400) & (y_grid > 80) & (y_grid < 240)] = 1.0
+        points = Points.create(
+            workspace,
+            vertices=np.c_[x_grid.flatten(), y_grid.flatten(), np.ones(x_grid.size)],
+        )
+        data = points.add_data({"values": {"values": values.flatten()}})
+
+    params = EdgeParameters.build(
+        **{
+            "geoh5": workspace,
+            "objects": points,
+            "data": data,
+            "line_length": 12,
+            "line_gap": 1,
+            "sigma": 1,
+            "resolution": 10.0,
+            "max_distance": 20.0,
+            "export_as": "square",
+        }
+    )
+
+    driver = EdgesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+
+    with workspace.open():
+        edges = workspace.get_entity("square")[0]
+        assert len(edges.cells) >= 4  # type: ignore
+        assert np.all(edges.vertices[:, 0] > 180)  # type: ignore
+        assert np.all(edges.vertices[:, 0] < 420)  # type: ignore
+        assert np.all(edges.vertices[:, 1] > 60)  # type: ignore
+        assert np.all(edges.vertices[:, 1] < 260)  # type: ignore
+        assert np.allclose(edges.vertices[:, 2], 1.0)  # type: ignore
+        assert not points.get_data("canny filter")
+
+
+def test_auxiliary_output(tmp_path: Path):
+    for policy in ["none", "boolean", "full"]:
+        workspace = Workspace.create(tmp_path / f"{policy}.geoh5")
+        grid, data = setup_example(workspace)
+        params = EdgeParameters.build(
+            **{
+                "geoh5": workspace,
+                "objects": grid,
+                "data": data,
+                "line_length": 12,
+                "sigma": 1,
+                "auxiliary_output": policy,
+                "export_as": policy,
+            }
+        )
+        driver = EdgesDriver(params)
+        with workspace.open(mode="r+"):
+            driver.run()
+
+        with workspace.open():
+            edges = workspace.get_entity(policy)[0]
+            canny = grid.get_data("canny filter")
+
+            # The Canny filter is only computed, and cached, when written
+            payload = driver.compute()
+            assert ("canny filter" in payload.values) == (policy != "none")
+
+            if policy == "none":
+                assert not canny
+                assert not edges.get_data("azimuth")  # type: ignore
+                continue
+
+            azimuth = edges.get_data("azimuth")[0]  # type: ignore
+            assert azimuth.association.name == "CELL"
+            assert len(azimuth.values) == len(edges.cells)  # type: ignore
+            assert np.allclose(np.sort(azimuth.values), [30, 30, 120, 120])
+
+            assert len(canny) == 1
+            if policy == "full":
+                assert np.isnan(canny[0].values).sum() == 8 * 24
+            else:
+                assert canny[0].values.dtype == bool
+                assert payload.values["canny filter"].dtype == bool
+
+
+def test_dry_run(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / f"{__name__}.geoh5")
+
+    grid, data = setup_example(workspace)
+    params = EdgeParameters.build(
+        {
+            "geoh5": workspace,
+            "objects": grid,
+            "data": data,
+            "window_size": 32,
+            "export_as": "square",
+            "dry_run": True,
+        }
+    )
+    driver = EdgesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+        estimate = driver.dry_run()
+
+        assert workspace.get_entity("square") == [None]
+
+    assert estimate["grid_shape"] == (128, 64)
+    assert estimate["tiles"] == len(EdgesDriver.get_tiles((128, 64), 32))
+    assert set(estimate["stages"]) == {"get_canny_edges", "get_line_indices"}
+    assert estimate["source_values"] == 128 * 64
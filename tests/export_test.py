@@ -0,0 +1,86 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from pathlib import Path
+
+import numpy as np
+from geoh5py import Workspace
+from geoh5py.data import ReferencedData
+from geoh5py.groups import UIJsonGroup
+from geoh5py.objects import Curve, Points
+
+from curve_apps.export import DeltaExport
+from curve_apps.trend_lines.driver import TrendLinesDriver
+from curve_apps.trend_lines.options import TrendLineParameters
+
+from .trend_line_run_test import setup_example
+
+
+def test_delta_export(tmp_path: Path):
+    monitoring = tmp_path / "monitoring"
+    monitoring.mkdir()
+    workspace = Workspace.create(tmp_path / "project.geoh5")
+    curve, data = setup_example(workspace)
+
+    with workspace.open():
+        group = UIJsonGroup.create(workspace, name="trend lines")
+
+    params = TrendLineParameters.build(
+        geoh5=workspace,
+        entity=curve,
+        data=data,
+        export_as="test",
+        out_group=group,
+        monitoring_directory=str(monitoring),
+        monitoring_export="delta",
+    )
+    driver = TrendLinesDriver(params)
+    driver.run()
+
+    assert driver.export_thread is not None
+    driver.export_thread.join()
+
+    files = list(monitoring.glob("*.geoh5"))
+    assert len(files) == 1
+    assert not any((monitoring / ".working").iterdir())
+
+    with workspace.open():
+        output = workspace.get_entity("test")[0]
+        vertices, uid = output.vertices, output.uid
+
+    with Workspace(files[0], mode="r") as delta:
+        exported = delta.get_entity(uid)[0]
+        assert isinstance(exported, Curve)
+        assert exported.parent.uid == group.uid
+        assert isinstance(exported.parent, UIJsonGroup)
+        np.testing.assert_allclose(exported.vertices, vertices)
+
+        labels = exported.get_data("values")[0]
+        assert isinstance(labels, ReferencedData)
+        assert labels.value_map()[1] == "A"
+        assert exported.get_data("trend_lines.ui.json")
+
+        # Sources are referenced by the ui.json file, not copied
+        assert delta.get_entity(curve.uid) == [None]
+        assert [type(obj) for obj in delta.objects] == [Curve]
+
+    # Exports written at the same time do not collide
+    with workspace.open():
+        export = DeltaExport.from_curve(workspace.get_entity("test")[0])
+    assert len({export.write(monitoring) for _ in range(2)}) == 2
+
+    # Entities other than curves fall back to the copy export
+    with workspace.open(mode="r+"):
+        points = Points.create(workspace, vertices=np.zeros((2, 3)), name="points")
+        driver.export_thread = None
+        driver.update_monitoring_directory(points)
+
+    assert driver.export_thread is None
+    assert len(list(monitoring.glob("*.geoh5"))) == 4
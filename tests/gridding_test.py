@@ -0,0 +1,78 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import numpy as np
+import pytest
+from geoh5py.objects import Points
+from geoh5py.workspace import Workspace
+
+from curve_apps.gridding import GRIDDING_METHODS, grid_values
+from curve_apps.utils import interp_to_grid
+
+
+def get_plane(n_points: int = 10000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    locations = np.c_[rng.uniform(0, 100, (n_points, 2)), np.zeros(n_points)]
+    # Leave a gap on the right half of the survey
+    locations = locations[(locations[:, 0] < 60) | (locations[:, 1] < 20)]
+    values = 2.0 * locations[:, 0] - locations[:, 1]
+    axes = [np.arange(0.0, 101.0, 2.0), np.arange(0.0, 101.0, 2.0)]
+
+    return locations, values, axes
+
+
+@pytest.mark.parametrize("method", list(GRIDDING_METHODS))
+def test_grid_values(method: str):
+    locations, values, axes = get_plane()
+    values[::50] = np.nan
+
+    gridded = grid_values(locations, values, axes, 2.0, 5.0, method=method)
+
+    assert gridded.shape == (axes[1].shape[0], axes[0].shape[0])
+
+    # Nodes far from the data are blanked by all methods
+    x, y = np.meshgrid(*axes)
+    assert np.all(np.isnan(gridded[(x > 70) & (y > 30)]))
+
+    # Inner nodes of the survey recover the plane
+    inner = (x > 10) & (x < 50) & (y > 10) & (y < 90) & ~np.isnan(gridded)
+    assert inner.sum() > 0.8 * ((x > 10) & (x < 50) & (y > 10) & (y < 90)).sum()
+    tolerance = 1e-6 if method in ["linear", "cubic"] else 8.0
+    np.testing.assert_allclose(
+        gridded[inner], 2.0 * x[inner] - y[inner], atol=tolerance
+    )
+
+
+def test_block_mean():
+    locations = np.c_[[0.2, -0.3, 0.1, 2.1], [0.0, 0.4, 1.9, 2.0], np.zeros(4)]
+    values = np.r_[1.0, 3.0, 5.0, 7.0]
+    axes = [np.arange(0.0, 3.0), np.arange(0.0, 3.0)]
+
+    gridded = grid_values(locations, values, axes, 1.0, 10.0, method="block_mean")
+
+    np.testing.assert_allclose(gridded[0, 0], 2.0)
+    np.testing.assert_allclose(gridded[2, 0], 5.0)
+    np.testing.assert_allclose(gridded[2, 2], 7.0)
+    assert np.isnan(gridded[1, 1])
+
+
+def test_interp_to_grid_method(tmp_path):
+    locations, values, _ = get_plane()
+
+    with Workspace.create(tmp_path / "test.geoh5") as workspace:
+        points = Points.create(workspace, vertices=locations)
+        axes, idw = interp_to_grid(points, values, 2.0, 5.0)
+        _, linear = interp_to_grid(points, values, 2.0, 5.0, method="linear")
+
+        with pytest.raises(ValueError, match="Unknown gridding method"):
+            interp_to_grid(points, values, 2.0, 5.0, method="kriging")
+
+    assert idw.shape == linear.shape == (axes[1].shape[0], axes[0].shape[0])
+    np.testing.assert_array_equal(np.isnan(idw), np.isnan(linear) & np.isnan(idw))
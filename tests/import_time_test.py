@@ -0,0 +1,78 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import curve_apps
+
+
+# Cold start budget (seconds) for importing each driver module
+IMPORT_BUDGET = float(os.environ.get("CURVE_APPS_IMPORT_BUDGET", "3.0"))
+
+
+def cold_import(module: str) -> tuple[float, list[str]]:
+    """
+    Import a module in a fresh interpreter.
+
+    :returns: Cumulative import time (seconds) reported by 'python -X importtime',
+        and the list of heavy modules loaded by the import.
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(curve_apps.__file__).parents[1])
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import json, sys, {module}; "
+            "print(json.dumps([m for m in sys.modules if m.startswith('skimage')]))",
+        ],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    cumulative = 0.0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1]) * 1e-6
+
+    return cumulative, json.loads(result.stdout)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "curve_apps.contours.driver",
+        "curve_apps.edges.driver",
+        "curve_apps.trend_lines.driver",
+    ],
+)
+def test_driver_import_time(module: str):
+    cumulative, heavy_modules = cold_import(module)
+
+    assert 0 < cumulative < IMPORT_BUDGET
+    assert not heavy_modules
+
+
+def test_package_import_is_light():
+    cumulative, _ = cold_import("curve_apps")
+
+    assert cumulative < IMPORT_BUDGET / 10
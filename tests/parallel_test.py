@@ -0,0 +1,81 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from curve_apps import parallel
+from curve_apps.options import ExecutionParameters
+from curve_apps.parallel import (
+    blas_threads,
+    get_chunks,
+    limit_blas_threads,
+    parallel_map,
+)
+
+
+def row_sum(row: int, values: np.ndarray) -> float:
+    return float(values[row].sum())
+
+
+@pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+def test_parallel_map(backend: str):
+    values = np.arange(60.0).reshape((12, 5))
+    execution = ExecutionParameters(workers=3, parallel_backend=backend, chunk_size=5)
+
+    sums = parallel_map(row_sum, range(12), execution, arrays={"values": values})
+
+    # Results are yielded as they are ready, in order
+    assert isinstance(sums, Iterator)
+    np.testing.assert_allclose(list(sums), values.sum(axis=1))
+
+
+def test_get_chunks():
+    assert get_chunks(list(range(7)), 3) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_blas_threads():
+    assert blas_threads(ExecutionParameters()) is None
+    assert blas_threads(ExecutionParameters(workers=4)) == 1
+    assert (
+        blas_threads(ExecutionParameters(workers=4, parallel_backend="serial")) is None
+    )
+    assert blas_threads(ExecutionParameters(workers=4, blas_threads=2)) == 2
+
+
+def test_limit_blas_threads_fallback(monkeypatch):
+    monkeypatch.setattr(parallel, "threadpool_limits", None)
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+
+    with limit_blas_threads(2):
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+
+    assert "OMP_NUM_THREADS" not in os.environ
+
+
+def test_limit_blas_threads_concurrent(monkeypatch):
+    monkeypatch.setattr(parallel, "threadpool_limits", None)
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+
+    def limited(_):
+        with limit_blas_threads(1):
+            return os.environ["OMP_NUM_THREADS"]
+
+    # Contexts exiting in any order keep the limit until the last one exits
+    with limit_blas_threads(2):
+        with ThreadPoolExecutor(4) as executor:
+            assert set(executor.map(limited, range(16))) == {"2"}
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+
+    assert "OMP_NUM_THREADS" not in os.environ
@@ -132,6 +132,8 @@ def test_contour_params_from_uijson(tmp_path):
         "fixed_contours": "0, 9",
         "z_value": True,
         "export_as": "my contours",
+        "workers": 4,
+        "parallel_backend": "process",
     }
 
     ifile = InputFile.read_ui_json(
@@ -151,3 +153,7 @@ def test_contour_params_from_uijson(tmp_path):
     assert params.z_value == updates["z_value"]
     assert params.export_as == updates["export_as"]
     assert params.out_group is None
+    assert params.execution.workers == 4
+    assert params.execution.parallel_backend == "process"
+    assert params.execution.chunk_size is None
+    assert params.execution.blas_threads is None
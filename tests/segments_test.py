@@ -0,0 +1,86 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import numpy as np
+
+from curve_apps.segments import fuse_collinear_segments
+
+
+def test_fuse_collinear_segments():
+    vertices = np.c_[
+        [0, 1, 2, 3, 2, 10, 11, 11, 10],
+        [0, 0.01, 0, 0, 1, 10, 10, 11, 11],
+        np.zeros(9),
+    ]
+    # Broken line with a branch at vertex 2, followed by a closed square
+    cells = np.array([[1, 0], [1, 2], [2, 3], [2, 4], [5, 6], [6, 7], [7, 8], [8, 5]])
+    new_vertices, new_cells = fuse_collinear_segments(vertices, cells, 5.0)
+
+    assert new_cells.shape == (7, 2)
+    assert len(new_vertices) == 8
+    segments = new_vertices[new_cells][:, :, :2].tolist()
+    assert [[0, 0], [2, 0]] in segments
+    assert [[2, 0], [3, 0]] in segments
+
+    # Tight tolerance leaves the broken line untouched
+    _, new_cells = fuse_collinear_segments(vertices, cells, 0.1)
+    assert new_cells.shape == cells.shape
+
+
+def test_fuse_collinear_segments_turns():
+    # Hairpin turning back on itself
+    vertices = np.c_[[0, 10, 0], [0, 0, 0.5], np.zeros(3)]
+    new_vertices, new_cells = fuse_collinear_segments(
+        vertices, np.array([[0, 1], [1, 2]]), 5.0
+    )
+    assert new_cells.shape == (2, 2)
+    assert len(new_vertices) == 3
+
+    # Zigzag folding back along a line, through a repeated vertex
+    vertices = np.c_[[0, 2, 2, 1, 3], np.zeros(5), np.zeros(5)]
+    cells = np.c_[np.arange(4), np.arange(1, 5)]
+    new_vertices, new_cells = fuse_collinear_segments(vertices, cells, 5.0)
+    segments = new_vertices[new_cells][:, :, 0].tolist()
+    assert segments == [[0, 2], [2, 1], [1, 3]]
+
+    # Quarter circle sampled every 2 degrees
+    angles = np.deg2rad(np.arange(0, 92, 2))
+    vertices = np.c_[100 * np.cos(angles), 100 * np.sin(angles), np.zeros_like(angles)]
+    cells = np.c_[np.arange(len(angles) - 1), np.arange(1, len(angles))]
+    new_vertices, new_cells = fuse_collinear_segments(vertices, cells, 5.0)
+
+    assert 1 < new_cells.shape[0] < cells.shape[0]
+    np.testing.assert_allclose(np.linalg.norm(new_vertices[:, :2], axis=1), 100.0)
+    chord = np.diff(new_vertices[new_cells][:, :, :2], axis=1)[:, 0]
+    chord_angles = np.arctan2(chord[:, 1], chord[:, 0])
+    for (start, end), chord_angle in zip(new_cells, chord_angles, strict=True):
+        first, last = (
+            np.where(np.all(vertices == new_vertices[ind], axis=1))[0][0]
+            for ind in (start, end)
+        )
+        delta = np.diff(vertices[first : last + 1, :2], axis=0)
+        deviation = np.arctan2(delta[:, 1], delta[:, 0]) - chord_angle
+        assert np.all(np.abs(deviation) < np.deg2rad(5.0))
+
+
+def test_fuse_collinear_segments_loops():
+    # Loop closing on a junction, next to a free triangle
+    vertices = np.c_[
+        [0, 1, 2, 2, 1, 10, 11, 10.5], [0, 0, 0, 1, 1, 0, 0, 1], np.zeros(8)
+    ]
+    cells = np.array([[0, 1], [1, 2], [2, 3], [3, 4], [4, 1], [5, 6], [6, 7], [7, 5]])
+    new_vertices, new_cells = fuse_collinear_segments(vertices, cells, 5.0)
+
+    assert new_cells.shape == (8, 2)
+    assert len(new_vertices) == 8
+    segments = new_vertices[new_cells][:, :, :2].tolist()
+    assert [[1, 0], [2, 0]] in segments
+    assert [[1, 1], [1, 0]] in segments
+    assert [[10.5, 1], [10, 0]] in segments
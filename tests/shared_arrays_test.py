@@ -0,0 +1,117 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from curve_apps import shared_arrays
+from curve_apps.shared_arrays import SharedArrays, attach
+
+
+def column_sum(specs, column):
+    with attach(specs) as arrays:
+        return float(arrays["image"][:, column].sum() + arrays["labels"].sum())
+
+
+def crash(spec):
+    with attach(spec):
+        os._exit(1)  # pylint: disable=protected-access
+
+
+def is_released(spec) -> bool:
+    try:
+        block = shared_memory.SharedMemory(name=spec.block)
+    except FileNotFoundError:
+        return True
+
+    block.close()
+    return False
+
+
+def test_shared_arrays():
+    image = np.random.default_rng(0).random((20, 30))
+    labels = np.arange(10, dtype=np.int32)
+
+    with SharedArrays() as shared:
+        specs = shared.update(image=image, labels=labels)
+        assert shared.nbytes == image.nbytes + labels.nbytes
+        assert specs["labels"].dtype == labels.dtype.str
+
+        with pytest.raises(KeyError, match="already published"):
+            shared.publish("image", image)
+
+        with attach(specs) as arrays:
+            np.testing.assert_array_equal(arrays["image"], image)
+            with pytest.raises(ValueError, match="read-only"):
+                arrays["image"][0, 0] = 0.0
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(2, mp_context=context) as executor:
+            sums = list(executor.map(column_sum, [specs] * 3, range(3)))
+
+    np.testing.assert_allclose(sums, image[:, :3].sum(axis=0) + labels.sum())
+    assert all(is_released(spec) for spec in specs.values())
+
+
+def test_shared_arrays_worker_crash():
+    shared = SharedArrays()
+    spec = shared.publish("values", np.ones(100))
+
+    context = multiprocessing.get_context("spawn")
+    with pytest.raises(BrokenProcessPool):
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            executor.submit(crash, spec).result()
+
+    # The publisher still owns the block after the worker died
+    assert not is_released(spec)
+    with attach(spec) as values:
+        assert values.sum() == 100
+
+    del shared
+    assert is_released(spec)
+
+
+@pytest.mark.parametrize("mapping", ["posix", "tracked", "untracked"])
+def test_attach_mapping(monkeypatch, mapping: str):
+    values = np.arange(12.0).reshape((3, 4))
+    calls = []
+
+    with SharedArrays() as shared:
+        spec = shared.publish("values", values)
+
+        # Python < 3.13 without _posixshmem, or Python >= 3.13
+        if mapping != "posix":
+            monkeypatch.setattr(shared_arrays, "_posixshmem", None)
+        if mapping == "untracked":
+            original = shared_memory.SharedMemory
+
+            def untracked(name: str, track: bool = True):
+                calls.append(track)
+                return original(name=name)
+
+            monkeypatch.setattr(shared_arrays, "UNTRACKED_ATTACH", True)
+            monkeypatch.setattr(shared_memory, "SharedMemory", untracked)
+
+        with attach(spec) as view, attach({"values": spec}) as views:
+            np.testing.assert_array_equal(view, values)
+            np.testing.assert_array_equal(views["values"], values)
+            assert not view.flags.writeable
+
+        monkeypatch.undo()
+        assert not is_released(spec)
+
+    assert is_released(spec)
+    assert calls == ([False, False] if mapping == "untracked" else [])
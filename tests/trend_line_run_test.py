@@ -87,6 +87,55 @@ def test_driver_curve(tmp_path: Path):
         assert values.value_map() == {0: "Unknown", 1: "A", 2: "B", 3: "C", 4: "D"}
 
 
+def test_driver_parallel(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / "test_trend_lines.geoh5")
+
+    curve, data = setup_example(workspace)
+    params = TrendLineParameters.build(
+        **{
+            "geoh5": workspace,
+            "entity": curve,
+            "data": data,
+            "export_as": "test",
+            "workers": 2,
+            "chunk_size": 1,
+        }
+    )
+
+    driver = TrendLinesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+
+    with workspace.open():
+        edges = workspace.get_entity("test")[0]
+        assert len(edges.cells) == 27
+        assert set(np.unique(edges.get_data("values")[0].values)) == {1, 2, 3}
+
+
+def test_driver_mst(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / "test_trend_lines.geoh5")
+
+    curve, data = setup_example(workspace)
+    params = TrendLineParameters.build(
+        **{
+            "geoh5": workspace,
+            "entity": curve,
+            "data": data,
+            "engine": "mst",
+            "export_as": "test",
+        }
+    )
+
+    driver = TrendLinesDriver(params)
+    with workspace.open(mode="r+"):
+        driver.run()
+
+    with workspace.open():
+        edges = workspace.get_entity("test")[0]
+        assert len(edges.cells) == 27
+        assert set(np.unique(edges.get_data("values")[0].values)) == {1, 2, 3}
+
+
 def test_driver_points(tmp_path: Path):
     workspace = Workspace.create(tmp_path / "test_trend_lines.geoh5")
 
@@ -229,3 +278,21 @@ def test_input_file(tmp_path: Path):
     with workspace.open():
         edges = workspace.get_entity("trends")[0]
         assert edges is not None
+
+
+def test_load_source(tmp_path: Path):
+    workspace = Workspace.create(tmp_path / "test_trend_lines.geoh5")
+    curve, data = setup_example(workspace)
+
+    with workspace.open():
+        curve, data = (workspace.get_entity(item.uid)[0] for item in [curve, data])
+        params = TrendLineParameters.build(
+            geoh5=workspace, entity=curve, data=data, export_as="test"
+        )
+        driver = TrendLinesDriver(params)
+        driver.load_source()
+
+    # Everything read by the computation is held in memory
+    payload = driver.compute()
+    assert payload is not None
+    assert len(payload.cells) == 27
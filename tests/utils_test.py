@@ -11,12 +11,15 @@ import numpy as np
 import pytest
 from geoh5py.objects import Grid2D, Points
 from geoh5py.workspace import Workspace
+from scipy.ndimage import gaussian_filter
 
 from curve_apps.trend_lines.options import TrendLineDetectionParameters
 from curve_apps.utils import (
     filter_segments_orientation,
     find_curves,
     set_vertices_height,
+    smooth_grid,
+    weld_vertices,
 )
 
 
@@ -31,6 +34,23 @@ def test_set_vertices_height(tmp_path):
     assert np.allclose(vertices, new_vertices)
 
 
+def test_smooth_grid():
+    values = np.random.default_rng(0).normal(size=(60, 80))
+    smoothed = smooth_grid(values, (3.0, 5.0))
+    expected = gaussian_filter(values, (3.0, 5.0), mode="reflect", truncate=8.0)
+
+    np.testing.assert_allclose(smoothed, expected, atol=1e-4)
+
+    # Empty nodes stay empty and do not bias their neighbours
+    values = np.ones((60, 80), dtype=np.float32)
+    values[20:30, :40] = np.nan
+    smoothed = smooth_grid(values, (4.0, 4.0))
+
+    assert smoothed.dtype == np.float32
+    np.testing.assert_array_equal(np.isnan(smoothed), np.isnan(values))
+    np.testing.assert_allclose(smoothed[~np.isnan(values)], 1.0, atol=1e-5)
+
+
 @pytest.fixture(name="curves_data")
 def curves_data_fixture() -> list:
     # Create test data
@@ -107,6 +127,86 @@ def test_find_curves(curves_data: list):
     assert [len(curve) for curve in result_curves] == [9, 9, 9, 9]
 
 
+def test_find_curves_mst(curves_data: list):
+    data = np.array(curves_data)
+    np.random.shuffle(data)
+
+    points_data = data[:, :2]
+    line_ids = data[:, 2]
+    channel_groups = data[:, 3]
+
+    result_curves = []
+    parameters = TrendLineDetectionParameters(
+        min_edges=3, max_distance=15, damping=0.75, engine="mst"
+    )
+    for channel_group in np.unique(channel_groups):
+        channel_inds = channel_groups == channel_group
+        path = find_curves(
+            points_data[channel_inds], np.array(line_ids)[channel_inds], parameters
+        )
+        result_curves += [line_ids[channel_inds][path] for path in path]
+
+    assert [len(curve) for curve in result_curves] == [9, 9, 9, 9]
+
+    # Each curve crosses every line, in order
+    for curve in result_curves:
+        assert np.all(curve[:, 1] == curve[:, 0] + (curve[0, 1] - curve[0, 0]))
+        assert np.all(curve[1:, 0] == curve[:-1, 1])
+
+
+def test_find_curves_mst_branches():
+    # A trunk along the y-axis, with a short branch
+    vertices = np.r_[
+        np.c_[np.zeros(6), np.arange(6) * 10.0],
+        np.c_[[5.0, 10.0], [25.0, 25.0]],
+    ]
+    parts = np.arange(8)
+
+    parameters = TrendLineDetectionParameters(min_edges=1, engine="mst")
+    paths = find_curves(vertices, parts, parameters)
+
+    # The trunk continues straight through the junction, the branch splits off
+    assert [len(path) for path in paths] == [5, 2]
+    assert np.ravel(paths[0]).tolist() == [0, 1, 1, 2, 2, 3, 3, 4, 4, 5]
+    assert set(np.ravel(paths[1])) == {2, 6, 7}
+
+    parameters = TrendLineDetectionParameters(min_edges=3, engine="mst")
+    assert len(find_curves(vertices, parts, parameters)) == 1
+
+
+@pytest.mark.parametrize("n_trends", [2, 3])
+def test_find_curves_mst_parallel_trends(n_trends: int):
+    # Parallel trends, 30 m apart, crossing 20 survey lines 20 m apart
+    rng = np.random.default_rng(0)
+    lines = np.arange(20)
+    vertices = np.vstack(
+        [
+            np.c_[30.0 * trend + rng.normal(0, 1, 20), lines * 20.0]
+            for trend in range(n_trends)
+        ]
+    )
+    parts = np.tile(lines, n_trends)
+
+    for engine in ["greedy", "mst"]:
+        parameters = TrendLineDetectionParameters(
+            min_edges=2, max_distance=40, engine=engine
+        )
+        paths = find_curves(vertices, parts, parameters)
+
+        # Each curve follows a single trend
+        assert len(paths) == n_trends
+        for path in paths:
+            assert len(np.unique(np.array(path) // 20)) == 1
+
+    # Paths are ordered, and turn by less than 90 degrees
+    assert [len(path) for path in paths] == [19] * n_trends
+    for path in paths:
+        path = np.array(path)
+        assert np.all(path[1:, 0] == path[:-1, 1])
+        vectors = vertices[path[:, 1]] - vertices[path[:, 0]]
+        assert np.all(np.sum(vectors[1:] * vectors[:-1], axis=1) > 0)
+
+
 def test_find_curve_orientation(curves_data: list):
     # Random shuffle the input
     data = np.array(curves_data)
@@ -161,3 +261,18 @@ def test_filter_segments_orientation():
 
     ind = filter_segments_orientation(points, segments, 5, 1)
     assert ~np.all(ind)  # pylint: disable=invalid-unary-operand-type
+
+
+def test_weld_vertices():
+    # Chain 0-1-2-3 and isolated pair 5-6, vertex 4 untouched
+    pairs = np.array([[2, 3], [0, 1], [1, 2], [6, 5]])
+    welded = weld_vertices(7, pairs)
+    np.testing.assert_array_equal(welded, [0, 0, 0, 0, 4, 5, 5])
+
+    for _ in range(5):
+        np.random.shuffle(pairs)
+        np.testing.assert_array_equal(
+            weld_vertices(7, pairs[:, ::-1]), [0, 0, 0, 0, 4, 5, 5]
+        )
+
+    np.testing.assert_array_equal(weld_vertices(3, np.empty((0, 2))), [0, 1, 2])
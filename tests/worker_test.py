@@ -0,0 +1,114 @@
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2024-2025 Mira Geoscience Ltd.                                '
+#                                                                              '
+#  This file is part of curve-apps package.                                    '
+#                                                                              '
+#  curve-apps is distributed under the terms and conditions of the MIT License '
+#  (see LICENSE file at the root of this source code package).                 '
+#                                                                              '
+# ''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+from geoh5py import Workspace
+
+from curve_apps import worker as worker_module
+from curve_apps.worker import WatchFolderWorker
+
+from .batch_test import write_edge_job
+from .edge_detection_run_test import setup_example
+
+
+def test_watch_folder_worker(tmp_path: Path):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    workspace = Workspace.create(tmp_path / "worker.geoh5")
+    grid, data = setup_example(workspace)
+
+    with workspace.open():
+        for name in ["first", "second"]:
+            write_edge_job(workspace, grid, data, jobs, name)
+
+    # Jobs can run their own pool of processes
+    with open(jobs / "second.ui.json", encoding="utf-8") as file:
+        ui_json = json.load(file)
+    ui_json["workers"]["value"] = 2
+    ui_json["parallel_backend"]["value"] = "process"
+    with open(jobs / "second.ui.json", "w", encoding="utf-8") as file:
+        json.dump(ui_json, file)
+
+    (jobs / "broken.ui.json").write_text("{", encoding="utf-8")
+
+    worker = WatchFolderWorker(jobs, workers=2, queue_size=2, interval=0.05)
+    worker.serve(idle_exit=True)
+
+    assert {path.name: status for path, status in worker.history.items()} == {
+        "first.ui.json": "success",
+        "second.ui.json": "success",
+        "broken.ui.json": "failed",
+    }
+    assert sorted(path.name for path in (jobs / "done").iterdir()) == [
+        "first.ui.json",
+        "second.ui.json",
+    ]
+    assert (jobs / "failed" / "broken.ui.json").is_file()
+    assert not list(jobs.glob("*.ui.json"))
+
+    with workspace.open():
+        for name in ["first", "second"]:
+            assert len(workspace.get_entity(name)) == 1
+
+
+def cutting_loop(jobs, results):
+    while (path := jobs.get()) is not None:
+        results.send(("started", path, "running", ""))
+        if path.name == "cut.ui.json":
+            # Killed halfway through a message announcing 1 kB
+            os.write(results.fileno(), struct.pack("!i", 1024) + b"partial")
+            os._exit(1)
+        results.send(("done", path, "success", ""))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Raw writes to a pipe handle.")
+def test_worker_killed_during_result(tmp_path: Path, monkeypatch):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    names = ["cut", "first", "second", "third"]
+    for name in names:
+        (jobs / f"{name}.ui.json").write_text("{}", encoding="utf-8")
+
+    monkeypatch.setattr(worker_module, "worker_loop", cutting_loop)
+    worker = WatchFolderWorker(jobs, workers=2, queue_size=4, interval=0.05)
+    worker.serve(idle_exit=True)
+
+    # Only the job of the killed worker fails, the others are still reported
+    assert worker.history == {
+        jobs / f"{name}.ui.json": "failed" if name == "cut" else "success"
+        for name in names
+    }
+    assert not worker.workers
+
+
+def dying_loop(jobs, _):
+    if jobs.get() is not None:
+        os._exit(1)
+
+
+def test_worker_died(tmp_path: Path, monkeypatch):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    (jobs / "lost.ui.json").write_text("{}", encoding="utf-8")
+
+    # Workers exit before reporting the job as started
+    monkeypatch.setattr(worker_module, "worker_loop", dying_loop)
+    worker = WatchFolderWorker(jobs, workers=1, queue_size=2, interval=0.05)
+    worker.serve(idle_exit=True)
+
+    assert worker.history == {jobs / "lost.ui.json": "failed"}
+    assert (jobs / "failed" / "lost.ui.json").is_file()
+    assert not worker.workers